@@ -0,0 +1,137 @@
+import argparse
+import asyncio
+import http.server
+import json
+import logging
+import threading
+import time
+
+import coastal_dynamics as cd
+from coastal_dynamics.io import aread_questions, close_async_filesystems
+
+
+class BenchmarkServer(http.server.ThreadingHTTPServer):
+    # Accept all concurrent sessions instead of refusing connections
+    request_queue_size = 1024
+
+
+def make_handler(body: bytes, latency: float):
+    """Request handler that serves the same question bank with a fixed latency."""
+
+    class QuestionsHandler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(latency)
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return QuestionsHandler
+
+
+async def measure(load, n_sessions: int) -> dict[str, float]:
+    """Throughput of loading a bank per session and the worst event loop stall.
+
+    A ticker runs on the same loop as the sessions, like the other sessions of a
+    Panel server; the longest gap between its ticks is the time that other sessions
+    could not be served.
+    """
+    interval = 0.005
+    max_stall = 0.0
+    done = asyncio.Event()
+
+    async def ticker():
+        nonlocal max_stall
+        last = time.perf_counter()
+        while not done.is_set():
+            await asyncio.sleep(interval)
+            now = time.perf_counter()
+            max_stall = max(max_stall, now - last - interval)
+            last = now
+
+    ticker_task = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    await asyncio.gather(*(load(i) for i in range(n_sessions)))
+    elapsed = time.perf_counter() - start
+    done.set()
+    await ticker_task
+    return {
+        "banks_per_s": n_sessions / elapsed,
+        "max_stall_ms": max_stall * 1000,
+    }
+
+
+async def benchmark(url: str, n_sessions: int) -> dict[str, dict[str, float]]:
+    """Compare blocking and asynchronous reads of a bank by concurrent sessions."""
+
+    async def load_blocking(i):
+        # What a synchronous callback does: block the loop while reading
+        cd.read_questions(f"{url}?session={i}", cache=False)
+
+    async def load_async(i):
+        await aread_questions(f"{url}?session={i}")
+
+    try:
+        return {
+            "read_questions": await measure(load_blocking, n_sessions),
+            "aread_questions": await measure(load_async, n_sessions),
+        }
+    finally:
+        await close_async_filesystems()
+
+
+def parse_arguments():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description=(
+            "Benchmark loading question banks by concurrent sessions from a local "
+            "HTTP server."
+        )
+    )
+    parser.add_argument(
+        "--sessions", type=int, default=50, help="Number of concurrent sessions."
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.05,
+        help="Simulated server latency per request in seconds.",
+    )
+    parser.add_argument(
+        "--n-questions", type=int, default=200, help="Number of questions per bank."
+    )
+    return parser.parse_args()
+
+
+def main():
+    """Main function to orchestrate the asynchronous I/O benchmark."""
+    args = parse_arguments()
+    questions = {
+        f"Q1-{i}": {"name": f"Q1-{i}", "type": "text", "answer": "M2"}
+        for i in range(args.n_questions)
+    }
+    handler = make_handler(json.dumps(questions).encode(), args.latency)
+    httpd = BenchmarkServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+
+    try:
+        url = f"http://127.0.0.1:{httpd.server_port}/questions.json"
+        results = asyncio.run(benchmark(url, args.sessions))
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+    for name, result in results.items():
+        logging.info(
+            f"{name:<20} {result['banks_per_s']:>10.1f} banks/s "
+            f"{result['max_stall_ms']:>10.1f} ms max event loop stall"
+        )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    main()
@@ -0,0 +1,130 @@
+import argparse
+import json
+import logging
+import statistics
+import time
+
+import fsspec
+import numpy as np
+
+from coastal_dynamics.geometries import geometries_to_bounds, geometry_to_bbox
+
+
+def legacy_geometry_to_bbox(geometry):
+    """The recursive implementation of geometry_to_bbox before vectorization."""
+    lats = []
+    lons = []
+
+    def extract_coords(coords):
+        for x in coords:
+            if isinstance(x, float):
+                lats.append(coords[0])
+                lons.append(coords[1])
+                return
+            if isinstance(x[0], list):
+                extract_coords(x)
+            else:
+                lat, lon = x
+                lats.append(lat)
+                lons.append(lon)
+
+    extract_coords(geometry["coordinates"])
+    lons.sort()
+    lats.sort()
+    return [lats[0], lons[0], lats[-1], lons[-1]]
+
+
+def synthetic_polygon(n_vertices: int, seed: int = 0) -> dict:
+    """A GeoJSON polygon with a ragged coastline-like outline."""
+    rng = np.random.default_rng(seed)
+    angles = np.linspace(0, 2 * np.pi, n_vertices)
+    radius = 1 + 0.1 * rng.standard_normal(n_vertices).cumsum() / np.sqrt(n_vertices)
+    ring = np.column_stack([radius * np.cos(angles), radius * np.sin(angles)])
+    ring[-1] = ring[0]
+    return {"type": "Polygon", "coordinates": [ring.tolist()]}
+
+
+def synthetic_features(n_features: int, n_vertices: int) -> dict:
+    """A FeatureCollection of line strings, like a layer of transects."""
+    features = [
+        {
+            "type": "Feature",
+            "properties": {"id": i},
+            "geometry": {
+                "type": "LineString",
+                "coordinates": (np.random.default_rng(i).random((n_vertices, 2)))
+                .round(6)
+                .tolist(),
+            },
+        }
+        for i in range(n_features)
+    ]
+    return {"type": "FeatureCollection", "features": features}
+
+
+def timeit(func, *args, repeat: int) -> float:
+    """Median run time in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def parse_arguments():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark bounding boxes of GeoJSON geometries and features."
+    )
+    parser.add_argument(
+        "fname",
+        nargs="?",
+        type=str,
+        help="GeoJSON FeatureCollection, e.g. 03_CoastSat_metadata_layer_Pacific.geojson",
+    )
+    parser.add_argument(
+        "--n-vertices",
+        type=int,
+        default=500_000,
+        help="Number of vertices of the synthetic polygon.",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="Number of runs per function."
+    )
+    return parser.parse_args()
+
+
+def main():
+    """Main function to orchestrate the bounding box benchmark."""
+    args = parse_arguments()
+
+    polygon = synthetic_polygon(args.n_vertices)
+    assert geometry_to_bbox(polygon) == legacy_geometry_to_bbox(polygon)
+    legacy_ms = timeit(legacy_geometry_to_bbox, polygon, repeat=args.repeat)
+    new_ms = timeit(geometry_to_bbox, polygon, repeat=args.repeat)
+    logging.info(
+        f"Polygon with {args.n_vertices} vertices: {legacy_ms:.1f} ms -> "
+        f"{new_ms:.1f} ms ({legacy_ms / new_ms:.1f}x)"
+    )
+
+    if args.fname:
+        with fsspec.open(args.fname) as f:
+            collection = json.load(f)
+    else:
+        collection = synthetic_features(10_000, 20)
+
+    def legacy_bounds(collection):
+        return [legacy_geometry_to_bbox(f["geometry"]) for f in collection["features"]]
+
+    legacy_ms = timeit(legacy_bounds, collection, repeat=args.repeat)
+    new_ms = timeit(geometries_to_bounds, collection, repeat=args.repeat)
+    logging.info(
+        f"FeatureCollection with {len(collection['features'])} features: "
+        f"{legacy_ms:.1f} ms -> {new_ms:.1f} ms ({legacy_ms / new_ms:.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    main()
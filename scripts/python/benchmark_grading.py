@@ -0,0 +1,130 @@
+import argparse
+import logging
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+import coastal_dynamics as cd
+from coastal_dynamics.grading import grade_submissions
+
+FEEDBACK = {"correct": "Correct!", "incorrect": "Incorrect."}
+
+
+def synthetic_cohort(
+    n_questions: int, n_rows: int, seed: int = 0
+) -> tuple[dict, pd.DataFrame]:
+    """Numeric questions and typed answers, a third of them correct.
+
+    Students type their own roundings of a computed value, so most answers to a
+    question are unique, like in exported submissions.
+    """
+    rng = np.random.default_rng(seed)
+    solutions = rng.lognormal(0, 3, n_questions)
+    sig_figs = rng.integers(2, 5, n_questions)
+    questions = {
+        f"Q{i}": {
+            "name": f"Q{i}",
+            "type": "numeric",
+            "question": "What is the wave height?",
+            "answer": cd.hash_answer(float(solution), "numeric", sig_figs=int(p)),
+            "sig_figs": int(p),
+            "feedback": FEEDBACK,
+        }
+        for i, (solution, p) in enumerate(zip(solutions, sig_figs, strict=True))
+    }
+    question = rng.integers(0, n_questions, n_rows)
+    error = np.where(rng.random(n_rows) < 1 / 3, 1e-6, rng.normal(0, 0.2, n_rows))
+    submissions = pd.DataFrame(
+        {
+            "question": [f"Q{i}" for i in question],
+            "answer": solutions[question] * (1 + error),
+        }
+    )
+    return questions, submissions
+
+
+def grade_per_row(questions: dict, submissions: pd.DataFrame) -> np.ndarray:
+    """The widget way: format and hash every submitted answer on its own."""
+    correct = []
+    for key, answer in submissions.itertuples(index=False, name=None):
+        question = questions[key]
+        formatted = np.format_float_positional(
+            float(answer),
+            precision=question["sig_figs"],
+            unique=False,
+            fractional=False,
+            trim="k",
+        )
+        correct.append(cd.hash_answer(formatted, "numeric") == question["answer"])
+    return np.array(correct)
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def parse_arguments():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark grading of synthetic numeric submissions."
+    )
+    parser.add_argument(
+        "--questions", type=int, default=50, help="Number of questions."
+    )
+    parser.add_argument(
+        "--rows", type=int, default=500_000, help="Number of submissions."
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count(),
+        help="Number of worker processes.",
+    )
+    return parser.parse_args()
+
+
+def main():
+    """Main function to orchestrate the grading benchmark."""
+    args = parse_arguments()
+    questions, submissions = synthetic_cohort(args.questions, args.rows)
+    values = submissions["answer"].to_numpy()
+    logging.info(
+        f"{args.rows} submissions to {args.questions} questions, "
+        f"{submissions['answer'].nunique()} unique answers"
+    )
+
+    # The normalisation on its own, at three significant figures
+    scalar, elapsed = timed(
+        lambda: [
+            np.format_float_positional(
+                v, precision=3, unique=False, fractional=False, trim="k"
+            )
+            for v in values
+        ]
+    )
+    logging.info(f"{'format_float_positional':<30} {elapsed:>8.2f} s")
+    formatted, elapsed = timed(cd.format_sig_figs, values, 3)
+    logging.info(f"{'format_sig_figs':<30} {elapsed:>8.2f} s")
+    assert formatted.tolist() == scalar
+
+    reference, elapsed = timed(grade_per_row, questions, submissions)
+    logging.info(f"{'format and hash per row':<30} {elapsed:>8.2f} s")
+    graded, elapsed = timed(grade_submissions, questions, submissions)
+    logging.info(f"{'grade_submissions':<30} {elapsed:>8.2f} s")
+    np.testing.assert_array_equal(graded["correct"].to_numpy(), reference)
+    if args.workers > 1:
+        graded, elapsed = timed(
+            grade_submissions, questions, submissions, n_workers=args.workers
+        )
+        name = f"grade_submissions, {args.workers} workers"
+        logging.info(f"{name:<30} {elapsed:>8.2f} s")
+    logging.info(f"{graded['correct'].mean():.0%} correct")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    main()
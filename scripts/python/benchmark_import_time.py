@@ -0,0 +1,120 @@
+import argparse
+import importlib.util
+import json
+import logging
+import pathlib
+import pkgutil
+import re
+import statistics
+import subprocess
+import sys
+
+PACKAGE = "coastal_dynamics"
+
+
+def package_modules() -> list[str]:
+    """The package and all of its submodules, so new modules are measured too."""
+    # Find the submodules without importing the package in this process
+    path = importlib.util.find_spec(PACKAGE).submodule_search_locations
+    return [PACKAGE] + sorted(
+        f"{PACKAGE}.{module.name}" for module in pkgutil.iter_modules(path)
+    )
+
+
+# Lines look like: "import time:       123 |       4567 | coastal_dynamics.io"
+IMPORTTIME_PATTERN = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$")
+
+
+def parse_importtime(stderr: str) -> dict[str, int]:
+    """Parse the output of ``python -X importtime`` into cumulative times in us."""
+    cumulative: dict[str, int] = {}
+    for line in stderr.splitlines():
+        match = IMPORTTIME_PATTERN.match(line)
+        if match:
+            cumulative[match.group(4)] = int(match.group(2))
+    return cumulative
+
+
+def measure_import_time(module: str) -> int:
+    """Measure the cumulative import time of a module in a fresh interpreter."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return parse_importtime(result.stderr)[module]
+
+
+def benchmark(modules: list[str], repeat: int) -> dict[str, float]:
+    """Median cumulative import time in milliseconds per module."""
+    return {
+        module: statistics.median(measure_import_time(module) for _ in range(repeat))
+        / 1000
+        for module in modules
+    }
+
+
+def find_regressions(
+    timings: dict[str, float], baseline: dict[str, float], tolerance: float
+) -> dict[str, tuple[float, float]]:
+    """Modules whose import time exceeds the baseline by more than the tolerance."""
+    return {
+        module: (baseline[module], ms)
+        for module, ms in timings.items()
+        if module in baseline and ms > baseline[module] * (1 + tolerance)
+    }
+
+
+def parse_arguments():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark the import time of coastal_dynamics and its submodules."
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="Number of runs per module."
+    )
+    parser.add_argument(
+        "--output", type=pathlib.Path, help="Write the timings to this JSON file."
+    )
+    parser.add_argument(
+        "--baseline",
+        type=pathlib.Path,
+        help="Compare against timings in this JSON file and fail on regressions.",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Allowed relative slowdown compared to the baseline.",
+    )
+    return parser.parse_args()
+
+
+def main():
+    """Main function to orchestrate the import time benchmark."""
+    args = parse_arguments()
+    timings = benchmark(package_modules(), args.repeat)
+
+    for module, ms in timings.items():
+        logging.info(f"{module:<40} {ms:>10.1f} ms")
+
+    if args.output:
+        with args.output.open("w") as f:
+            json.dump(timings, f, indent=4)
+
+    if args.baseline:
+        with args.baseline.open() as f:
+            baseline = json.load(f)
+        regressions = find_regressions(timings, baseline, args.tolerance)
+        for module, (expected, ms) in regressions.items():
+            logging.error(
+                f"Import time regression in {module}: {ms:.1f} ms > {expected:.1f} ms"
+            )
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    main()
@@ -0,0 +1,109 @@
+import argparse
+import json
+import logging
+import pathlib
+import statistics
+import tempfile
+import time
+
+import coastal_dynamics as cd
+
+ENCODINGS = [
+    ".json",
+    ".json.gz",
+    ".json.zst",
+    ".msgpack",
+    ".msgpack.gz",
+    ".msgpack.zst",
+]
+
+
+def synthetic_questions(n_questions: int) -> dict:
+    """A question bank with a mix of question types, like the course banks."""
+    questions = {}
+    for i in range(n_questions):
+        questions[f"q{i}"] = {
+            "type": "multiple_choice",
+            "name": f"Question {i}",
+            "question": f"Which coastal process dominates in situation {i}? " * 4,
+            "options": {k: f"Option {k} for question {i}" for k in "abcd"},
+            "answer": cd.hash_answer("b", "multiple_choice"),
+            "feedback": {"correct": "Well done!", "incorrect": "Not quite, " * 8},
+        }
+    return questions
+
+
+def benchmark(questions: dict, directory: pathlib.Path, repeat: int) -> dict:
+    """File size in bytes and median load time in milliseconds per encoding."""
+    results = {}
+    for suffix in ENCODINGS:
+        fname = str(directory / f"questions{suffix}")
+        try:
+            cd.write_questions(questions, fname)
+        except ImportError as e:
+            logging.warning(f"Skipping {suffix}: {e}")
+            continue
+
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            cd.read_questions(fname)
+            timings.append(time.perf_counter() - start)
+        results[suffix] = {
+            "size": pathlib.Path(fname).stat().st_size,
+            "load_ms": statistics.median(timings) * 1000,
+        }
+    return results
+
+
+def parse_arguments():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark the size and load time of question bank encodings."
+    )
+    parser.add_argument(
+        "fname",
+        nargs="?",
+        type=str,
+        help="Question bank to benchmark. Defaults to a synthetic bank.",
+    )
+    parser.add_argument(
+        "--n-questions",
+        type=int,
+        default=5000,
+        help="Number of questions in the synthetic bank.",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=10, help="Number of loads per encoding."
+    )
+    parser.add_argument(
+        "--output", type=pathlib.Path, help="Write the results to this JSON file."
+    )
+    return parser.parse_args()
+
+
+def main():
+    """Main function to orchestrate the encoding benchmark."""
+    args = parse_arguments()
+    if args.fname:
+        questions = cd.read_questions(args.fname)
+    else:
+        questions = synthetic_questions(args.n_questions)
+
+    with tempfile.TemporaryDirectory() as directory:
+        results = benchmark(questions, pathlib.Path(directory), args.repeat)
+
+    for suffix, result in results.items():
+        logging.info(
+            f"{suffix:<15} {result['size'] / 1024:>10.1f} KiB "
+            f"{result['load_ms']:>10.1f} ms"
+        )
+
+    if args.output:
+        with args.output.open("w") as f:
+            json.dump(results, f, indent=4)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    main()
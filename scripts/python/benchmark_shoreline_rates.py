@@ -0,0 +1,109 @@
+import argparse
+import logging
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from coastal_dynamics.shoreline import change_rates
+
+
+def synthetic_positions(n_transects: int, n_dates: int, seed: int = 0) -> pd.DataFrame:
+    """Shoreline positions with a trend, seasonal noise, outliers and cloudy images.
+
+    Like CoastSat, a cloudy image removes the positions of all transects of a site,
+    and some positions are missing for single transects.
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("1984-01-01", "2024-01-01", periods=n_dates)
+    t = ((dates - dates[0]) / pd.Timedelta(days=365.25)).to_numpy()
+    rates = rng.normal(0, 2, n_transects)
+    positions = (
+        rng.uniform(50, 300, n_transects)
+        + np.outer(t, rates)
+        + 10 * np.sin(2 * np.pi * t)[:, None]
+        + rng.normal(0, 8, (n_dates, n_transects))
+    )
+    outliers = rng.random(positions.shape) < 0.01
+    positions[outliers] += rng.normal(0, 100, outliers.sum())
+
+    sites = np.arange(n_transects) // 100
+    cloudy = rng.random((n_dates, sites.max() + 1)) < 0.15
+    positions[cloudy[:, sites]] = np.nan
+    positions[rng.random(positions.shape) < 0.02] = np.nan
+    columns = [f"site{site:04d}-{i:04d}" for i, site in enumerate(sites)]
+    return pd.DataFrame(positions, index=dates, columns=columns)
+
+
+def per_transect_polyfit(positions: pd.DataFrame) -> pd.Series:
+    """The ad hoc way: a least squares fit per transect column."""
+    t = (positions.index - positions.index[0]) / pd.Timedelta(days=365.25)
+    rates = {}
+    for column, series in positions.items():
+        valid = series.notna().to_numpy()
+        rates[column] = np.polyfit(t[valid], series.to_numpy()[valid], 1)[0]
+    return pd.Series(rates)
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def parse_arguments():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark shoreline change rates of synthetic transects."
+    )
+    parser.add_argument(
+        "--transects", type=int, default=10_000, help="Number of transects."
+    )
+    parser.add_argument("--dates", type=int, default=1000, help="Number of dates.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count(),
+        help="Number of worker processes.",
+    )
+    parser.add_argument(
+        "--chunk-size", type=int, default=500, help="Transects per worker chunk."
+    )
+    return parser.parse_args()
+
+
+def main():
+    """Main function to orchestrate the shoreline change rate benchmark."""
+    args = parse_arguments()
+    positions = synthetic_positions(args.transects, args.dates)
+    weights = pd.Series(np.linspace(0.5, 2.0, args.dates), index=positions.index)
+    logging.info(
+        f"{args.transects} transects x {args.dates} dates, "
+        f"{positions.isna().to_numpy().mean():.0%} missing"
+    )
+
+    reference, elapsed = timed(per_transect_polyfit, positions)
+    logging.info(f"{'polyfit per transect':<30} {elapsed:>8.2f} s")
+
+    runs = {
+        "linear": {"method": "linear", "confidence": None},
+        "weighted": {"method": "weighted", "weights": weights, "confidence": None},
+        "theil_sen": {"method": "theil_sen"},
+    }
+    if args.workers > 1:
+        runs[f"theil_sen, {args.workers} workers"] = {
+            "method": "theil_sen",
+            "n_workers": args.workers,
+            "chunk_size": args.chunk_size,
+        }
+    for name, kwargs in runs.items():
+        rates, elapsed = timed(change_rates, positions, **kwargs)
+        logging.info(f"{name:<30} {elapsed:>8.2f} s")
+        if name == "linear":
+            np.testing.assert_allclose(rates["rate"], reference, rtol=1e-6)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    main()
@@ -0,0 +1,71 @@
+import argparse
+import logging
+import pathlib
+
+import numpy as np
+import pandas as pd
+
+from coastal_dynamics import data
+from coastal_dynamics.pyramid import MERCATOR_HALF_WIDTH, TILE_SIZE, PointPyramid
+
+ASSET = "earthquakes_sample.parquet"
+
+AGGREGATIONS = {"mag": "max", "depth": "max"}
+
+
+def parse_arguments():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description=(
+            "Bin the earthquakes into a pyramid of zoom levels with the number of "
+            "earthquakes and their maximum magnitude and depth, as used by notebook "
+            "1_coastal_classification."
+        )
+    )
+    parser.add_argument(
+        "--output",
+        type=pathlib.Path,
+        default=data.cache_path(ASSET).with_name("earthquakes_pyramid"),
+        help="Directory of the pyramid. Defaults to next to the cached earthquakes.",
+    )
+    parser.add_argument(
+        "--max-zoom", type=int, default=8, help="Largest zoom level of the pyramid."
+    )
+    parser.add_argument(
+        "--bin-size", type=int, default=8, help="Side of a bin in screen pixels."
+    )
+    return parser.parse_args()
+
+
+def main():
+    """Main function to orchestrate building the earthquake pyramid."""
+    args = parse_arguments()
+    # Drop the earthquakes without a magnitude or depth, as the notebook does
+    earthquakes = pd.read_parquet(
+        data.fetch(ASSET), columns=["longitude", "latitude", *AGGREGATIONS]
+    ).dropna(subset=list(AGGREGATIONS))
+    pyramid = PointPyramid.build(
+        earthquakes,
+        args.output,
+        AGGREGATIONS,
+        max_zoom=args.max_zoom,
+        bin_size=args.bin_size,
+    )
+
+    logging.info(f"{len(earthquakes)} earthquakes, pyramid in {args.output}")
+    bins_per_tile = (TILE_SIZE // args.bin_size) ** 2
+    for zoom in range(pyramid.max_zoom + 1):
+        bins = pyramid.level(zoom)
+        # Busiest tile, from the bin centers in Web Mercator meters
+        tile_width = 2 * MERCATOR_HALF_WIDTH / 2**zoom
+        tiles = np.floor(bins[["x", "y"]].to_numpy() / tile_width)
+        _, per_tile = np.unique(tiles, axis=0, return_counts=True)
+        logging.info(
+            f"zoom {zoom}: {len(bins):>9} bins, at most {per_tile.max():>5} of "
+            f"{bins_per_tile} per tile"
+        )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    main()
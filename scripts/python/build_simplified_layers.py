@@ -0,0 +1,58 @@
+import argparse
+import logging
+
+import shapely
+
+from coastal_dynamics import data
+from coastal_dynamics.simplification import SimplifiedLayer
+
+LAYERS = ["isobaths200.gpkg", "coastal_systems.parquet"]
+
+
+def parse_arguments():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description=(
+            "Build the simplified zoom levels of the map layers and report their "
+            "GeoJSON size."
+        )
+    )
+    parser.add_argument(
+        "layers",
+        nargs="*",
+        default=LAYERS,
+        help="Names of registered data assets. Defaults to the map layers.",
+    )
+    parser.add_argument(
+        "--max-zoom", type=int, default=10, help="Largest simplified zoom level."
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.5,
+        help="Simplification tolerance in screen pixels.",
+    )
+    return parser.parse_args()
+
+
+def main():
+    """Main function to orchestrate building the simplified layers."""
+    args = parse_arguments()
+    for name in args.layers:
+        layer = SimplifiedLayer.from_file(
+            data.fetch(name), max_zoom=args.max_zoom, tolerance=args.tolerance
+        )
+        logging.info(f"{name}: {layer.path}")
+        for zoom in range(layer.max_zoom + 1):
+            gdf = layer.level(zoom)
+            n_vertices = shapely.get_num_coordinates(gdf.geometry.array).sum()
+            size = len(gdf.to_json().encode())
+            logging.info(
+                f"  zoom {zoom:>2}: {n_vertices:>10} vertices "
+                f"{size / 2**20:>8.2f} MiB GeoJSON"
+            )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    main()
@@ -1,23 +1,58 @@
 import argparse
+import hashlib
+import json
 import logging
 import os
 import pathlib
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
 import dotenv
+import fsspec
 
 import coastal_dynamics as cd
 
-
-def process_questions(questions):
-    """Process and hash answers within the questions dictionary based on question type."""
-    for _, q_data in questions.items():
-        print(1)
-        q_data["answer"] = cd.hash_answer(
-            q_data.get("answer"), q_data.get("type"), sig_figs=q_data.get("sig_figs")
-        )
-        print(2)
-    return questions
+QUESTIONS_DIR = "coastal-dynamics/questions"
+MANIFEST_NAME = "hash_manifest.json"
+
+
+def fingerprint(data) -> str:
+    """Content fingerprint of JSON serializable data."""
+    return hashlib.sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()
+
+
+def process_questions(questions, manifest_entries=None):
+    """Hash the answers of the questions whose content changed since the last run.
+
+    Args:
+        questions (dict): The questions with plain answers.
+        manifest_entries (dict, optional): Fingerprint and hashed answer per question
+            from the previous run.
+
+    Returns:
+        tuple: The questions with hashed answers, the new manifest entries and the
+        number of questions that were rehashed.
+    """
+    manifest_entries = manifest_entries or {}
+    processed_questions = {}
+    new_entries = {}
+    n_rehashed = 0
+    for key, q_data in questions.items():
+        q_fingerprint = fingerprint(q_data)
+        entry = manifest_entries.get(key)
+        if entry is None or entry["fingerprint"] != q_fingerprint:
+            entry = {
+                "fingerprint": q_fingerprint,
+                "answer": cd.hash_answer(
+                    q_data.get("answer"),
+                    q_data.get("type"),
+                    sig_figs=q_data.get("sig_figs"),
+                ),
+            }
+            n_rehashed += 1
+        processed_questions[key] = {**q_data, "answer": entry["answer"]}
+        new_entries[key] = entry
+    return processed_questions, new_entries, n_rehashed
 
 
 def parse_arguments():
@@ -26,7 +61,15 @@ def parse_arguments():
         description="Process questions from cloud storage."
     )
     parser.add_argument(
-        "fname", type=str, help="The file for the questions file to process"
+        "fnames", nargs="+", type=str, help="The files for the questions to process"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Rehash and write all questions, ignoring the manifest.",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=8, help="Number of files processed in parallel."
     )
     return parser.parse_args()
 
@@ -42,24 +85,65 @@ def load_environment():
     return {"account_name": storage_account_name, "sas_token": sas_token}
 
 
-def process_file(storage_options, blob_name):
-    """Process a single file."""
-    fstem = pathlib.Path(blob_name).stem
-    hashed_blob_name = f"coastal-dynamics/questions/{fstem}_hashed.json"
+def read_manifest(storage_options):
+    """Read the fingerprints of the previous run, or an empty manifest."""
+    try:
+        with fsspec.open(
+            f"az://{QUESTIONS_DIR}/{MANIFEST_NAME}", "r", **storage_options
+        ) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def write_manifest(manifest, storage_options):
+    """Write the fingerprints of this run."""
+    cd.write_questions(
+        manifest, f"az://{QUESTIONS_DIR}/{MANIFEST_NAME}", storage_options
+    )
+
+
+def process_file(storage_options, fstem, manifest_entry):
+    """Process a single file and write it when its hashed content changed."""
+    blob_name = f"az://{QUESTIONS_DIR}/{fstem}.json"
+    hashed_blob_name = f"az://{QUESTIONS_DIR}/{fstem}_hashed.json"
+
+    questions = cd.read_questions(blob_name, storage_options, cache=False)
+    processed_questions, entries, n_rehashed = process_questions(
+        questions, manifest_entry.get("questions")
+    )
+
+    output_fingerprint = fingerprint(processed_questions)
+    if output_fingerprint != manifest_entry.get("output"):
+        cd.write_questions(processed_questions, hashed_blob_name, storage_options)
+        logging.info(f"{fstem}: rehashed {n_rehashed} question(s) and wrote output.")
+    else:
+        logging.info(f"{fstem}: unchanged.")
 
-    questions = cd.read_questions(blob_name, storage_options)
-    processed_questions = process_questions(questions)
-    cd.write_questions(processed_questions, hashed_blob_name, storage_options)
+    return {"questions": entries, "output": output_fingerprint}
 
 
 def main():
     """Main function to orchestrate the processing of questions."""
     args = parse_arguments()
     storage_options = load_environment()
-    blob_name = f"az://coastal-dynamics/questions/{pathlib.Path(args.fname).stem}.json"
+    fstems = list(dict.fromkeys(pathlib.Path(fname).stem for fname in args.fnames))
 
     try:
-        process_file(storage_options, blob_name)
+        manifest = read_manifest(storage_options)
+        with ThreadPoolExecutor(max_workers=args.workers) as executor:
+            entries = executor.map(
+                lambda fstem: process_file(
+                    storage_options,
+                    fstem,
+                    {} if args.force else manifest.get(fstem, {}),
+                ),
+                fstems,
+            )
+            new_manifest = {**manifest, **dict(zip(fstems, entries, strict=True))}
+
+        if new_manifest != manifest:
+            write_manifest(new_manifest, storage_options)
         logging.info("Questions processed and stored successfully.")
     except Exception as e:
         logging.error(f"Failed to process questions: {e}")
@@ -0,0 +1,53 @@
+import argparse
+import logging
+import sys
+import time
+
+from coastal_dynamics import data
+
+
+def parse_arguments():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Download the data assets of the course into the local cache."
+    )
+    parser.add_argument(
+        "--notebook",
+        action="append",
+        help="Only fetch the assets of this notebook, can be repeated.",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=8, help="Number of concurrent downloads."
+    )
+    return parser.parse_args()
+
+
+def main():
+    """Main function to warm the data cache for the whole course or some notebooks."""
+    args = parse_arguments()
+
+    if args.notebook:
+        names = list(
+            dict.fromkeys(
+                name
+                for notebook in args.notebook
+                for name in data.notebook_assets(notebook)
+            )
+        )
+    else:
+        names = list(data.REGISTRY)
+
+    start = time.perf_counter()
+    try:
+        data.prefetch(names, max_workers=args.workers)
+    except Exception as e:
+        logging.error(f"Failed to fetch data assets: {e}")
+        sys.exit(1)
+    logging.info(
+        f"Fetched {len(names)} data assets in {time.perf_counter() - start:.1f} s."
+    )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
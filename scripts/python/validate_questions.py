@@ -0,0 +1,69 @@
+import argparse
+import glob
+import logging
+import sys
+
+import coastal_dynamics as cd
+from coastal_dynamics.io import get_filesystem
+from coastal_dynamics.schema import find_errors
+
+
+def parse_arguments():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Validate question banks against the question format."
+    )
+    parser.add_argument(
+        "fnames",
+        nargs="+",
+        type=str,
+        help="The question files to validate, which can be glob patterns.",
+    )
+    parser.add_argument(
+        "--account-name",
+        type=str,
+        help="Azure storage account of az:// files, e.g. 'coclico'.",
+    )
+    return parser.parse_args()
+
+
+def expand_fnames(fnames, storage_options):
+    """Expand glob patterns, keeping the protocol of remote files."""
+    expanded = []
+    for fname in fnames:
+        if not glob.has_magic(fname):
+            expanded.append(fname)
+            continue
+        fs, _ = get_filesystem(fname, storage_options)
+        matches = fs.glob(fname)
+        if not matches:
+            msg = f"No files found for: {fname}"
+            raise FileNotFoundError(msg)
+        expanded.extend(fs.unstrip_protocol(match) for match in sorted(matches))
+    return expanded
+
+
+def main():
+    """Main function to validate all question banks and report every error."""
+    args = parse_arguments()
+    storage_options = {"account_name": args.account_name} if args.account_name else {}
+    fnames = expand_fnames(args.fnames, storage_options)
+
+    n_errors = 0
+    for fname in fnames:
+        # Check the current file, not a cached copy of an earlier version
+        questions = cd.read_questions(fname, storage_options, cache=False)
+        errors = find_errors(questions)
+        for error in errors:
+            logging.error(f"{fname}: {error}")
+        n_errors += len(errors)
+
+    if n_errors:
+        logging.error(f"Found {n_errors} error(s) in {len(fnames)} file(s).")
+        sys.exit(1)
+    logging.info(f"All {len(fnames)} question file(s) are valid.")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+    main()
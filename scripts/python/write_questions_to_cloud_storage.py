@@ -1,23 +1,51 @@
 import argparse
+import glob
+import hashlib
 import logging
 import os
 import sys
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path, PurePosixPath
 
 import dotenv
 import fsspec
 
+from coastal_dynamics.io import get_filesystem
+
+AZURE_PROTOCOLS = ("az", "abfs", "abfss")
+HASH_CHUNK_SIZE = 2**20
+
 
 def parse_arguments():
     """Parse command line arguments."""
     parser = argparse.ArgumentParser(
-        description="Upload a JSON file to a cloud container."
+        description="Upload files to a cloud container, skipping unchanged files."
+    )
+    parser.add_argument(
+        "sources",
+        nargs="+",
+        type=str,
+        help="Files, directories or glob patterns, e.g. 'questions/*.json'.",
     )
-    parser.add_argument("file_path", type=Path, help="Path to the JSON file to upload.")
     parser.add_argument(
         "cloud_href",
         type=str,
-        help="Href to the cloud container, e.g., 'az://bucket_name/path/*.json'",
+        help=(
+            "Href to the cloud container, e.g., 'az://bucket_name/path'. A single "
+            "file is uploaded to this exact href when it has a file extension."
+        ),
+    )
+    parser.add_argument(
+        "--workers", type=int, default=8, help="Number of files uploaded in parallel."
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=4,
+        help="Number of blocks of a single large file uploaded in parallel.",
+    )
+    parser.add_argument(
+        "--force", action="store_true", help="Upload all files, even unchanged ones."
     )
     return parser.parse_args()
 
@@ -33,27 +61,152 @@ def load_environment():
     return {"account_name": account_name, "sas_token": sas_token}
 
 
-def upload_file(file_path, cloud_href, storage_options):
-    """Upload a JSON file to the specified cloud storage container."""
-    with fsspec.open(file_path, "rb") as src_file:
-        json_data = src_file.read()
+def collect_files(sources):
+    """Expand files, directories and glob patterns into (local path, relative name).
+
+    Files in a directory keep their path relative to that directory, files that
+    match a glob pattern keep their path relative to the part before the first
+    wildcard and single files keep their name.
+    """
+    files = {}
+    for source in sources:
+        if glob.has_magic(source):
+            parts = Path(source).parts
+            n_static = next(i for i, part in enumerate(parts) if glob.has_magic(part))
+            root = Path(*parts[:n_static]) if n_static else Path()
+            matches = [Path(p) for p in glob.glob(source, recursive=True)]
+            files.update(
+                (path, path.relative_to(root).as_posix())
+                for path in matches
+                if path.is_file()
+            )
+        elif Path(source).is_dir():
+            root = Path(source)
+            files.update(
+                (path, path.relative_to(root).as_posix())
+                for path in sorted(root.rglob("*"))
+                if path.is_file()
+            )
+        elif Path(source).is_file():
+            files[Path(source)] = Path(source).name
+        else:
+            msg = f"No files found for: {source}"
+            raise FileNotFoundError(msg)
+    return list(files.items())
+
+
+def destination(cloud_href, relative_name, is_single_file):
+    """Remote path of a file, or the href itself for a single file upload."""
+    if is_single_file and PurePosixPath(cloud_href).suffix:
+        return cloud_href
+    return f"{cloud_href.rstrip('/')}/{relative_name}"
+
+
+def local_md5(file_path):
+    """MD5 digest of a local file, read in chunks so memory use stays bounded."""
+    md5 = hashlib.md5()
+    with open(file_path, "rb") as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            md5.update(chunk)
+    return md5.hexdigest()
 
-    with fsspec.open(cloud_href, "wb", **storage_options) as f:
-        f.write(json_data)
+
+def remote_md5(info):
+    """MD5 of a remote file from its metadata, or None when it is not available.
+
+    Azure Blob storage keeps the MD5 in the Content-MD5 property. Other stores
+    expose an "md5" field, or an ETag that equals the MD5 for single part uploads.
+    """
+    content_settings = info.get("content_settings") or {}
+    content_md5 = content_settings.get("content_md5")
+    if content_md5:
+        return bytes(content_md5).hex()
+    if info.get("md5"):
+        return str(info["md5"])
+    etag = str(info.get("etag") or info.get("ETag") or "").strip('"')
+    if len(etag) == 32 and all(c in "0123456789abcdef" for c in etag.lower()):
+        return etag.lower()
+    return None
+
+
+def upload_file(fs, file_path, remote_path, max_concurrency, force=False):
+    """Upload a file unless the remote copy has the same content.
+
+    The file is streamed from disk; on Azure the blocks of a large file are uploaded
+    in parallel, so memory use is bounded by the block size times the concurrency.
+
+    Returns:
+        bool: Whether the file was uploaded.
+    """
+    md5 = local_md5(file_path)
+    if not force:
+        try:
+            if remote_md5(fs.info(remote_path)) == md5:
+                return False
+        except FileNotFoundError:
+            pass
+
+    kwargs = {}
+    protocols = [fs.protocol] if isinstance(fs.protocol, str) else fs.protocol
+    if set(protocols) & set(AZURE_PROTOCOLS):
+        kwargs = {
+            "max_concurrency": max_concurrency,
+            "content_settings": {"content_md5": bytearray(bytes.fromhex(md5))},
+        }
+    fs.put_file(str(file_path), remote_path, **kwargs)
+    return True
+
+
+def sync_files(
+    sources, cloud_href, storage_options, workers=8, max_concurrency=4, force=False
+):
+    """Upload the changed files of the sources to the cloud href.
+
+    Returns:
+        tuple: The number of uploaded and skipped files.
+    """
+    files = collect_files(sources)
+    fs, _ = get_filesystem(cloud_href, storage_options)
+    is_single_file = len(files) == 1 and Path(sources[0]).is_file()
+
+    def sync(item):
+        file_path, relative_name = item
+        remote_path = fs._strip_protocol(
+            destination(cloud_href, relative_name, is_single_file)
+        )
+        uploaded = upload_file(fs, file_path, remote_path, max_concurrency, force)
+        logging.info(f"{'Uploaded' if uploaded else 'Unchanged'}: {file_path}")
+        return uploaded
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        uploaded = list(executor.map(sync, files))
+    return sum(uploaded), len(uploaded) - sum(uploaded)
 
 
 def main():
-    """Main function to orchestrate the upload of a JSON file."""
+    """Main function to orchestrate the upload of the files."""
     args = parse_arguments()
-    storage_options = load_environment()
+    storage_options = (
+        load_environment()
+        if fsspec.utils.get_protocol(args.cloud_href) in AZURE_PROTOCOLS
+        else {}
+    )
 
     try:
-        upload_file(args.file_path, args.cloud_href, storage_options)
+        n_uploaded, n_skipped = sync_files(
+            args.sources,
+            args.cloud_href,
+            storage_options,
+            workers=args.workers,
+            max_concurrency=args.max_concurrency,
+            force=args.force,
+        )
         logging.info(
-            f"File {args.file_path} uploaded successfully to {args.cloud_href}."
+            f"Uploaded {n_uploaded} file(s) to {args.cloud_href}, "
+            f"skipped {n_skipped} unchanged file(s)."
         )
     except Exception as e:
-        logging.error(f"Failed to upload file: {e}")
+        logging.error(f"Failed to upload files: {e}")
         sys.exit(1)
 
 
@@ -4,14 +4,50 @@ __author__ = """Floris Calkoen"""
 __email__ = "floris@calkoen.nl"
 __version__ = "0.0.7"
 
-from .factory import QuestionFactory
-from .io import read_questions, write_questions
-from .multiple_choice import MultipleChoiceQuestion
-from .multiple_selection import MultipleSelectionQuestion
-from .numeric import NumericQuestion
-from .question import Question
-from .text import TextQuestion
-from .utils import hash_answer
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .bank import IndexedQuestionBank, QuestionBank
+    from .factory import QuestionFactory
+    from .io import read_questions, write_questions
+    from .multiple_choice import MultipleChoiceQuestion
+    from .multiple_selection import MultipleSelectionQuestion
+    from .numeric import NumericQuestion
+    from .question import Question
+    from .schema import QuestionValidationError, validate_questions
+    from .text import TextQuestion
+    from .utils import compile_answer_index, format_sig_figs, hash_answer
+
+# Public names are resolved on first access, so that importing the package does not
+# pull in Panel, NumPy or the cloud storage libraries until they are actually needed.
+_lazy_imports = {
+    "IndexedQuestionBank": ".bank",
+    "QuestionBank": ".bank",
+    "QuestionFactory": ".factory",
+    "read_questions": ".io",
+    "write_questions": ".io",
+    "MultipleChoiceQuestion": ".multiple_choice",
+    "MultipleSelectionQuestion": ".multiple_selection",
+    "NumericQuestion": ".numeric",
+    "Question": ".question",
+    "QuestionValidationError": ".schema",
+    "validate_questions": ".schema",
+    "TextQuestion": ".text",
+    "compile_answer_index": ".utils",
+    "format_sig_figs": ".utils",
+    "hash_answer": ".utils",
+}
+
+_lazy_submodules = {
+    "data",
+    "grading",
+    "pyramid",
+    "shoreline",
+    "simplification",
+    "tileserver",
+    "transects",
+}
 
 __all__ = [
     "MultipleChoiceQuestion",
@@ -19,8 +55,30 @@ __all__ = [
     "TextQuestion",
     "NumericQuestion",
     "QuestionFactory",
+    "QuestionBank",
+    "IndexedQuestionBank",
     "Question",
+    "QuestionValidationError",
+    "compile_answer_index",
+    "format_sig_figs",
     "hash_answer",
     "read_questions",
+    "validate_questions",
     "write_questions",
 ]
+
+
+def __getattr__(name: str):
+    if name in _lazy_submodules:
+        return importlib.import_module(f".{name}", __name__)
+    if name in _lazy_imports:
+        module = importlib.import_module(_lazy_imports[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(msg)
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__) | _lazy_submodules)
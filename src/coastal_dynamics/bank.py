@@ -0,0 +1,188 @@
+from collections.abc import Iterator, Mapping
+from typing import Any, Optional
+
+from coastal_dynamics.schema import validate_questions
+
+
+class LazyQuestion:
+    """A question that builds its Panel widgets the first time it is displayed.
+
+    The object only holds the question data until Panel asks for its view, at which
+    point a ``QuestionFactory`` creates the widgets once and the resulting column is
+    reused on every subsequent display.
+
+    Attributes:
+        key (str): The key of the question in the question bank.
+        question_data (Dict[str, Any]): Dictionary containing data for the question.
+    """
+
+    def __init__(self, key: str, question_data: dict[str, Any]):
+        self.key = key
+        self.question_data = question_data
+        self._factory = None
+        self._panel = None
+
+    @property
+    def is_built(self) -> bool:
+        """Whether the Panel widgets of this question have been created."""
+        return self._factory is not None
+
+    @property
+    def question_widget(self):
+        """The question widget, created on first access."""
+        if self._factory is None:
+            from coastal_dynamics.factory import QuestionFactory
+
+            self._factory = QuestionFactory(self.question_data, serve=False)
+        return self._factory.question_widget
+
+    def serve(self):
+        """Serve the question as a Panel column, building it if needed."""
+        if self._panel is None:
+            self._panel = self.question_widget.serve()
+        return self._panel
+
+    def __panel__(self):
+        return self.serve()
+
+    def _repr_mimebundle_(self, include=None, exclude=None):
+        return self.serve()._repr_mimebundle_(include, exclude)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.key!r}, built={self.is_built})"
+
+
+class QuestionBank(Mapping):
+    """A collection of questions whose widgets are created only when displayed.
+
+    The question data is validated once when the bank is created. Indexing the bank
+    returns a ``LazyQuestion`` that can be placed directly in a Panel layout, so the
+    cost of building widgets scales with the questions that are actually shown.
+
+    Attributes:
+        questions (Dict[str, Dict[str, Any]]): The validated question data by key.
+
+    Example:
+        >>> questions = cd.QuestionBank.from_file(
+        ...     "az://coastal-dynamics/questions/1_coastal_classification_hashed.json",
+        ...     storage_options={"account_name": "coclico"},
+        ... )
+        >>> pn.Column(questions["Q1-1"], questions["Q1-2"])
+    """
+
+    def __init__(self, questions: dict[str, dict[str, Any]]):
+        validate_questions(questions)
+        self.questions = questions
+        self._lazy_questions: dict[str, LazyQuestion] = {}
+
+    @classmethod
+    def from_file(
+        cls, blob_name: str, storage_options: Optional[dict[str, str]] = None
+    ) -> "QuestionBank":
+        """Create a question bank from a JSON file on local or cloud storage.
+
+        Remote files are read through the default cache of ``read_questions``.
+        """
+        from coastal_dynamics.io import read_questions
+
+        return cls(read_questions(blob_name, storage_options, cache=True))
+
+    def __getitem__(self, key: str) -> LazyQuestion:
+        if key not in self._lazy_questions:
+            self._lazy_questions[key] = LazyQuestion(key, self.questions[key])
+        return self._lazy_questions[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.questions)
+
+    def __len__(self) -> int:
+        return len(self.questions)
+
+    @property
+    def n_built(self) -> int:
+        """The number of questions whose widgets have been created."""
+        return sum(q.is_built for q in self._lazy_questions.values())
+
+    def serve(self, *keys: str):
+        """Serve the given questions, or all questions, as a Panel column.
+
+        Only the widgets of the requested questions are created.
+        """
+        import panel as pn
+
+        return pn.Column(*(self[key] for key in keys or self.questions))
+
+
+class IndexedQuestionBank(Mapping):
+    """A question bank in the indexed ".qbank" format, fetched question by question.
+
+    Only the index of the bank is read when it is opened. Indexing the bank or
+    requesting a section fetches and decodes just the records of those questions
+    with byte range requests, so the time to show one section does not grow with
+    the size of the course bank. Fetched questions are kept in memory.
+
+    Indexed banks are written by ``write_questions`` when the file name ends with
+    ".qbank".
+
+    Attributes:
+        index (Dict[str, Dict[str, Any]]): Byte range per question key and question
+            keys per section.
+
+    Example:
+        >>> bank = cd.IndexedQuestionBank(
+        ...     "https://coclico.blob.core.windows.net/coastal-dynamics/questions/"
+        ...     "course_hashed.qbank"
+        ... )
+        >>> bank.section("3a").serve()
+    """
+
+    def __init__(
+        self, blob_name: str, storage_options: Optional[dict[str, str]] = None
+    ):
+        from coastal_dynamics.io import get_filesystem, read_question_index
+
+        self._fs, self._path = get_filesystem(blob_name, storage_options)
+        self.index = read_question_index(self._fs, self._path)
+        self._questions: dict[str, dict[str, Any]] = {}
+        self._lazy_questions: dict[str, LazyQuestion] = {}
+
+    def _fetch(self, keys: list[str]) -> dict[str, dict[str, Any]]:
+        from coastal_dynamics.io import read_question_records
+
+        missing = [key for key in keys if key not in self._questions]
+        self._questions.update(
+            read_question_records(self._fs, self._path, self.index, missing)
+        )
+        return {key: self._questions[key] for key in keys}
+
+    def __getitem__(self, key: str) -> LazyQuestion:
+        if key not in self.index["questions"]:
+            raise KeyError(key)
+        if key not in self._lazy_questions:
+            questions = self._fetch([key])
+            validate_questions(questions)
+            self._lazy_questions[key] = LazyQuestion(key, questions[key])
+        return self._lazy_questions[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.index["questions"])
+
+    def __len__(self) -> int:
+        return len(self.index["questions"])
+
+    @property
+    def sections(self) -> list[str]:
+        """The sections in the bank, e.g. "3a" for questions such as "Q3a-1"."""
+        return list(self.index["sections"])
+
+    @property
+    def n_fetched(self) -> int:
+        """The number of questions whose records have been fetched."""
+        return len(self._questions)
+
+    def section(self, section: str) -> QuestionBank:
+        """Fetch the questions of a section as a ``QuestionBank``."""
+        if section not in self.index["sections"]:
+            msg = f"Unknown section: {section}"
+            raise ValueError(msg)
+        return QuestionBank(self._fetch(self.index["sections"][section]))
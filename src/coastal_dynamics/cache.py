@@ -0,0 +1,279 @@
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import pathlib
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections.abc import Iterator
+from typing import Any, Optional
+
+import fsspec
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = pathlib.Path.home() / ".cache" / "coastal_dynamics"
+DEFAULT_TTL = 3600
+DEFAULT_MAX_SIZE = 256 * 2**20
+
+HTTP_PROTOCOLS = ("http", "https")
+
+
+def is_remote(urlpath: str) -> bool:
+    """Whether a url points to remote storage rather than the local filesystem."""
+    return fsspec.utils.get_protocol(urlpath) not in ("file", "local")
+
+
+@contextlib.contextmanager
+def atomic_path(path: str | pathlib.Path) -> Iterator[pathlib.Path]:
+    """Temporary file next to ``path`` that replaces it once the block succeeds.
+
+    Readers, also in other processes, see either the previous or the complete new
+    file, and a failed write leaves no partial file behind:
+
+        >>> with atomic_path("layer/0.parquet") as tmp_path:
+        ...     gdf.to_parquet(tmp_path)
+    """
+    path = pathlib.Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(
+        dir=path.parent, prefix=f"{path.name}.", suffix=".tmp"
+    )
+    os.close(fd)
+    tmp_path = pathlib.Path(tmp_path)
+    try:
+        yield tmp_path
+        tmp_path.replace(path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+def write_atomic(path: str | pathlib.Path, data: bytes) -> None:
+    """Write the bytes of a file atomically, see ``atomic_path``."""
+    with atomic_path(path) as tmp_path:
+        tmp_path.write_bytes(data)
+
+
+def _is_unchanged(validators: dict[str, Any], metadata: dict[str, Any]) -> bool:
+    """Whether a remote file still matches the validators of its cached copy.
+
+    The ETag changes with every write, while the modification time can stay the
+    same or be too coarse, so it is only used when there is no ETag.
+    """
+    if validators["etag"]:
+        return validators["etag"] == metadata.get("etag")
+    if validators["last_modified"]:
+        return validators["last_modified"] == metadata.get("last_modified")
+    return False
+
+
+def _is_offline_error(error: BaseException) -> bool:
+    """Whether an error means that the remote storage cannot be reached.
+
+    Only connection failures and timeouts qualify. A missing file or a refused
+    authorization, such as a FileNotFoundError or an HTTP 403 or 404, is an answer
+    from the storage and is raised rather than hidden behind a stale cached copy.
+    The Azure SDK, used by adlfs for az:// urls, raises its own errors rather than
+    OSError when the network is down.
+    """
+    if isinstance(error, urllib.error.HTTPError):
+        return False
+    if isinstance(error, (ConnectionError, TimeoutError, urllib.error.URLError)):
+        return True
+    try:
+        from azure.core.exceptions import ServiceRequestError
+    except ImportError:
+        return False
+    return isinstance(error, ServiceRequestError)
+
+
+class RemoteFileCache:
+    """A persistent on-disk cache for small remote files such as question banks.
+
+    Cached files are served without any network request while they are younger than
+    the time-to-live. Older files are revalidated with their ETag or Last-Modified
+    validators, so an unchanged file costs a single conditional request and is not
+    downloaded again. When the remote storage cannot be reached, the cached copy is
+    used. The least recently used files are evicted when the cache grows beyond its
+    maximum size.
+
+    Attributes:
+        cache_dir (pathlib.Path): Directory where the files and their metadata live.
+        ttl (float): Seconds during which a cached file is used without revalidation.
+        max_size (int): Maximum total size of the cached files in bytes.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str | pathlib.Path] = None,
+        ttl: float = DEFAULT_TTL,
+        max_size: int = DEFAULT_MAX_SIZE,
+    ):
+        self.cache_dir = pathlib.Path(cache_dir or DEFAULT_CACHE_DIR)
+        self.ttl = ttl
+        self.max_size = max_size
+        self._lock = threading.Lock()
+
+    def _key(self, urlpath: str) -> str:
+        return hashlib.sha256(urlpath.encode()).hexdigest()
+
+    def _paths(self, urlpath: str) -> tuple[pathlib.Path, pathlib.Path]:
+        key = self._key(urlpath)
+        return self.cache_dir / key, self.cache_dir / f"{key}.meta.json"
+
+    def _read_metadata(self, meta_path: pathlib.Path) -> Optional[dict[str, Any]]:
+        try:
+            with meta_path.open() as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _store_metadata(self, urlpath: str, validators: dict[str, Any]) -> None:
+        _, meta_path = self._paths(urlpath)
+        # The url can hold a SAS token, so only its hash is stored
+        metadata = {"key": self._key(urlpath), "fetched_at": time.time(), **validators}
+        write_atomic(meta_path, json.dumps(metadata).encode())
+
+    def _store(self, urlpath: str, data: bytes, validators: dict[str, Any]) -> None:
+        data_path, _ = self._paths(urlpath)
+        write_atomic(data_path, data)
+        self._store_metadata(urlpath, validators)
+        self._evict()
+
+    def _fetch_http(
+        self, urlpath: str, metadata: Optional[dict[str, Any]]
+    ) -> tuple[Optional[bytes], dict[str, Any]]:
+        """Conditional GET; returns no data when the cached copy is still valid."""
+        request = urllib.request.Request(urlpath)
+        if metadata and metadata.get("etag"):
+            request.add_header("If-None-Match", metadata["etag"])
+        elif metadata and metadata.get("last_modified"):
+            request.add_header("If-Modified-Since", metadata["last_modified"])
+        try:
+            with urllib.request.urlopen(request) as response:
+                validators = {
+                    "etag": response.headers.get("ETag"),
+                    "last_modified": response.headers.get("Last-Modified"),
+                }
+                return response.read(), validators
+        except urllib.error.HTTPError as e:
+            if e.code == 304 and metadata:
+                return None, {
+                    "etag": metadata.get("etag"),
+                    "last_modified": metadata.get("last_modified"),
+                }
+            raise
+
+    def _fetch_fs(
+        self,
+        urlpath: str,
+        metadata: Optional[dict[str, Any]],
+        storage_options: dict[str, Any],
+    ) -> tuple[Optional[bytes], dict[str, Any]]:
+        """Compare the fsspec file info with the cached validators before fetching."""
+        fs, path = fsspec.core.url_to_fs(urlpath, **storage_options)
+        info = fs.info(path)
+        etag = info.get("etag") or info.get("ETag")
+        last_modified = info.get("last_modified") or info.get("mtime")
+        validators = {
+            "etag": str(etag) if etag else None,
+            "last_modified": str(last_modified) if last_modified else None,
+        }
+        if metadata and _is_unchanged(validators, metadata):
+            return None, validators
+        return fs.cat_file(path), validators
+
+    def get(
+        self, urlpath: str, storage_options: Optional[dict[str, Any]] = None
+    ) -> bytes:
+        """Return the content of a remote file, from the cache when possible.
+
+        Args:
+            urlpath (str): Url of the remote file, e.g. "az://container/file.json".
+            storage_options (Optional[Dict[str, Any]]): If given, contains options such
+                as account name and SAS token for Azure Blob storage.
+
+        Returns:
+            bytes: The content of the file.
+        """
+        data_path, meta_path = self._paths(urlpath)
+        with self._lock:
+            metadata = self._read_metadata(meta_path)
+            is_cached = metadata is not None and data_path.exists()
+            if not is_cached:
+                metadata = None
+
+            if is_cached and time.time() - metadata["fetched_at"] < self.ttl:
+                data_path.touch()
+                return data_path.read_bytes()
+
+            try:
+                if fsspec.utils.get_protocol(urlpath) in HTTP_PROTOCOLS:
+                    data, validators = self._fetch_http(urlpath, metadata)
+                else:
+                    data, validators = self._fetch_fs(
+                        urlpath, metadata, storage_options or {}
+                    )
+            except Exception as e:
+                if not is_cached or not _is_offline_error(e):
+                    raise
+                logger.warning(f"Using cached copy of {urlpath}, cannot reach it: {e}")
+                data_path.touch()
+                return data_path.read_bytes()
+
+            if data is None:
+                # Not modified, so only renew the time-to-live
+                self._store_metadata(urlpath, validators)
+                data_path.touch()
+                return data_path.read_bytes()
+
+            self._store(urlpath, data, validators)
+            return data
+
+    def _evict(self) -> None:
+        """Remove the least recently used files until the cache fits its size."""
+        entries = [
+            (path.stat().st_mtime, path.stat().st_size, path)
+            for path in self.cache_dir.iterdir()
+            if path.is_file() and not path.name.endswith((".meta.json", ".tmp"))
+        ]
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            path.unlink(missing_ok=True)
+            path.with_name(f"{path.name}.meta.json").unlink(missing_ok=True)
+            total_size -= size
+
+    def clear(self) -> None:
+        """Remove all files from the cache."""
+        with self._lock:
+            if self.cache_dir.exists():
+                for path in self.cache_dir.iterdir():
+                    path.unlink(missing_ok=True)
+
+
+_default_cache: Optional[RemoteFileCache] = None
+
+
+def default_cache() -> RemoteFileCache:
+    """The cache used by ``read_questions``, configured by environment variables.
+
+    The directory, time-to-live in seconds and maximum size in bytes can be set with
+    COASTAL_DYNAMICS_CACHE_DIR, COASTAL_DYNAMICS_CACHE_TTL and
+    COASTAL_DYNAMICS_CACHE_MAX_SIZE.
+    """
+    global _default_cache  # noqa: PLW0603
+    if _default_cache is None:
+        _default_cache = RemoteFileCache(
+            cache_dir=os.getenv("COASTAL_DYNAMICS_CACHE_DIR"),
+            ttl=float(os.getenv("COASTAL_DYNAMICS_CACHE_TTL", DEFAULT_TTL)),
+            max_size=int(
+                os.getenv("COASTAL_DYNAMICS_CACHE_MAX_SIZE", DEFAULT_MAX_SIZE)
+            ),
+        )
+    return _default_cache
@@ -0,0 +1,292 @@
+"""Registry of the data assets that are used in the notebooks.
+
+All assets are downloaded with pooch into its default cache, so the registry shares
+the cache with existing ``pooch.retrieve`` calls. ``prefetch`` downloads the assets
+of one or more notebooks concurrently, e.g. before a lab session:
+
+    >>> from coastal_dynamics import data
+    >>> fp1, fp2 = data.prefetch(["tide_scheveningen.p", "tide_jakarta.p"])
+    >>> data.prefetch(notebook="8_tidal_basins")
+
+In asynchronous code, such as Panel callbacks, ``afetch`` and ``aprefetch`` download
+the assets with fsspec's asynchronous filesystems into the same cache:
+
+    >>> fp = await data.afetch("tide_jakarta.p")
+"""
+
+import asyncio
+import hashlib
+import pathlib
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+import pooch
+
+from coastal_dynamics.cache import write_atomic
+
+BASE_URL = "https://coclico.blob.core.windows.net/coastal-dynamics"
+
+REGISTRY = {
+    "earthquakes_sample.parquet": {
+        "url": f"{BASE_URL}/1_coastal_classification/earthquakes_sample.parquet",
+        "known_hash": "30dadc107887022464625be5a0d709894c57ec78c8cdfa9d2b697d2580c3c424",
+        "notebooks": ["1_coastal_classification"],
+    },
+    "isobaths200.gpkg": {
+        "url": f"{BASE_URL}/1_coastal_classification/isobaths200.gpkg",
+        "known_hash": "2b25adb7d3923e3969f6fb0c1f53e5e5850acd3bf6a3468722f0a1434a395ae5",
+        "notebooks": ["1_coastal_classification"],
+    },
+    "coastal_systems.parquet": {
+        "url": f"{BASE_URL}/1_coastal_classification/coastal_systems.parquet",
+        "known_hash": "923fd66cc58b5fbf32abbc51f46af15b179ed06e922bb9ff5efeb5680853900a",
+        "notebooks": ["1_coastal_classification"],
+    },
+    "Scheveningen_GESLA.pkl": {
+        "url": f"{BASE_URL}/2_wind_waves_tides/Scheveningen_GESLA.pkl",
+        "known_hash": "90355584803ddcdf88b01fcf02546c4d8201a3fa6f63355ecfdb8ab6a07d1e38",
+        "notebooks": ["2d_tidal_constituents", "4b_shallow_water_tides"],
+    },
+    "tide_scheveningen.p": {
+        "url": f"{BASE_URL}/2_wind_waves_tides/tide_scheveningen.p",
+        "known_hash": "4ebac210fc0893e52655cbc3c9501a6c805e3537f327fed7edb9e7dbfe7fa06a",
+        "notebooks": [
+            "2d_tidal_constituents",
+            "3a_tidal_environments",
+            "4b_shallow_water_tides",
+        ],
+    },
+    "tide_galveston.p": {
+        "url": f"{BASE_URL}/2_wind_waves_tides/tide_galveston.p",
+        "known_hash": "26af20b240804a18a939d477632b4507d44ebdc98510deb07e601732c0846224",
+        "notebooks": ["3a_tidal_environments"],
+    },
+    "tide_jakarta.p": {
+        "url": f"{BASE_URL}/2_wind_waves_tides/tide_jakarta.p",
+        "known_hash": "7950246c47e757d9dd427063d7c809fda4267ed119efd18de43237aa9f98c9c6",
+        "notebooks": ["3a_tidal_environments", "4b_shallow_water_tides"],
+    },
+    "tide_valparaiso.p": {
+        "url": f"{BASE_URL}/2_wind_waves_tides/tide_valparaiso.p",
+        "known_hash": "a19a51e3607822bc72ab902f83990d2b318a08d1982c25461f8ffd6e5caae35f",
+        "notebooks": ["3a_tidal_environments"],
+    },
+    "02_F_data.pkl": {
+        "url": f"{BASE_URL}/02-tide/02_F_data.pkl",
+        "known_hash": "eae7be0e7b44ed5b211e931bd6e5948e0aa8db067403956fe2d486f69e49c769",
+        "notebooks": ["3a_tidal_environments"],
+    },
+    "5_data.gpkg": {
+        "url": f"{BASE_URL}/5_coastal_impact_beach_states/5_data.gpkg",
+        "known_hash": "661ddc9ad6a396dd6fe9a9cf2126a32b1134fef92075fa19f5ee1ee445125934",
+        "notebooks": ["5_coastal_impact_beach_states"],
+    },
+    "5_fig413_bg.jpg": {
+        "url": f"{BASE_URL}/5_coastal_impact_beach_states/5_fig413_bg.jpg",
+        "known_hash": "f71b11a7f30fdf49e99379a328f6d018f2181dd906b6b2c4495014336c5e1161",
+        "notebooks": ["5_coastal_impact_beach_states"],
+    },
+    "6_fig720.png": {
+        "url": f"{BASE_URL}/6_cross_shore_transport/6_fig720.png",
+        "known_hash": "63ead6e943fd3c3ff0c52ec9370ffa23f0f0052c2912a3fa4ddad8dd30edcc47",
+        "notebooks": ["6_cross_shore_transport"],
+    },
+    "6_uk_bath.csv": {
+        "url": f"{BASE_URL}/6_cross_shore_transport/6_uk_bath.csv",
+        "known_hash": "3082b3a6e968f95dc21a73006903aede461921265a352fc65b3797ec5bfb9ae1",
+        "notebooks": ["6_cross_shore_transport"],
+    },
+    "6_nl_bath.csv": {
+        "url": f"{BASE_URL}/6_cross_shore_transport/6_nl_bath.csv",
+        "known_hash": "d0e7ac1c959c04aef0848fea685347280a170b39239c8510b234dfec80c8867e",
+        "notebooks": ["6_cross_shore_transport"],
+    },
+    "7_X.txt": {
+        "url": f"{BASE_URL}/7_alongshore_transport/7_X.txt",
+        "known_hash": "908f9b3871098c0446fb3b6c8933bd62cfeb83df33db5469814f6516be596767",
+        "notebooks": ["7_alongshore_transport"],
+    },
+    "7_T.txt": {
+        "url": f"{BASE_URL}/7_alongshore_transport/7_T.txt",
+        "known_hash": "5e71b53e92b4493c5e8a0b2b29fcd1bcd1620645a561896df309883982155ff9",
+        "notebooks": ["7_alongshore_transport"],
+    },
+    "7_Y_t.txt": {
+        "url": f"{BASE_URL}/7_alongshore_transport/7_Y_t.txt",
+        "known_hash": "480eb21ccfad136acc81ced0c915cc4ebcaed36259ec22148f5c0d295ed32f16",
+        "notebooks": ["7_alongshore_transport"],
+    },
+    "7_S_t.txt": {
+        "url": f"{BASE_URL}/7_alongshore_transport/7_S_t.txt",
+        "known_hash": "47500101458117c5041cb9a0afd96fd15306fa7d9bb7e48ae25c91ec3ad63970",
+        "notebooks": ["7_alongshore_transport"],
+    },
+    "8_Escoffier_interactive_1.png": {
+        "url": f"{BASE_URL}/8_tidal_basins/8_Escoffier_interactive_1.png",
+        "known_hash": "5540ff5bda7c3c816c53068525a73cb90a90be9e612d41a21f59a11d2512128e",
+        "notebooks": ["8_tidal_basins"],
+    },
+    "8_Escoffier_interactive_2.png": {
+        "url": f"{BASE_URL}/8_tidal_basins/8_Escoffier_interactive_2.png",
+        "known_hash": "cc0ab29e6aebab08c15cfd82e413a99222503815000bfd62304c5c8f0925b660",
+        "notebooks": ["8_tidal_basins"],
+    },
+    "8_Escoffier_interactive_3.png": {
+        "url": f"{BASE_URL}/8_tidal_basins/8_Escoffier_interactive_3.png",
+        "known_hash": "97866f1e5f895b3932d625e88b614259a6d9c3016624f70ff16c9455f2cc54b9",
+        "notebooks": ["8_tidal_basins"],
+    },
+    "8_Escoffier_interactive_4.png": {
+        "url": f"{BASE_URL}/8_tidal_basins/8_Escoffier_interactive_4.png",
+        "known_hash": "1033c627634bee2c871196aec72d090ea80ae17612d58663c1edd327ea499ea3",
+        "notebooks": ["8_tidal_basins"],
+    },
+    "8_Escoffier_interactive_5.png": {
+        "url": f"{BASE_URL}/8_tidal_basins/8_Escoffier_interactive_5.png",
+        "known_hash": "b31b7799fba86c790692d97743279e2306f3f7943093e80627714fab268d82f3",
+        "notebooks": ["8_tidal_basins"],
+    },
+    "8_Escoffier_interactive_6.png": {
+        "url": f"{BASE_URL}/8_tidal_basins/8_Escoffier_interactive_6.png",
+        "known_hash": "31aeef48459a1d582865570a50d0b57df748a4eb8a922fbc6048d5ac4938d8c5",
+        "notebooks": ["8_tidal_basins"],
+    },
+    "8_Escoffier_interactive_7.png": {
+        "url": f"{BASE_URL}/8_tidal_basins/8_Escoffier_interactive_7.png",
+        "known_hash": "bcce2ca9e2cf99cbd3ca5c3e407399c80b0b6a2ecbc1a647e73390765029c7e2",
+        "notebooks": ["8_tidal_basins"],
+    },
+}
+
+
+def notebook_assets(notebook: str) -> list[str]:
+    """Names of the assets that are used in a notebook, e.g. "8_tidal_basins"."""
+    assets = [
+        name for name, asset in REGISTRY.items() if notebook in asset["notebooks"]
+    ]
+    if not assets:
+        msg = f"No data assets registered for notebook: {notebook}"
+        raise ValueError(msg)
+    return assets
+
+
+def fetch(name: str, progressbar: bool = False) -> str:
+    """Download a registered asset, or find it in the cache, and verify its hash.
+
+    Args:
+        name (str): Name of the asset in the registry.
+        progressbar (bool, optional): Show a download progress bar. Defaults to False.
+
+    Returns:
+        str: Local file path of the asset.
+    """
+    if name not in REGISTRY:
+        msg = f"Unknown data asset: {name}"
+        raise ValueError(msg)
+    asset = REGISTRY[name]
+    return pooch.retrieve(
+        asset["url"], known_hash=asset["known_hash"], progressbar=progressbar
+    )
+
+
+def prefetch(
+    names: Optional[Iterable[str]] = None,
+    notebook: Optional[str] = None,
+    max_workers: int = 8,
+) -> list[str]:
+    """Download several assets concurrently.
+
+    Args:
+        names (Optional[Iterable[str]], optional): Names of the assets. Defaults to
+            None, which selects the assets of ``notebook``, or all assets.
+        notebook (Optional[str], optional): Fetch the assets of this notebook.
+            Defaults to None.
+        max_workers (int, optional): Number of concurrent downloads. Defaults to 8.
+
+    Returns:
+        List[str]: Local file paths of the assets, in the order of ``names``.
+    """
+    if names is None:
+        names = notebook_assets(notebook) if notebook else list(REGISTRY)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(fetch, names))
+
+
+def cache_path(name: str) -> pathlib.Path:
+    """Local path of an asset in the pooch cache, whether it is downloaded or not."""
+    if name not in REGISTRY:
+        msg = f"Unknown data asset: {name}"
+        raise ValueError(msg)
+    cache_dir = pathlib.Path(pooch.os_cache("pooch")).resolve()
+    return cache_dir / pooch.utils.unique_file_name(REGISTRY[name]["url"])
+
+
+def _write_verified(path: pathlib.Path, data: bytes, known_hash: str) -> None:
+    """Verify the hash of downloaded data and move it into the cache atomically."""
+    data_hash = hashlib.sha256(data).hexdigest()
+    if data_hash != known_hash:
+        msg = f"SHA256 hash of downloaded {path.name} ({data_hash}) does not match "
+        msg += f"the known hash ({known_hash})."
+        raise ValueError(msg)
+    write_atomic(path, data)
+
+
+async def afetch(name: str) -> str:
+    """Download a registered asset without blocking the event loop.
+
+    The asset is stored in the same cache as ``fetch``, so either function finds
+    assets that were downloaded by the other.
+
+    Args:
+        name (str): Name of the asset in the registry.
+
+    Returns:
+        str: Local file path of the asset.
+    """
+    from coastal_dynamics.io import get_async_filesystem
+
+    path = cache_path(name)
+    asset = REGISTRY[name]
+    if path.exists() and await asyncio.to_thread(
+        pooch.hashes.hash_matches, str(path), asset["known_hash"]
+    ):
+        return str(path)
+
+    fs, urlpath = await get_async_filesystem(asset["url"])
+    if not fs.async_impl:
+        return await asyncio.to_thread(fetch, name)
+    data = await fs._cat_file(urlpath)
+    await asyncio.to_thread(_write_verified, path, data, asset["known_hash"])
+    return str(path)
+
+
+async def aprefetch(
+    names: Optional[Iterable[str]] = None,
+    notebook: Optional[str] = None,
+    max_concurrency: int = 8,
+) -> list[str]:
+    """Download several assets concurrently without blocking the event loop.
+
+    Args:
+        names (Optional[Iterable[str]], optional): Names of the assets. Defaults to
+            None, which selects the assets of ``notebook``, or all assets.
+        notebook (Optional[str], optional): Fetch the assets of this notebook.
+            Defaults to None.
+        max_concurrency (int, optional): Number of concurrent downloads. Defaults
+            to 8.
+
+    Returns:
+        List[str]: Local file paths of the assets, in the order of ``names``.
+    """
+    if names is None:
+        names = notebook_assets(notebook) if notebook else list(REGISTRY)
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def bounded_fetch(name: str) -> str:
+        async with semaphore:
+            return await afetch(name)
+
+    return list(await asyncio.gather(*(bounded_fetch(name) for name in names)))
@@ -3,6 +3,7 @@ from typing import Any
 from coastal_dynamics.multiple_choice import MultipleChoiceQuestion
 from coastal_dynamics.multiple_selection import MultipleSelectionQuestion
 from coastal_dynamics.numeric import NumericQuestion
+from coastal_dynamics.schema import REQUIRED_FIELDS
 from coastal_dynamics.text import TextQuestion
 
 
@@ -41,8 +42,7 @@ class QuestionFactory:
         return create_func()
 
     def _create_multiple_choice_question(self):
-        required_fields = ["name", "question", "options", "answer", "feedback"]
-        self._validate_required_fields(required_fields)
+        self._validate_required_fields(REQUIRED_FIELDS["multiple_choice"])
 
         return MultipleChoiceQuestion(
             question_name=self.question_data["name"],
@@ -53,8 +53,7 @@ class QuestionFactory:
         )
 
     def _create_multiple_selection_question(self):
-        required_fields = ["name", "question", "options", "answer", "feedback"]
-        self._validate_required_fields(required_fields)
+        self._validate_required_fields(REQUIRED_FIELDS["multiple_selection"])
 
         return MultipleSelectionQuestion(
             question_name=self.question_data["name"],
@@ -65,8 +64,7 @@ class QuestionFactory:
         )
 
     def _create_numeric_question(self):
-        required_fields = ["name", "question", "answer", "feedback"]
-        self._validate_required_fields(required_fields)
+        self._validate_required_fields(REQUIRED_FIELDS["numeric"])
 
         return NumericQuestion(
             question_name=self.question_data["name"],
@@ -79,8 +77,7 @@ class QuestionFactory:
         )
 
     def _create_text_question(self):
-        required_fields = ["name", "question", "answer", "feedback"]
-        self._validate_required_fields(required_fields)
+        self._validate_required_fields(REQUIRED_FIELDS["text"])
 
         return TextQuestion(
             question_name=self.question_data["name"],
@@ -1,8 +1,54 @@
-from typing import Any, Dict, List, Union
+import functools
+import itertools
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
 
 import geopandas as gpd
+import numpy as np
 import shapely
-from pyproj import Transformer
+from pyproj import CRS, Transformer
+
+# Maximum number of transformers that are kept for reuse
+TRANSFORMER_POOL_SIZE = 64
+
+
+@functools.lru_cache(maxsize=TRANSFORMER_POOL_SIZE)
+def _cached_transformer(src_wkt: str, dst_wkt: str, always_xy: bool) -> Transformer:
+    return Transformer.from_crs(src_wkt, dst_wkt, always_xy=always_xy)
+
+
+@functools.lru_cache(maxsize=TRANSFORMER_POOL_SIZE)
+def _cached_wkt(crs) -> str:
+    return CRS.from_user_input(crs).to_wkt()
+
+
+def _crs_key(crs) -> str:
+    """WKT of a CRS, which is hashable whatever the input, e.g. a PROJJSON dict."""
+    try:
+        return _cached_wkt(crs)
+    except TypeError:
+        return CRS.from_user_input(crs).to_wkt()
+
+
+def get_transformer(src_crs, dst_crs, always_xy: bool = True) -> Transformer:
+    """Shared transformer between two coordinate reference systems.
+
+    Creating a transformer is much more expensive than transforming a few points,
+    so transformers are kept in a bounded least recently used pool. Transformers are
+    thread-safe since pyproj 3.1, so the pool can be used from Panel's threaded
+    callbacks. The pool is keyed by the WKT of the CRSs, so unhashable inputs such
+    as PROJJSON dicts and different spellings of the same CRS share a transformer.
+
+    Args:
+        src_crs: Source CRS, anything accepted by ``pyproj.CRS.from_user_input``.
+        dst_crs: Destination CRS, anything accepted by ``pyproj.CRS.from_user_input``.
+        always_xy (bool, optional): Use x, y (lon, lat) axis order. Defaults to True.
+
+    Returns:
+        Transformer: The transformer.
+    """
+    return _cached_transformer(_crs_key(src_crs), _crs_key(dst_crs), always_xy)
 
 
 def build_bbox(min_lon, min_lat, max_lon, max_lat, src_crs, crs):
@@ -16,7 +62,7 @@ def build_bbox(min_lon, min_lat, max_lon, max_lat, src_crs, crs):
         [min_lat, min_lat, max_lat, max_lat],
     ]
 
-    transformer = Transformer.from_crs(src_crs, crs, always_xy=True)
+    transformer = get_transformer(src_crs, crs, always_xy=True)
     lons, lats = transformer.transform(*points)
 
     west = min(lons)
@@ -26,6 +72,79 @@ def build_bbox(min_lon, min_lat, max_lon, max_lat, src_crs, crs):
     return [west, south, east, north]
 
 
+def build_bboxes(bounds, src_crs, crs) -> np.ndarray:
+    """Reproject many bounding boxes with a single transform call.
+
+    Like ``build_bbox``, the box in the target CRS is spanned by the four
+    reprojected corners of each box.
+
+    Args:
+        bounds (array_like): Boxes as rows of (min_lon, min_lat, max_lon, max_lat).
+        src_crs: CRS of the bounds.
+        crs: CRS of the returned bounds.
+
+    Returns:
+        np.ndarray: Array of shape (N, 4) with (west, south, east, north) per box.
+    """
+    bounds = np.asarray(bounds, dtype=float).reshape(-1, 4)
+    xs = bounds[:, [0, 2, 2, 0]]
+    ys = bounds[:, [1, 1, 3, 3]]
+
+    transformer = get_transformer(src_crs, crs, always_xy=True)
+    lons, lats = transformer.transform(xs.ravel(), ys.ravel())
+    lons = lons.reshape(-1, 4)
+    lats = lats.reshape(-1, 4)
+    return np.column_stack(
+        [lons.min(axis=1), lats.min(axis=1), lons.max(axis=1), lats.max(axis=1)]
+    )
+
+
+def _collect_rings(coords, rings: List) -> None:
+    """Collect the sequences of positions, e.g. rings, of nested GeoJSON coordinates.
+
+    Only the nesting of rings and parts is walked in Python, not the vertices.
+    """
+    if len(coords) == 0:
+        return
+    if np.isscalar(coords[0]):
+        # A single position
+        rings.append([coords])
+    elif np.isscalar(coords[0][0]):
+        # A line string or ring of positions
+        rings.append(coords)
+    else:
+        for part in coords:
+            _collect_rings(part, rings)
+
+
+def _geometry_rings(geometry: Dict[str, Any], rings: List) -> None:
+    if geometry is None:
+        return
+    if geometry["type"] == "GeometryCollection":
+        for part in geometry["geometries"]:
+            _geometry_rings(part, rings)
+    else:
+        _collect_rings(geometry["coordinates"], rings)
+
+
+def _flatten_rings(rings: List) -> np.ndarray:
+    """Flatten sequences of positions into one (n, 2) array of x, y in one pass."""
+    if not rings:
+        return np.empty((0, 2))
+    n_positions = sum(map(len, rings))
+    n_dims = {len(ring[0]) for ring in rings}
+    if len(n_dims) > 1:
+        # Mixed 2D and 3D positions
+        return np.concatenate([np.asarray(ring, dtype=float)[:, :2] for ring in rings])
+    n_dim = n_dims.pop()
+    values = np.fromiter(
+        itertools.chain.from_iterable(itertools.chain.from_iterable(rings)),
+        dtype=float,
+        count=n_positions * n_dim,
+    )
+    return values.reshape(n_positions, n_dim)[:, :2]
+
+
 def geometry_to_bbox(geometry: Dict[str, Any]) -> List[float]:
     """Extract the bounding box from a geojson geometry
 
@@ -36,39 +155,46 @@ def geometry_to_bbox(geometry: Dict[str, Any]) -> List[float]:
         list: Bounding box of geojson geometry, formatted according to:
         https://tools.ietf.org/html/rfc7946#section-5
     """
-    coords = geometry["coordinates"]
+    rings: List = []
+    _geometry_rings(geometry, rings)
+    coords = _flatten_rings(rings)
+    return [*coords.min(axis=0).tolist(), *coords.max(axis=0).tolist()]
+
 
-    lats: List[float] = []
-    lons: List[float] = []
+def geometries_to_bounds(features) -> np.ndarray:
+    """Bounding boxes of all features or geometries in one array.
 
-    def extract_coords(coords: List[Union[List[float], List[List[Any]]]]) -> None:
-        for x in coords:
-            # This handles points
-            if isinstance(x, float):
-                assert isinstance(
-                    coords[0], float
-                ), f"Type mismatch: {coords[0]} is not a float"
-                assert isinstance(
-                    coords[1], float
-                ), f"Type mismatch: {coords[1]} is not a float"
-                lats.append(coords[0])
-                lons.append(coords[1])
-                return
-            if isinstance(x[0], list):
-                extract_coords(x)  # type:ignore
-            else:
-                lat, lon = x
-                lats.append(lat)  # type:ignore
-                lons.append(lon)  # type:ignore
+    The coordinates of all features are flattened into a single array and reduced
+    per feature in one pass.
 
-    extract_coords(coords)
+    Args:
+        features: A GeoJSON FeatureCollection, or a list of GeoJSON features or
+            geometries.
 
-    lons.sort()
-    lats.sort()
+    Returns:
+        np.ndarray: Array of shape (N, 4) with (min_x, min_y, max_x, max_y) per
+        feature. Features without coordinates have NaN bounds.
+    """
+    if isinstance(features, dict):
+        features = features["features"]
+    rings: List = []
+    counts = np.zeros(len(features), dtype=np.int64)
+    for i, feature in enumerate(features):
+        n_rings = len(rings)
+        geometry = feature["geometry"] if feature.get("type") == "Feature" else feature
+        _geometry_rings(geometry, rings)
+        counts[i] = sum(map(len, rings[n_rings:]))
 
-    bbox = [lats[0], lons[0], lats[-1], lons[-1]]
+    bounds = np.full((len(features), 4), np.nan)
+    has_coords = counts > 0
+    if not has_coords.any():
+        return bounds
 
-    return bbox
+    flat = _flatten_rings(rings)
+    offsets = np.concatenate([[0], np.cumsum(counts)[:-1]])[has_coords]
+    bounds[has_coords, :2] = np.minimum.reduceat(flat, offsets, axis=0)
+    bounds[has_coords, 2:] = np.maximum.reduceat(flat, offsets, axis=0)
+    return bounds
 
 
 def bbox_to_geometry(bbox: List[float]) -> Dict:
@@ -108,10 +234,58 @@ def geo_bbox(
         gpd.GeoDataFrame: GeoDataFrame with bounding box as geometry.
     """
 
-    bbox = [min_lon, min_lat, max_lon, max_lat]
-    bbox = bbox_to_geometry(bbox)
-    bbox = shapely.geometry.shape(bbox)
-    return gpd.GeoDataFrame(geometry=[bbox], crs=src_crs).to_crs(dst_crs)
+    return geo_bboxes([[min_lon, min_lat, max_lon, max_lat]], src_crs, dst_crs)
+
+
+def _densified_boxes(bounds: np.ndarray, densify: int) -> np.ndarray:
+    """Polygons of boxes with ``densify`` extra vertices on every edge."""
+    min_x, min_y, max_x, max_y = (bounds[:, [i]] for i in range(4))
+    # Same vertex order as shapely.box, counter-clockwise from the lower right
+    corners = [(max_x, min_y), (max_x, max_y), (min_x, max_y), (min_x, min_y)]
+    steps = np.linspace(0, 1, densify + 2)[:-1]
+    xs, ys = [], []
+    for (x0, y0), (x1, y1) in zip(corners, corners[1:] + corners[:1]):
+        xs.append(x0 + steps * (x1 - x0))
+        ys.append(y0 + steps * (y1 - y0))
+    xs.append(max_x)
+    ys.append(min_y)
+    coords = np.stack([np.concatenate(xs, axis=1), np.concatenate(ys, axis=1)], -1)
+    return shapely.polygons(coords)
+
+
+def geo_bboxes(
+    bounds,
+    src_crs="EPSG:4326",
+    dst_crs="EPSG:4326",
+    densify: int = 0,
+) -> gpd.GeoDataFrame:
+    """GeoDataFrame with many bounding boxes, built and reprojected at once.
+
+    A straight box edge is generally curved in another CRS, so the reprojected box
+    only has the right extent when its edges are densified before reprojection.
+
+    Args:
+        bounds (array_like): Boxes as rows of (min_lon, min_lat, max_lon, max_lat).
+        src_crs (str, optional): Valid EPSG string or number (int). Defaults to "EPSG:4326".
+        dst_crs (str, optional): Valid EPSG string or number (int). Defaults to "EPSG:4326".
+        densify (int, optional): Number of vertices added on every edge before
+            reprojection. Defaults to 0.
+
+    Returns:
+        gpd.GeoDataFrame: GeoDataFrame with a bounding box per row as geometry.
+    """
+    bounds = np.asarray(bounds, dtype=float).reshape(-1, 4)
+    if densify:
+        boxes = _densified_boxes(bounds, densify)
+    else:
+        boxes = shapely.box(*bounds.T)
+
+    if not CRS.from_user_input(src_crs).equals(dst_crs):
+        transformer = get_transformer(src_crs, dst_crs, always_xy=True)
+        boxes = shapely.transform(
+            boxes, lambda coords: np.column_stack(transformer.transform(*coords.T))
+        )
+    return gpd.GeoDataFrame(geometry=boxes, crs=dst_crs)
 
 
 def get_xy_range(gdf):
@@ -119,3 +293,221 @@ def get_xy_range(gdf):
     x_range = tuple(gdf.total_bounds[[0, 2]])
     y_range = tuple(gdf.total_bounds[[1, 3]])
     return x_range, y_range
+
+
+class Tile(NamedTuple):
+    """A spatial work unit, small enough to be sent to a worker process.
+
+    Attributes:
+        key (str): Identifier of the tile, e.g. "0/1-2" for row 1 and column 2 of
+            the first part of the area, or "0/031" for a quadtree tile and "0" for an
+            unsplit quadtree.
+        bounds (Tuple[float, float, float, float]): The tile itself as (min_lon,
+            min_lat, max_lon, max_lat). Tiles of an area do not overlap.
+        halo (Tuple[float, float, float, float]): The bounds extended by the halo
+            margin, for analyses that need some context around the tile. The halo
+            is clamped at the poles and wraps at the antimeridian, where its west
+            is larger than its east.
+        feature_indices (Optional[np.ndarray]): Indices of the features whose center
+            lies in the tile, or None when tiling without features. A feature that
+            crosses the antimeridian counts with the center of its larger part.
+    """
+
+    key: str
+    bounds: Tuple[float, float, float, float]
+    halo: Tuple[float, float, float, float]
+    feature_indices: Optional[np.ndarray] = None
+
+
+def split_antimeridian(bbox: List[float]) -> List[List[float]]:
+    """Split a bbox that crosses the antimeridian into an eastern and western part.
+
+    Following RFC 7946, a bbox crosses the antimeridian when its western longitude
+    is larger than its eastern longitude, e.g. [170, -20, -170, 0].
+    """
+    west, south, east, north = map(float, bbox)
+    if west <= east:
+        return [[west, south, east, north]]
+    return [[west, south, 180.0, north], [-180.0, south, east, north]]
+
+
+def _with_halo(bounds, halo: float) -> Tuple[float, float, float, float]:
+    """Bounds with a margin, wrapped at the antimeridian and clamped at the poles.
+
+    A halo that extends beyond 180 degrees wraps to the other side, so that it has a
+    west larger than its east like a bbox that crosses the antimeridian.
+    """
+    west, south, east, north = bounds
+    south, north = max(south - halo, -90.0), min(north + halo, 90.0)
+    west, east = west - halo, east + halo
+    if east - west >= 360.0:
+        return (-180.0, south, 180.0, north)
+    if west < -180.0:
+        west += 360.0
+    if east > 180.0:
+        east -= 360.0
+    return (west, south, east, north)
+
+
+def _feature_centers(features) -> np.ndarray:
+    """Centers of features given as (N, 2) points or (N, 4) bounds.
+
+    Bounds whose west is larger than their east cross the antimeridian.
+    """
+    features = np.asarray(features, dtype=float)
+    if features.ndim != 2 or features.shape[1] not in (2, 4):
+        msg = "features must be an array of (x, y) points or (N, 4) bounds"
+        raise ValueError(msg)
+    if features.shape[1] == 4:
+        west, south, east, north = features.T
+        # A feature that crosses the antimeridian is split like a bbox and placed
+        # at the center of its larger part
+        crosses = west > east
+        eastern_larger = 180.0 - west >= east + 180.0
+        east = np.where(crosses & eastern_larger, 180.0, east)
+        west = np.where(crosses & ~eastern_larger, -180.0, west)
+        return np.column_stack([(west + east) / 2, (south + north) / 2])
+    return features
+
+
+def _in_bounds(centers: np.ndarray, bounds, outer_bounds) -> np.ndarray:
+    """Half-open membership, closed at the outer edges, so each center has one tile."""
+    west, south, east, north = bounds
+    x, y = centers[:, 0], centers[:, 1]
+    in_x = (x >= west) & ((x < east) | ((east == outer_bounds[2]) & (x == east)))
+    in_y = (y >= south) & ((y < north) | ((north == outer_bounds[3]) & (y == north)))
+    return in_x & in_y
+
+
+def grid_tiles(
+    bbox: List[float],
+    tile_size: float,
+    halo: float = 0.0,
+    features=None,
+) -> List[Tile]:
+    """Split a bbox into a regular grid of tiles.
+
+    Args:
+        bbox (List[float]): Area as [west, south, east, north], e.g. from
+            ``build_bbox`` or ``geo_bbox(...).total_bounds``. A bbox whose west is
+            larger than its east crosses the antimeridian.
+        tile_size (float): Width and height of the tiles in the units of the bbox.
+            The last row and column are cut off at the bbox.
+        halo (float, optional): Margin around every tile. Defaults to 0.
+        features (array_like, optional): Feature points (N, 2) or bounds (N, 4). If
+            given, every tile gets the indices of the features whose center lies in
+            it and empty tiles are dropped. Defaults to None.
+
+    Returns:
+        List[Tile]: The tiles, row by row from the south-west.
+    """
+    if tile_size <= 0:
+        msg = "tile_size must be positive"
+        raise ValueError(msg)
+    centers = None if features is None else _feature_centers(features)
+
+    tiles = []
+    for part, (west, south, east, north) in enumerate(split_antimeridian(bbox)):
+        xs = np.append(np.arange(west, east, tile_size), east).tolist()
+        ys = np.append(np.arange(south, north, tile_size), north).tolist()
+        for row, (tile_south, tile_north) in enumerate(zip(ys[:-1], ys[1:])):
+            for col, (tile_west, tile_east) in enumerate(zip(xs[:-1], xs[1:])):
+                bounds = (tile_west, tile_south, tile_east, tile_north)
+                indices = None
+                if centers is not None:
+                    indices = np.flatnonzero(
+                        _in_bounds(centers, bounds, (west, south, east, north))
+                    )
+                    if not len(indices):
+                        continue
+                tiles.append(
+                    Tile(
+                        f"{part}/{row}-{col}", bounds, _with_halo(bounds, halo), indices
+                    )
+                )
+    return tiles
+
+
+def quadtree_tiles(
+    bbox: List[float],
+    features,
+    max_features: int,
+    halo: float = 0.0,
+    max_depth: int = 16,
+) -> List[Tile]:
+    """Split a bbox into quadtree tiles with at most ``max_features`` features each.
+
+    Tiles are split into four quadrants until they contain at most ``max_features``
+    feature centers or reach ``max_depth``, so dense coastal regions get small tiles
+    and open ocean gets large ones. Tiles without features are dropped.
+
+    Args:
+        bbox (List[float]): Area as [west, south, east, north]. A bbox whose west is
+            larger than its east crosses the antimeridian.
+        features (array_like): Feature points (N, 2) or bounds (N, 4).
+        max_features (int): Target maximum number of features per tile.
+        halo (float, optional): Margin around every tile. Defaults to 0.
+        max_depth (int, optional): Maximum number of splits. Defaults to 16.
+
+    Returns:
+        List[Tile]: The tiles in depth-first order.
+    """
+    if max_features < 1:
+        msg = "max_features must be at least 1"
+        raise ValueError(msg)
+    centers = _feature_centers(features)
+
+    tiles = []
+    for part, part_bounds in enumerate(split_antimeridian(bbox)):
+        indices = np.flatnonzero(_in_bounds(centers, part_bounds, part_bounds))
+        stack = [("", tuple(part_bounds), indices)]
+        while stack:
+            quadkey, bounds, indices = stack.pop()
+            if not len(indices):
+                continue
+            if len(indices) <= max_features or len(quadkey) >= max_depth:
+                tiles.append(
+                    Tile(
+                        f"{part}/{quadkey}".rstrip("/"),
+                        bounds,
+                        _with_halo(bounds, halo),
+                        indices,
+                    )
+                )
+                continue
+
+            west, south, east, north = bounds
+            mid_x, mid_y = (west + east) / 2, (south + north) / 2
+            quadrants = [
+                (west, mid_y, mid_x, north),
+                (mid_x, mid_y, east, north),
+                (west, south, mid_x, mid_y),
+                (mid_x, south, east, mid_y),
+            ]
+            # Push in reverse so that the tiles come out in quadkey order
+            for digit, quadrant in reversed(list(enumerate(quadrants))):
+                inside = _in_bounds(centers[indices], quadrant, bounds)
+                stack.append((f"{quadkey}{digit}", quadrant, indices[inside]))
+    return tiles
+
+
+def map_tiles(
+    func: Callable[[Tile], Any],
+    tiles: List[Tile],
+    n_workers: Optional[int] = None,
+) -> List[Any]:
+    """Apply a function to every tile, in parallel in a process pool.
+
+    Args:
+        func (Callable[[Tile], Any]): Module level function that processes a tile.
+        tiles (List[Tile]): Tiles from ``grid_tiles`` or ``quadtree_tiles``.
+        n_workers (Optional[int], optional): Number of worker processes. Defaults
+            to None, which processes the tiles in the current process.
+
+    Returns:
+        List[Any]: The results, in the order of the tiles.
+    """
+    if n_workers and n_workers > 1:
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            return list(executor.map(func, tiles))
+    return [func(tile) for tile in tiles]
@@ -0,0 +1,205 @@
+"""Headless grading of exported submissions against a hashed question bank.
+
+The functions in this module do not depend on Panel, so they can be used in scripts
+and batch jobs that grade the submissions of a whole cohort at once.
+"""
+
+import pathlib
+from collections.abc import Hashable, Mapping
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Optional
+
+import fsspec
+import numpy as np
+import pandas as pd
+
+from coastal_dynamics.bank import QuestionBank
+from coastal_dynamics.schema import validate_questions
+from coastal_dynamics.utils import (
+    compile_answer_index,
+    format_sig_figs,
+    hash_answer,
+)
+
+
+def read_submissions(
+    path: str, storage_options: Optional[dict[str, str]] = None
+) -> pd.DataFrame:
+    """Reads a table of submissions from a CSV or Parquet file.
+
+    Args:
+        path (str): Local file path or fsspec url of the submissions file.
+        storage_options (Optional[Dict[str, str]]): If given, contains options such as
+            account name and SAS token for Azure Blob storage.
+
+    Returns:
+        pd.DataFrame: The submissions.
+    """
+    suffix = pathlib.PurePosixPath(path).suffix
+    with fsspec.open(path, "rb", **(storage_options or {})) as f:
+        if suffix == ".parquet":
+            return pd.read_parquet(f)
+        if suffix == ".csv":
+            return pd.read_csv(f)
+    msg = f"Unsupported submissions format: {suffix}"
+    raise ValueError(msg)
+
+
+def _normalize_selection(answer: Any) -> frozenset[str]:
+    """Normalize a multiple selection answer to a set of option keys."""
+    if isinstance(answer, str):
+        return frozenset(key.strip() for key in answer.split(",") if key.strip())
+    if answer is None or (np.ndim(answer) == 0 and pd.isna(answer)):
+        return frozenset()
+    return frozenset(str(key) for key in answer)
+
+
+def _normalize_numeric(answers: np.ndarray, sig_figs: Optional[int]) -> np.ndarray:
+    """Normalize numeric answers to the strings that are hashed by the widgets."""
+    values = pd.to_numeric(pd.Series(answers), errors="coerce").to_numpy(float)
+    if sig_figs:
+        normalized = format_sig_figs(values, sig_figs).astype(object)
+    else:
+        normalized = np.frompyfunc(str, 1, 1)(values).astype(object)
+    normalized[np.isnan(values)] = None
+    return normalized
+
+
+def _grade_question(
+    question_data: dict[str, Any], answers: list[Hashable]
+) -> np.ndarray:
+    """Grade the unique answers to one question.
+
+    Every unique answer is normalized and hashed exactly once, in the same way as
+    the ``check_answer`` callbacks of the question widgets.
+
+    Args:
+        question_data (Dict[str, Any]): Dictionary containing data for the question.
+        answers (List[Hashable]): The unique answers that were submitted.
+
+    Returns:
+        np.ndarray: Whether each answer is correct, in the order of ``answers``.
+    """
+    question_type = question_data["type"]
+    correct_answer = question_data["answer"]
+
+    if question_type == "multiple_selection":
+        answer_index = compile_answer_index(
+            question_type, tuple(correct_answer), tuple(question_data["options"])
+        )
+        return np.array([answer_index.get(a, False) for a in answers], dtype=bool)
+
+    if question_type == "multiple_choice":
+        answer_index = compile_answer_index(
+            question_type, correct_answer, tuple(question_data["options"])
+        )
+        options_inverse = {v: k for k, v in question_data["options"].items()}
+        return np.array(
+            [answer_index.get(options_inverse.get(a, a), False) for a in answers],
+            dtype=bool,
+        )
+
+    if question_type == "numeric":
+        normalized = _normalize_numeric(
+            np.asarray(answers, dtype=object), question_data.get("sig_figs")
+        )
+        # Many answers round to the same string, which is hashed only once
+        valid = pd.notna(normalized)
+        strings, inverse = np.unique(normalized[valid].astype(str), return_inverse=True)
+        is_correct = np.zeros(len(answers), dtype=bool)
+        is_correct[valid] = np.array(
+            [hash_answer(s, question_type) == correct_answer for s in strings],
+            dtype=bool,
+        )[inverse]
+        return is_correct
+
+    if question_type == "text":
+        return np.array(
+            [
+                isinstance(answer, str)
+                and hash_answer(answer, question_type) == correct_answer
+                for answer in answers
+            ],
+            dtype=bool,
+        )
+
+    msg = f"Unsupported question type: {question_type}"
+    raise ValueError(msg)
+
+
+def grade_submissions(
+    questions: Mapping[str, dict[str, Any]] | QuestionBank,
+    submissions: pd.DataFrame,
+    question_col: str = "question",
+    answer_col: str = "answer",
+    n_workers: Optional[int] = None,
+) -> pd.DataFrame:
+    """Grade a table of submissions against a hashed question bank.
+
+    Rows are grouped by question, and every unique answer to a question is
+    normalized and hashed only once. With ``n_workers`` larger than one, the
+    questions are graded in parallel in a process pool.
+
+    Args:
+        questions (Mapping[str, Dict[str, Any]] | QuestionBank): Hashed question data
+            by question key, as returned by ``read_questions``.
+        submissions (pd.DataFrame): Table with a row per submitted answer.
+        question_col (str, optional): Column with the question keys. Defaults to
+            "question".
+        answer_col (str, optional): Column with the submitted answers. Multiple
+            selection answers are lists of option keys or comma separated strings.
+            Defaults to "answer".
+        n_workers (Optional[int], optional): Number of worker processes. Defaults
+            to None, which grades in the current process.
+
+    Returns:
+        pd.DataFrame: Copy of the submissions with the question "type" and a boolean
+        "correct" column.
+    """
+    if isinstance(questions, QuestionBank):
+        questions = questions.questions
+
+    question_keys = submissions[question_col].unique()
+    unknown = set(question_keys) - set(questions)
+    if unknown:
+        msg = f"Submissions refer to unknown questions: {sorted(unknown)}"
+        raise ValueError(msg)
+    validate_questions({key: questions[key] for key in question_keys})
+
+    graded = submissions.copy()
+    graded["type"] = graded[question_col].map(
+        {key: questions[key]["type"] for key in question_keys}
+    )
+
+    normalized = graded[answer_col].where(graded["type"] != "multiple_selection")
+    is_selection = graded["type"] == "multiple_selection"
+    normalized = normalized.astype(object)
+    normalized[is_selection] = graded.loc[is_selection, answer_col].map(
+        _normalize_selection
+    )
+
+    # The unique answers per question, and the index of every row's answer in them
+    positions = normalized.groupby(graded[question_col], sort=False).indices
+    codes, tasks = {}, {}
+    for key, rows in positions.items():
+        codes[key], answers = pd.factorize(normalized.iloc[rows], use_na_sentinel=False)
+        tasks[key] = list(answers)
+
+    if n_workers and n_workers > 1:
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            futures = {
+                key: executor.submit(_grade_question, questions[key], answers)
+                for key, answers in tasks.items()
+            }
+            results = {key: future.result() for key, future in futures.items()}
+    else:
+        results = {
+            key: _grade_question(questions[key], answers)
+            for key, answers in tasks.items()
+        }
+
+    correct = np.zeros(len(graded), dtype=bool)
+    for key, rows in positions.items():
+        correct[rows] = results[key][codes[key]]
+    graded["correct"] = correct
+    return graded
@@ -1,54 +1,628 @@
+import asyncio
+import bisect
+import contextlib
+import gzip
+import io
 import json
-from typing import Optional
+import pathlib
+import re
+import struct
+import threading
+import uuid
+import weakref
+from typing import Any, Optional
 
-import adlfs
 import fsspec
 
+from coastal_dynamics.cache import RemoteFileCache, default_cache, is_remote
+
+COMPRESSIONS = {".gz": "gzip", ".zst": "zstd"}
+MSGPACK_SUFFIXES = (".msgpack", ".mpk")
+INDEXED_SUFFIX = ".qbank"
+
+# An indexed question bank is a header, the JSON records of the questions grouped
+# by section, a JSON index with the byte range of every record and a fixed size
+# footer that points to the index.
+INDEXED_MAGIC = b"CDQBANK1"
+_INDEXED_FOOTER = struct.Struct("<QQ8s")
+# Records closer together than this are fetched with a single range request
+MAX_RECORD_GAP = 64 * 2**10
+SECTION_PATTERN = re.compile(r"Q(?P<section>[^-]+)-")
+
+
+def get_encoding(urlpath: str) -> tuple[str, Optional[str]]:
+    """Serialization format and compression of a question bank from its extension.
+
+    For example "bank.json" is plain JSON, "bank.json.gz" is gzip compressed JSON and
+    "bank.msgpack.zst" is zstd compressed MessagePack.
+
+    Args:
+        urlpath (str): Url or local file path.
+
+    Returns:
+        Tuple[str, Optional[str]]: Either "json", "msgpack" or "indexed", and the
+        fsspec name of the compression or None.
+    """
+    suffixes = pathlib.PurePosixPath(urlpath.split("?")[0]).suffixes
+    compression = COMPRESSIONS.get(suffixes[-1]) if suffixes else None
+    if compression:
+        suffixes = suffixes[:-1]
+        if compression not in fsspec.compression.compr:
+            msg = f"Compression {compression} requires the zstandard package."
+            raise ImportError(msg)
+    if suffixes and suffixes[-1] == INDEXED_SUFFIX:
+        if compression:
+            msg = "Indexed question banks are read with byte ranges and cannot be "
+            msg += "compressed."
+            raise ValueError(msg)
+        return "indexed", None
+    serialization = (
+        "msgpack" if suffixes and suffixes[-1] in MSGPACK_SUFFIXES else "json"
+    )
+    return serialization, compression
+
+
+def question_section(key: str) -> Optional[str]:
+    """The section of a question key, e.g. "3a" for "Q3a-2", or None."""
+    match = SECTION_PATTERN.match(key)
+    return match.group("section") if match else None
+
+
+def _dump_indexed(questions: dict[str, dict[str, Any]], f) -> None:
+    """Write questions as an indexed question bank to a binary file object."""
+    sections: dict[Optional[str], list[str]] = {}
+    for key in questions:
+        sections.setdefault(question_section(key), []).append(key)
+
+    # Records of a section are contiguous, so a section is fetched in one request
+    f.write(INDEXED_MAGIC)
+    offset = len(INDEXED_MAGIC)
+    records = {}
+    for keys in sections.values():
+        for key in keys:
+            record = json.dumps(questions[key]).encode()
+            f.write(record)
+            records[key] = [offset, len(record)]
+            offset += len(record)
+
+    index = {
+        "questions": records,
+        "sections": {
+            section: keys for section, keys in sections.items() if section is not None
+        },
+    }
+    index_bytes = json.dumps(index).encode()
+    f.write(index_bytes)
+    f.write(_INDEXED_FOOTER.pack(offset, len(index_bytes), INDEXED_MAGIC))
+
+
+def _parse_footer(footer: bytes, urlpath: str) -> tuple[int, int]:
+    index_offset, index_length, magic = _INDEXED_FOOTER.unpack(footer)
+    if magic != INDEXED_MAGIC:
+        msg = f"Not an indexed question bank: {urlpath}"
+        raise ValueError(msg)
+    return index_offset, index_length
+
+
+def _load_indexed(data: bytes, urlpath: str) -> dict[str, dict[str, Any]]:
+    index_offset, index_length = _parse_footer(data[-_INDEXED_FOOTER.size :], urlpath)
+    index = json.loads(data[index_offset : index_offset + index_length])
+    return {
+        key: json.loads(data[offset : offset + length])
+        for key, (offset, length) in index["questions"].items()
+    }
+
+
+def read_question_index(
+    fs: fsspec.AbstractFileSystem, path: str
+) -> dict[str, dict[str, Any]]:
+    """Read the index of an indexed question bank with two small range requests.
+
+    Args:
+        fs (fsspec.AbstractFileSystem): The filesystem of the question bank.
+        path (str): The path of the question bank on the filesystem.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: The byte range of every question under
+        "questions" and the question keys of every section under "sections".
+    """
+    size = fs.size(path)
+    footer = fs.cat_file(path, start=size - _INDEXED_FOOTER.size, end=size)
+    index_offset, index_length = _parse_footer(footer, path)
+    return json.loads(
+        fs.cat_file(path, start=index_offset, end=index_offset + index_length)
+    )
+
+
+def read_question_records(
+    fs: fsspec.AbstractFileSystem,
+    path: str,
+    index: dict[str, dict[str, Any]],
+    keys: list[str],
+) -> dict[str, dict[str, Any]]:
+    """Fetch and decode only the given questions of an indexed question bank.
+
+    Nearby records are merged into a single range request and the remaining
+    requests are issued concurrently on asynchronous filesystems.
+
+    Args:
+        fs (fsspec.AbstractFileSystem): The filesystem of the question bank.
+        path (str): The path of the question bank on the filesystem.
+        index (Dict[str, Dict[str, Any]]): The index from ``read_question_index``.
+        keys (List[str]): The keys of the questions to fetch.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Question data by key, in the order of ``keys``.
+    """
+    if not keys:
+        return {}
+    starts = [index["questions"][key][0] for key in keys]
+    ends = [
+        start + index["questions"][key][1]
+        for key, start in zip(keys, starts, strict=True)
+    ]
+    paths, block_starts, block_ends = fsspec.utils.merge_offset_ranges(
+        [path] * len(keys), starts, ends, max_gap=MAX_RECORD_GAP, sort=True
+    )
+    blocks = fs.cat_ranges(paths, block_starts, block_ends)
+
+    questions = {}
+    for key, start, end in zip(keys, starts, ends, strict=True):
+        i = bisect.bisect_right(block_starts, start) - 1
+        block_start = block_starts[i]
+        questions[key] = json.loads(blocks[i][start - block_start : end - block_start])
+    return questions
+
+
+def _decode(data: bytes, urlpath: str) -> Any:
+    serialization, compression = get_encoding(urlpath)
+    if serialization == "indexed":
+        return _load_indexed(data, urlpath)
+    if compression:
+        with fsspec.compression.compr[compression](io.BytesIO(data), mode="rb") as f:
+            data = f.read()
+    if serialization == "msgpack":
+        import msgpack
+
+        return msgpack.unpackb(data)
+    return json.loads(data)
+
 
 def read_questions(
-    blob_name: str, storage_options: Optional[dict[str, str]] = None
+    blob_name: str,
+    storage_options: Optional[dict[str, str]] = None,
+    cache: RemoteFileCache | bool = False,
 ) -> dict:
     """
-    Reads a JSON file from a local filesystem or Azure Blob storage.
+    Reads a JSON file from a local filesystem, a web server or Azure Blob storage.
+
+    Use ``aread_questions`` in asynchronous code such as Panel callbacks.
+
+    The encoding follows the file extension: ".json", gzip or zstd compressed
+    ".json.gz" and ".json.zst", the binary MessagePack variants ".msgpack",
+    ".msgpack.gz" and ".msgpack.zst", and indexed question banks ".qbank", which
+    can also be read question by question with ``IndexedQuestionBank``.
+
+    With ``cache``, remote files are kept in a persistent local cache that is
+    revalidated with the ETag or Last-Modified of the file, so repeated reads of an
+    unchanged file do not download it again and work offline.
 
     Args:
-        blob_name (str): The blob name or local file path.
+        blob_name (str): The blob name, url or local file path.
         storage_options (Optional[Dict[str, str]]): If given, contains options such as
             account name and SAS token for Azure Blob storage.
+        cache (RemoteFileCache | bool, optional): The cache for remote files. True
+            uses the default cache and False disables caching. Defaults to False.
 
     Returns:
         Dict: The content of the JSON file.
     """
+    if cache is True:
+        cache = default_cache()
+
+    if cache and is_remote(blob_name):
+        return _decode(cache.get(blob_name, storage_options), blob_name)
+
     # Use fsspec to handle both local and Azure Blob storage cases
-    with fsspec.open(blob_name, "r", **(storage_options or {})) as f:
-        questions = json.load(f)
-    return questions
+    with fsspec.open(blob_name, "rb", **(storage_options or {})) as f:
+        return _decode(f.read(), blob_name)
+
+
+_filesystems: dict[tuple[str, str], fsspec.AbstractFileSystem] = {}
+_filesystems_lock = threading.Lock()
+
+
+def get_filesystem(
+    urlpath: str, storage_options: Optional[dict[str, str]] = None
+) -> tuple[fsspec.AbstractFileSystem, str]:
+    """Return a shared filesystem for a storage target and the path within it.
+
+    One filesystem, and so one connection pool, is kept per protocol and set of
+    storage options, so that writing many files to the same target pays the
+    connection setup only once.
+
+    Args:
+        urlpath (str): Url or local file path, e.g. "az://container/file.json".
+        storage_options (Optional[Dict[str, str]]): If given, contains options such as
+            account name and SAS token for Azure Blob storage.
+
+    Returns:
+        Tuple[fsspec.AbstractFileSystem, str]: The filesystem and the path.
+    """
+    storage_options = storage_options or {}
+    protocol = fsspec.utils.get_protocol(urlpath)
+    key = (protocol, fsspec.utils.tokenize(storage_options))
+    with _filesystems_lock:
+        fs = _filesystems.get(key)
+        if fs is None:
+            fs = fsspec.filesystem(protocol, **storage_options)
+            _filesystems[key] = fs
+    return fs, fs._strip_protocol(urlpath)
+
+
+_async_filesystems: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, dict[tuple[str, str], fsspec.AbstractFileSystem]
+] = weakref.WeakKeyDictionary()
+
+
+async def get_async_filesystem(
+    urlpath: str, storage_options: Optional[dict[str, str]] = None
+) -> tuple[fsspec.AbstractFileSystem, str]:
+    """Return a shared asynchronous filesystem for a storage target and the path.
+
+    Asynchronous filesystems and their sessions are bound to an event loop, so one
+    filesystem is kept per running loop, protocol and set of storage options. For
+    protocols without an asynchronous implementation, such as local files, the
+    synchronous filesystem is returned.
+
+    Args:
+        urlpath (str): Url or local file path, e.g. "https://host/file.json".
+        storage_options (Optional[Dict[str, str]]): If given, contains options such as
+            account name and SAS token for Azure Blob storage.
+
+    Returns:
+        Tuple[fsspec.AbstractFileSystem, str]: The filesystem and the path.
+    """
+    storage_options = storage_options or {}
+    protocol = fsspec.utils.get_protocol(urlpath)
+    if not getattr(fsspec.get_filesystem_class(protocol), "async_impl", False):
+        return get_filesystem(urlpath, storage_options)
+
+    filesystems = _async_filesystems.setdefault(asyncio.get_running_loop(), {})
+    key = (protocol, fsspec.utils.tokenize(storage_options))
+    fs = filesystems.get(key)
+    if fs is None:
+        fs = fsspec.filesystem(
+            protocol, asynchronous=True, skip_instance_cache=True, **storage_options
+        )
+        if hasattr(fs, "set_session"):
+            await fs.set_session()
+        filesystems[key] = fs
+    return fs, fs._strip_protocol(urlpath)
+
+
+async def close_async_filesystems() -> None:
+    """Close the sessions of the asynchronous filesystems of the running loop."""
+    filesystems = _async_filesystems.pop(asyncio.get_running_loop(), {})
+    for fs in filesystems.values():
+        session = getattr(fs, "_session", None)
+        if session is not None:
+            await session.close()
+
+
+async def aread_questions(
+    blob_name: str,
+    storage_options: Optional[dict[str, str]] = None,
+    cache: RemoteFileCache | bool = False,
+) -> dict:
+    """
+    Reads a question bank without blocking the event loop, e.g. in Panel callbacks.
+
+    Remote files are fetched with fsspec's asynchronous filesystems, so many banks
+    can be loaded concurrently from a single event loop. Filesystems without an
+    asynchronous implementation, and reads through the persistent cache of
+    ``read_questions``, run in a worker thread instead.
+
+    Args:
+        blob_name (str): The blob name, url or local file path.
+        storage_options (Optional[Dict[str, str]]): If given, contains options such as
+            account name and SAS token for Azure Blob storage.
+        cache (RemoteFileCache | bool, optional): The cache for remote files, as in
+            ``read_questions``. Defaults to False.
+
+    Returns:
+        Dict: The content of the question bank.
+    """
+    fs, path = await get_async_filesystem(blob_name, storage_options)
+    if cache or not fs.async_impl:
+        return await asyncio.to_thread(
+            read_questions, blob_name, storage_options, cache
+        )
+    return _decode(await fs._cat_file(path), blob_name)
+
+
+def write_questions(
+    processed_questions: dict,
+    blob_name: str,
+    storage_options: Optional[dict[str, str]] = None,
+    indent: Optional[int] = 4,
+) -> None:
+    """
+    Writes a JSON file to a local filesystem or any fsspec storage, e.g. Azure Blob.
+
+    The JSON is streamed to a temporary file next to the target, which is moved
+    into place once it is complete. Readers therefore never see a partially written
+    question bank, and a failed write leaves an existing file untouched. The
+    encoding follows the file extension, as in ``read_questions``.
+
+    Args:
+        processed_questions (dict): The content to be written to the JSON file.
+        blob_name (str): The url or local file path, e.g. "az://container/file.json".
+        storage_options (Optional[Dict[str, str]]): If given, contains options such as
+            account name and SAS token for Azure Blob storage.
+        indent (Optional[int], optional): Indentation of the JSON. Defaults to 4.
+    """
+    serialization, compression = get_encoding(blob_name)
+    fs, path = get_filesystem(blob_name, storage_options)
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    try:
+        if serialization == "indexed":
+            with fs.open(tmp_path, "wb") as f:
+                _dump_indexed(processed_questions, f)
+        elif serialization == "msgpack":
+            import msgpack
+
+            with _open_compressed(fs, tmp_path, compression) as f:
+                f.write(msgpack.packb(processed_questions))
+        else:
+            with _open_compressed(fs, tmp_path, compression) as f:
+                text = io.TextIOWrapper(f, encoding="utf-8")
+                json.dump(processed_questions, text, indent=indent)
+                text.flush()
+                text.detach()
+        fs.mv(tmp_path, path)
+    except BaseException:
+        if fs.exists(tmp_path):
+            fs.rm(tmp_path)
+        raise
+
+
+@contextlib.contextmanager
+def _open_compressed(
+    fs: fsspec.AbstractFileSystem, path: str, compression: Optional[str]
+):
+    """Open a binary file for writing that compresses to the same bytes every time.
+
+    The gzip header holds a modification time and file name by default, which would
+    change the MD5 of an unchanged question bank and defeat the upload skip of
+    ``write_questions_to_cloud_storage.py``.
+    """
+    with fs.open(path, "wb") as raw:
+        if compression == "gzip":
+            with gzip.GzipFile(filename="", mode="wb", fileobj=raw, mtime=0) as f:
+                yield f
+        elif compression:
+            with fsspec.compression.compr[compression](raw, mode="wb") as f:
+                yield f
+        else:
+            yield raw
+
+
+# Operators of attribute predicates that can skip row groups from their statistics
+_STATISTICS_OPERATORS = {
+    "==": lambda lo, hi, value: lo <= value <= hi,
+    "=": lambda lo, hi, value: lo <= value <= hi,
+    "<": lambda lo, hi, value: lo < value,
+    "<=": lambda lo, hi, value: lo <= value,
+    ">": lambda lo, hi, value: hi > value,
+    ">=": lambda lo, hi, value: hi >= value,
+    "in": lambda lo, hi, values: any(lo <= value <= hi for value in values),
+}
+
+
+def _column_statistics(row_group, column: str) -> Optional[tuple[Any, Any]]:
+    """Minimum and maximum of a column in a row group, if they were written."""
+    for i in range(row_group.num_columns):
+        chunk = row_group.column(i)
+        if chunk.path_in_schema == column:
+            stats = chunk.statistics
+            if stats is not None and stats.has_min_max:
+                return stats.min, stats.max
+            return None
+    return None
+
+
+def _row_group_matches(
+    row_group,
+    bbox: Optional[tuple[float, float, float, float]],
+    covering: Optional[dict[str, list[str]]],
+    filters: list[tuple[str, str, Any]],
+) -> bool:
+    """Whether a row group may contain matching rows according to its statistics."""
+    if bbox is not None and covering is not None:
+        west, south, east, north = bbox
+        limits = {
+            "xmin": lambda lo, hi: lo <= east,
+            "ymin": lambda lo, hi: lo <= north,
+            "xmax": lambda lo, hi: hi >= west,
+            "ymax": lambda lo, hi: hi >= south,
+        }
+        for name, within_limit in limits.items():
+            stats = _column_statistics(row_group, ".".join(covering[name]))
+            if stats is not None and not within_limit(*stats):
+                return False
+
+    for column, op, value in filters:
+        check = _STATISTICS_OPERATORS.get(op)
+        stats = _column_statistics(row_group, column)
+        if check is not None and stats is not None:
+            try:
+                if not check(*stats, value):
+                    return False
+            except TypeError:
+                # Statistics and value cannot be compared, e.g. str and int
+                continue
+    return True
+
+
+def read_geoparquet(
+    urlpath: str,
+    bbox=None,
+    columns: Optional[list[str]] = None,
+    filters: Optional[list[tuple[str, str, Any]]] = None,
+    storage_options: Optional[dict[str, str]] = None,
+):
+    """
+    Read the rows of a GeoParquet file that intersect a bbox and match predicates.
+
+    Only the footer of the file and the row groups that can contain matching rows are
+    read, with byte-range requests for remote files. Row groups are skipped with the
+    statistics of the bbox covering column of GeoParquet 1.1, as written by
+    ``write_geoparquet``, and the statistics of the predicate columns. The remaining
+    rows are filtered exactly on their bounding boxes and the predicates.
+
+    Args:
+        urlpath (str): Url or local file path of the GeoParquet file.
+        bbox (optional): A bbox as [west, south, east, north] in the CRS of the file,
+            or a GeoDataFrame such as the result of ``geometries.geo_bbox``, which is
+            reprojected to the CRS of the file. Defaults to None.
+        columns (Optional[List[str]], optional): Columns to read besides the geometry.
+            Defaults to None, which reads all columns.
+        filters (Optional[List[Tuple[str, str, Any]]], optional): Predicates that must
+            all hold, in the pyarrow format, e.g. [("mag", ">=", 6.0)]. Defaults to
+            None.
+        storage_options (Optional[Dict[str, str]]): If given, contains options such as
+            account name and SAS token for Azure Blob storage.
+
+    Returns:
+        gpd.GeoDataFrame: The matching rows, without a CRS when the file has a null
+        CRS.
+    """
+    import geopandas as gpd
+    import numpy as np
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+    import shapely
+    from pyproj import CRS
+
+    filters = list(filters or [])
+    fs, path = get_filesystem(urlpath, storage_options)
+    with fs.open(path, "rb") as f:
+        parquet_file = pq.ParquetFile(f)
+        geo = json.loads(parquet_file.schema_arrow.metadata[b"geo"])
+        geometry_column = geo["primary_column"]
+        geometry_metadata = geo["columns"][geometry_column]
+        # A missing crs defaults to OGC:CRS84, while null means that it is unknown
+        crs = geometry_metadata.get("crs", "OGC:CRS84")
+        crs = None if crs is None else CRS.from_user_input(crs)
+        covering = geometry_metadata.get("covering", {}).get("bbox")
+
+        if isinstance(bbox, gpd.GeoDataFrame | gpd.GeoSeries):
+            if crs is None:
+                msg = f"Cannot reproject the bbox, {urlpath} has an unknown CRS"
+                raise ValueError(msg)
+            bbox = bbox.to_crs(crs).total_bounds
+        if bbox is not None:
+            bbox = tuple(float(value) for value in bbox)
+
+        metadata = parquet_file.metadata
+        row_groups = [
+            i
+            for i in range(metadata.num_row_groups)
+            if _row_group_matches(metadata.row_group(i), bbox, covering, filters)
+        ]
+
+        names = parquet_file.schema_arrow.names
+        selected = names if columns is None else [*columns, geometry_column]
+        read_columns = [*selected, *(column for column, _, _ in filters)]
+        if bbox is not None and covering:
+            read_columns.append(covering["xmin"][0])
+        table = parquet_file.read_row_groups(
+            row_groups, columns=list(dict.fromkeys(read_columns))
+        )
+
+    if filters:
+        table = table.filter(pq.filters_to_expression(filters))
+    geometry = None
+    if bbox is not None:
+        if covering:
+            # Filter on the covering column before decoding any geometry
+            bounds = np.column_stack(
+                [
+                    pc.struct_field(
+                        table.column(covering[name][0]), covering[name][1]
+                    ).to_numpy()
+                    for name in ("xmin", "ymin", "xmax", "ymax")
+                ]
+            )
+        else:
+            geometry = shapely.from_wkb(
+                table.column(geometry_column).to_numpy(zero_copy_only=False)
+            )
+            bounds = shapely.bounds(geometry)
+        west, south, east, north = bbox
+        mask = (
+            (bounds[:, 0] <= east)
+            & (bounds[:, 2] >= west)
+            & (bounds[:, 1] <= north)
+            & (bounds[:, 3] >= south)
+        )
+        table = table.filter(mask)
+        geometry = None if geometry is None else geometry[mask]
+    if geometry is None:
+        geometry = shapely.from_wkb(
+            table.column(geometry_column).to_numpy(zero_copy_only=False)
+        )
+
+    attributes = [
+        column for column in selected if column != geometry_column and column in names
+    ]
+    df = table.select(attributes).to_pandas()
+    return gpd.GeoDataFrame(df, geometry=geometry, crs=crs)
+
+
+def write_geoparquet(
+    gdf,
+    urlpath: str,
+    storage_options: Optional[dict[str, str]] = None,
+    row_group_size: int = 10_000,
+    hilbert: bool = True,
+) -> None:
+    """
+    Write a GeoDataFrame as GeoParquet that is efficient to query by region.
+
+    The rows are sorted along a Hilbert curve, so nearby features end up in the same
+    row groups, and a bbox covering column with statistics per row group is written.
+    ``read_geoparquet`` then only reads the row groups near a region of interest. The
+    file is written atomically like ``write_questions``.
+
+    Args:
+        gdf (gpd.GeoDataFrame): The data to write.
+        urlpath (str): Url or local file path of the GeoParquet file.
+        storage_options (Optional[Dict[str, str]]): If given, contains options such as
+            account name and SAS token for Azure Blob storage.
+        row_group_size (int, optional): Number of rows per row group. Defaults to
+            10_000.
+        hilbert (bool, optional): Sort the rows along a Hilbert curve. Defaults to
+            True.
+    """
+    import numpy as np
 
+    if hilbert and len(gdf):
+        gdf = gdf.iloc[np.argsort(gdf.hilbert_distance().to_numpy(), kind="stable")]
 
-# BUG: will not write to cloud storage, but local stoarge. Keep here as template
-# for later work. So this function (using fsspec) will replace write_questions
-# below to make it morge storage agnostic.
-
-# def write_questions(
-#     processed_questions: dict,
-#     blob_name: str,
-#     storage_options: Optional[dict[str, str]] = None,
-# ) -> None:
-#     """
-#     Writes a JSON file to a local filesystem or Azure Blob storage.
-
-#     Args:
-#         processed_questions (dict): The content to be written to the JSON file.
-#         blob_name (str): The blob name or local file path.
-#         storage_options (Optional[Dict[str, str]]): If given, contains options such as
-#             account name and SAS token for Azure Blob storage.
-#     """
-#     # Use fsspec to handle both local and Azure Blob storage cases
-#     with fsspec.open(blob_name, "w", **(storage_options or {})) as f:
-#         json.dump(processed_questions, f, indent=4)
-
-
-def write_questions(processed_questions, blob_name, storage_options):
-    fs = adlfs.AzureBlobFileSystem(**storage_options)
-    with fs.open(f"{blob_name}", mode="w") as f:
-        json.dump(processed_questions, f, indent=4)
+    fs, path = get_filesystem(urlpath, storage_options)
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    try:
+        with fs.open(tmp_path, "wb") as f:
+            gdf.to_parquet(
+                f,
+                write_covering_bbox=True,
+                schema_version="1.1.0",
+                row_group_size=row_group_size,
+            )
+        fs.mv(tmp_path, path)
+    except BaseException:
+        if fs.exists(tmp_path):
+            fs.rm(tmp_path)
+        raise
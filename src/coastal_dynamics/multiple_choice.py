@@ -1,3 +1,4 @@
+from collections.abc import Hashable, Mapping
 from typing import Literal
 
 import panel as pn
@@ -43,13 +44,16 @@ class MultipleChoiceQuestion(Question):
         )
         self.submit_button.on_click(self._check_answer)
 
+    def compile_answer_index(self) -> Mapping[Hashable, bool]:
+        """Precompute for each option key whether it is the correct answer."""
+        return cd.compile_answer_index(
+            "multiple_choice", self.correct_answer, tuple(self.options)
+        )
+
     def _check_answer(self, event: pn.widgets.Button) -> None:
         """Check the selected answer against the correct answer."""
         selected_option = self.options_inverse[self.options_widget.value]
-        if (
-            self.hash_answer(selected_option, question_type="multiple_choice")
-            == self.correct_answer
-        ):
+        if self.answer_index.get(selected_option, False):
             self.feedback_widget.value = self.feedback["correct"]
         else:
             self.feedback_widget.value = self.feedback["incorrect"]
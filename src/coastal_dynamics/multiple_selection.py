@@ -1,3 +1,4 @@
+from collections.abc import Hashable, Mapping
 from typing import Literal
 
 import panel as pn
@@ -43,15 +44,19 @@ class MultipleSelectionQuestion(Question):
         )
         self.submit_button.on_click(self._check_answers)
 
+    def compile_answer_index(self) -> Mapping[Hashable, bool]:
+        """Precompute which set of option keys is the correct selection."""
+        return cd.compile_answer_index(
+            "multiple_selection", tuple(self.correct_answers), tuple(self.options)
+        )
+
     def _check_answers(self, event: pn.widgets.Button) -> None:
         """Check the selected answers against the correct ones."""
-        selected_options = [
+        selected_options = frozenset(
             self.options_inverse[opt] for opt in self.options_widget.value
-        ]
+        )
 
-        if set(cd.hash_answer(selected_options, "multiple_selection")) == set(
-            self.correct_answers
-        ):
+        if self.answer_index.get(selected_options, False):
             self.feedback_widget.value = self.feedback["correct"]
         else:
             self.feedback_widget.value = self.feedback["incorrect"]
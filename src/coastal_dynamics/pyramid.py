@@ -0,0 +1,271 @@
+"""Points aggregated into a pyramid of bins per zoom level of a web map.
+
+Plotting every earthquake sends every point to the browser. A pyramid bins the
+points once, per zoom level of the web map tiles, into squares of a few screen
+pixels with the number of points and aggregates of their values. A plot then only
+gets the bins of the zoom level that matches the current view, so a tile never
+holds more than ``(256 / bin_size) ** 2`` bins however many points it covers:
+
+    >>> pyramid = PointPyramid.build(df, "earthquakes_pyramid", {"mag": "max"})
+    >>> pyramid = PointPyramid("earthquakes_pyramid")
+    >>> bins = pyramid.view(x_range, y_range, width=1000)
+    >>> pyramid.dynamic_map(color="mag_max") * hv.element.tiles.EsriImagery()
+
+The bins are in Web Mercator (EPSG:3857) coordinates ``x`` and ``y``, like the map
+tiles, and also have ``longitude`` and ``latitude`` of their centers.
+"""
+
+import functools
+import json
+import math
+import pathlib
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from coastal_dynamics.cache import atomic_path, write_atomic
+
+# Pixels along the side of a web map tile
+TILE_SIZE = 256
+
+# Half the width of the world in Web Mercator meters
+MERCATOR_HALF_WIDTH = 20037508.342789244
+
+# Latitude at which the Web Mercator world is square
+MAX_LATITUDE = 85.0511287798066
+
+# Aggregations that can be computed per zoom level from the level below
+AGGREGATIONS = ("max", "min", "sum")
+
+METADATA_NAME = "metadata.json"
+
+
+def lonlat_to_mercator(
+    lon: np.ndarray, lat: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Web Mercator coordinates of longitudes and latitudes in degrees."""
+    lat = np.clip(lat, -MAX_LATITUDE, MAX_LATITUDE)
+    x = np.radians(lon) / math.pi * MERCATOR_HALF_WIDTH
+    y = np.log(np.tan(np.pi / 4 + np.radians(lat) / 2)) / math.pi * MERCATOR_HALF_WIDTH
+    return x, y
+
+
+def mercator_to_lonlat(x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Longitudes and latitudes in degrees of Web Mercator coordinates."""
+    lon = np.degrees(x / MERCATOR_HALF_WIDTH * math.pi)
+    lat = np.degrees(
+        2 * np.arctan(np.exp(y / MERCATOR_HALF_WIDTH * math.pi)) - math.pi / 2
+    )
+    return lon, lat
+
+
+def zoom_for_extent(
+    x_range: Tuple[float, float], width: int, max_zoom: Optional[int] = None
+) -> int:
+    """Web map zoom level whose pixels are closest to those of a view.
+
+    Args:
+        x_range (Tuple[float, float]): Horizontal extent of the view in Web Mercator
+            meters.
+        width (int): Width of the view in screen pixels.
+        max_zoom (Optional[int], optional): Largest zoom level. Defaults to None.
+
+    Returns:
+        int: The zoom level, at least 0.
+    """
+    span = abs(x_range[1] - x_range[0])
+    if span == 0 or not math.isfinite(span):
+        return 0 if max_zoom is None else max_zoom
+    zoom = math.ceil(math.log2(2 * MERCATOR_HALF_WIDTH * width / (span * TILE_SIZE)))
+    zoom = max(zoom, 0)
+    return zoom if max_zoom is None else min(zoom, max_zoom)
+
+
+class PointPyramid:
+    """A pyramid of binned points, stored as a parquet file per zoom level.
+
+    Attributes:
+        path (pathlib.Path): Directory of the pyramid.
+        max_zoom (int): Largest zoom level of the pyramid.
+        bin_size (int): Side of a bin in screen pixels.
+        aggregations (Dict[str, str]): Aggregation per value column; the bins have
+            a column "{column}_{aggregation}" for each.
+        n_points (int): Number of points in the pyramid, without the polar points
+            that Web Mercator cannot show.
+    """
+
+    def __init__(self, path: str | pathlib.Path):
+        self.path = pathlib.Path(path)
+        with (self.path / METADATA_NAME).open() as f:
+            metadata = json.load(f)
+        self.max_zoom = metadata["max_zoom"]
+        self.bin_size = metadata["bin_size"]
+        self.aggregations = metadata["aggregations"]
+        self.n_points = metadata["n_points"]
+        self.level = functools.lru_cache(maxsize=None)(self._read_level)
+
+    @classmethod
+    def build(
+        cls,
+        df: pd.DataFrame,
+        path: str | pathlib.Path,
+        aggregations: Optional[Dict[str, str]] = None,
+        max_zoom: int = 8,
+        bin_size: int = 8,
+        x: str = "longitude",
+        y: str = "latitude",
+    ) -> "PointPyramid":
+        """Bin points into a pyramid and store it.
+
+        The points are binned once at ``max_zoom``; every coarser level merges the
+        bins of the level below, four into one.
+
+        Args:
+            df (pd.DataFrame): The points.
+            path (str | pathlib.Path): Directory of the pyramid.
+            aggregations (Optional[Dict[str, str]], optional): Aggregation per value
+                column, one of "max", "min" or "sum", e.g. {"mag": "max"}. Defaults
+                to None, which only counts the points.
+            max_zoom (int, optional): Largest zoom level. Defaults to 8.
+            bin_size (int, optional): Side of a bin in screen pixels, a power of two
+                up to 256. Defaults to 8.
+            x (str, optional): Column with the longitudes. Defaults to "longitude".
+            y (str, optional): Column with the latitudes. Defaults to "latitude".
+
+        Returns:
+            PointPyramid: The pyramid.
+        """
+        aggregations = dict(aggregations or {})
+        unknown = set(aggregations.values()) - set(AGGREGATIONS)
+        if unknown:
+            msg = f"Unknown aggregations: {sorted(unknown)}, expected {AGGREGATIONS}"
+            raise ValueError(msg)
+        if bin_size not in [2**i for i in range(9)]:
+            msg = "bin_size must be a power of two up to 256"
+            raise ValueError(msg)
+
+        lat = df[y].to_numpy(float)
+        inside = np.abs(lat) <= MAX_LATITUDE
+        mx, my = lonlat_to_mercator(df[x].to_numpy(float)[inside], lat[inside])
+        n_bins = TILE_SIZE * 2**max_zoom // bin_size
+        bins = pd.DataFrame(
+            {
+                "col": _bin_index(mx, n_bins),
+                # Rows count from the top, like the tiles
+                "row": _bin_index(-my, n_bins),
+                "count": np.ones(len(mx), dtype=np.int64),
+                **{
+                    f"{column}_{how}": df[column].to_numpy()[inside]
+                    for column, how in aggregations.items()
+                },
+            }
+        )
+
+        path = pathlib.Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        how = {"count": "sum", **{f"{c}_{a}": a for c, a in aggregations.items()}}
+        for zoom in range(max_zoom, -1, -1):
+            bins = bins.groupby(["row", "col"], sort=True).agg(how).reset_index()
+            _write_level(path, zoom, bins, n_bins)
+            bins["row"] //= 2
+            bins["col"] //= 2
+            n_bins //= 2
+
+        metadata = {
+            "max_zoom": max_zoom,
+            "bin_size": bin_size,
+            "aggregations": aggregations,
+            "n_points": int(inside.sum()),
+        }
+        write_atomic(path / METADATA_NAME, json.dumps(metadata, indent=4).encode())
+        return cls(path)
+
+    def _read_level(self, zoom: int) -> pd.DataFrame:
+        return pd.read_parquet(self.path / f"{zoom}.parquet")
+
+    def zoom_for(self, x_range: Tuple[float, float], width: int) -> int:
+        """Zoom level of the pyramid that matches a view of ``width`` pixels."""
+        return zoom_for_extent(x_range, width, self.max_zoom)
+
+    def view(
+        self,
+        x_range: Optional[Tuple[float, float]] = None,
+        y_range: Optional[Tuple[float, float]] = None,
+        width: int = 1000,
+    ) -> pd.DataFrame:
+        """Bins of the zoom level that matches a view, within its extent.
+
+        Args:
+            x_range (Optional[Tuple[float, float]], optional): Horizontal extent of
+                the view in Web Mercator meters. Defaults to None, the whole world.
+            y_range (Optional[Tuple[float, float]], optional): Vertical extent of
+                the view in Web Mercator meters. Defaults to None, the whole world.
+            width (int, optional): Width of the view in screen pixels. Defaults to
+                1000.
+
+        Returns:
+            pd.DataFrame: The bins with their coordinates, "count" and aggregates.
+        """
+        world = (-MERCATOR_HALF_WIDTH, MERCATOR_HALF_WIDTH)
+        x_range = world if x_range is None or None in x_range else x_range
+        y_range = world if y_range is None or None in y_range else y_range
+        bins = self.level(self.zoom_for(x_range, width))
+
+        x, y = bins["x"].to_numpy(), bins["y"].to_numpy()
+        mask = (
+            (x >= min(x_range))
+            & (x <= max(x_range))
+            & (y >= min(y_range))
+            & (y <= max(y_range))
+        )
+        return bins[mask]
+
+    def dynamic_map(self, width: int = 1000, height: int = 500, **opts: Any):
+        """HoloViews plot of the bins that follows the zoom level of the view.
+
+        Args:
+            width (int, optional): Width of the plot in pixels. Defaults to 1000.
+            height (int, optional): Height of the plot in pixels. Defaults to 500.
+            **opts: Options of the points, e.g. ``color="mag_max"``.
+
+        Returns:
+            hv.DynamicMap: Points at the bin centers, which can be overlaid on
+            ``hv.element.tiles``.
+        """
+        import holoviews as hv
+        import holoviews.plotting.bokeh  # noqa: F401
+
+        vdims = ["count", *self.value_columns, "longitude", "latitude"]
+
+        def callback(x_range, y_range):
+            bins = self.view(x_range, y_range, width)
+            return hv.Points(bins, kdims=["x", "y"], vdims=vdims).opts(
+                width=width, height=height, tools=["hover"], backend="bokeh", **opts
+            )
+
+        return hv.DynamicMap(callback, streams=[hv.streams.RangeXY()])
+
+    @property
+    def value_columns(self) -> list[str]:
+        """Names of the aggregated value columns of the bins."""
+        return [f"{column}_{how}" for column, how in self.aggregations.items()]
+
+
+def _bin_index(coordinate: np.ndarray, n_bins: int) -> np.ndarray:
+    """Index of the bin along an axis of the Web Mercator world."""
+    index = (coordinate + MERCATOR_HALF_WIDTH) / (2 * MERCATOR_HALF_WIDTH) * n_bins
+    return np.clip(index.astype(np.int64), 0, n_bins - 1)
+
+
+def _write_level(path: pathlib.Path, zoom: int, bins: pd.DataFrame, n_bins: int):
+    """Store the bins of a zoom level with the coordinates of their centers."""
+    bin_width = 2 * MERCATOR_HALF_WIDTH / n_bins
+    x = -MERCATOR_HALF_WIDTH + (bins["col"].to_numpy() + 0.5) * bin_width
+    y = MERCATOR_HALF_WIDTH - (bins["row"].to_numpy() + 0.5) * bin_width
+    lon, lat = mercator_to_lonlat(x, y)
+    level = bins.drop(columns=["row", "col"]).assign(
+        x=x, y=y, longitude=lon, latitude=lat
+    )
+    with atomic_path(path / f"{zoom}.parquet") as tmp_path:
+        level.to_parquet(tmp_path, index=False)
@@ -1,3 +1,5 @@
+from collections.abc import Hashable, Mapping
+from types import MappingProxyType
 from typing import Literal
 
 import panel as pn
@@ -15,6 +17,8 @@ class Question:
         question_text (str): The text of the question.
         feedback_widget (pn.widgets.StaticText): The widget to display feedback.
         submit_button (pn.widgets.Button): The button to submit the answer.
+        answer_index (Mapping[Hashable, bool]): Precomputed correctness of the possible
+            answers, empty for questions without a fixed set of options.
     """
 
     def __init__(
@@ -26,6 +30,7 @@ class Question:
         self.name = question_name
         self.question_text = question_text
         self.feedback = question_feedback
+        self.answer_index = self.compile_answer_index()
         self.create_widgets()
 
     def create_widgets(self) -> None:
@@ -36,6 +41,10 @@ class Question:
         self.submit_button = pn.widgets.Button(name="Submit")
         self.feedback_widget = pn.widgets.StaticText()
 
+    def compile_answer_index(self) -> Mapping[Hashable, bool]:
+        """Precompute the correctness of the possible answers, if they are known."""
+        return MappingProxyType({})
+
     def serve(self) -> pn.Column:
         """Serve the question as a Panel column."""
         msg = "This method should be implemented by subclasses"
@@ -0,0 +1,219 @@
+import functools
+import hashlib
+import re
+from collections.abc import Callable
+from numbers import Real
+from typing import Any
+
+REQUIRED_FIELDS = {
+    "multiple_choice": ["name", "question", "options", "answer", "feedback"],
+    "multiple_selection": ["name", "question", "options", "answer", "feedback"],
+    "numeric": ["name", "question", "answer", "feedback"],
+    "text": ["name", "question", "answer", "feedback"],
+}
+
+# Precision of a double in significant decimal digits
+MAX_SIG_FIGS = 17
+
+_SHA256_PATTERN = re.compile(r"[0-9a-f]{64}")
+
+Check = Callable[[dict[str, Any]], list[str]]
+
+
+class QuestionValidationError(ValueError):
+    """Raised when a question bank does not follow the question format.
+
+    Attributes:
+        errors (List[str]): All problems that were found in the question bank.
+    """
+
+    def __init__(self, errors: list[str]):
+        self.errors = errors
+        super().__init__(
+            f"{len(errors)} error(s) in question data:\n" + "\n".join(errors)
+        )
+
+
+def _is_hash(value: Any) -> bool:
+    return isinstance(value, str) and _SHA256_PATTERN.fullmatch(value) is not None
+
+
+def _check_text_fields(question_data: dict[str, Any]) -> list[str]:
+    return [
+        f"field {field} must be a string"
+        for field in ("name", "question")
+        if not isinstance(question_data[field], str)
+    ]
+
+
+def _check_feedback(question_data: dict[str, Any]) -> list[str]:
+    feedback = question_data["feedback"]
+    if not isinstance(feedback, dict):
+        return ["field feedback must be a dict"]
+    return [
+        f"feedback must have a string for {outcome}"
+        for outcome in ("correct", "incorrect")
+        if not isinstance(feedback.get(outcome), str)
+    ]
+
+
+def _check_options(question_data: dict[str, Any]) -> list[str]:
+    options = question_data["options"]
+    if not isinstance(options, dict) or not options:
+        return ["field options must be a non-empty dict"]
+    errors = [
+        f"option {key} must map a string key to a string"
+        for key, value in options.items()
+        if not isinstance(key, str) or not isinstance(value, str)
+    ]
+    if len(set(options.values())) != len(options):
+        errors.append("options must have unique texts")
+    return errors
+
+
+@functools.lru_cache(maxsize=4096)
+def _hash_option_key(key: str) -> str:
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def _option_answers(question_data: dict[str, Any]) -> set[str]:
+    """Option keys and their hashes, which are both valid answers."""
+    options = question_data["options"]
+    if not isinstance(options, dict):
+        return set()
+    keys = {str(key) for key in options}
+    return keys | {_hash_option_key(key) for key in keys}
+
+
+def _check_multiple_choice_answer(question_data: dict[str, Any]) -> list[str]:
+    answer = question_data["answer"]
+    if not isinstance(answer, str):
+        return ["field answer must be a string"]
+    if answer not in _option_answers(question_data):
+        return [f"answer {answer} is not one of the options"]
+    return []
+
+
+def _check_multiple_selection_answer(question_data: dict[str, Any]) -> list[str]:
+    answer = question_data["answer"]
+    if not isinstance(answer, list) or not answer:
+        return ["field answer must be a non-empty list"]
+    if len(set(map(str, answer))) != len(answer):
+        return ["answer must not contain duplicates"]
+    option_answers = _option_answers(question_data)
+    return [
+        f"answer {value} is not one of the options"
+        for value in answer
+        if value not in option_answers
+    ]
+
+
+def _is_number(value: Any) -> bool:
+    if isinstance(value, bool):
+        return False
+    if isinstance(value, Real):
+        return True
+    try:
+        float(value)
+    except (TypeError, ValueError):
+        return False
+    return True
+
+
+def _check_numeric_answer(question_data: dict[str, Any]) -> list[str]:
+    answer = question_data["answer"]
+    if not (_is_hash(answer) or _is_number(answer)):
+        return ["field answer must be a number or a hashed answer"]
+    return []
+
+
+def _check_sig_figs(question_data: dict[str, Any]) -> list[str]:
+    sig_figs = question_data.get("sig_figs")
+    if sig_figs is None:
+        return []
+    if isinstance(sig_figs, bool) or not isinstance(sig_figs, int):
+        return ["field sig_figs must be an integer"]
+    if not 0 <= sig_figs <= MAX_SIG_FIGS:
+        return [f"field sig_figs must be between 0 and {MAX_SIG_FIGS}"]
+    return []
+
+
+def _check_text_answer(question_data: dict[str, Any]) -> list[str]:
+    if not isinstance(question_data["answer"], str):
+        return ["field answer must be a string"]
+    return []
+
+
+def _compile_validators() -> dict[str, tuple[list[str], list[Check]]]:
+    """Bundle the required fields and checks for each question type."""
+    common = [_check_text_fields, _check_feedback]
+    checks = {
+        "multiple_choice": [*common, _check_options, _check_multiple_choice_answer],
+        "multiple_selection": [
+            *common,
+            _check_options,
+            _check_multiple_selection_answer,
+        ],
+        "numeric": [*common, _check_numeric_answer, _check_sig_figs],
+        "text": [*common, _check_text_answer],
+    }
+    return {
+        question_type: (REQUIRED_FIELDS[question_type], checks[question_type])
+        for question_type in REQUIRED_FIELDS
+    }
+
+
+_VALIDATORS = _compile_validators()
+
+
+def find_errors(questions: dict[str, dict[str, Any]]) -> list[str]:
+    """Find all problems in a question bank in a single pass.
+
+    Args:
+        questions (Dict[str, Dict[str, Any]]): Question data by question key.
+
+    Returns:
+        List[str]: A message per problem, prefixed with the question key.
+    """
+    if not isinstance(questions, dict):
+        return ["question data must be a dict of questions"]
+
+    errors = []
+    for key, question_data in questions.items():
+        if not isinstance(question_data, dict):
+            errors.append(f"{key}: question must be a dict")
+            continue
+
+        question_type = question_data.get("type")
+        validator = _VALIDATORS.get(question_type)
+        if validator is None:
+            errors.append(f"{key}: Unknown question type: {question_type}")
+            continue
+
+        required_fields, checks = validator
+        missing = [field for field in required_fields if field not in question_data]
+        if missing:
+            errors.extend(f"{key}: Missing required field: {f}" for f in missing)
+            continue
+
+        for check in checks:
+            errors.extend(f"{key}: {error}" for error in check(question_data))
+    return errors
+
+
+def validate_questions(questions: dict[str, dict[str, Any]]) -> None:
+    """Check that every question in a bank follows the question format.
+
+    The types of the fields, the required fields per question type, the consistency
+    of options and answers and the number of significant figures are checked for
+    all questions, and all problems are reported at once.
+
+    Args:
+        questions (Dict[str, Dict[str, Any]]): Question data by question key.
+
+    Raises:
+        QuestionValidationError: If any question does not follow the format.
+    """
+    errors = find_errors(questions)
+    if errors:
+        raise QuestionValidationError(errors)
@@ -0,0 +1,294 @@
+"""Shoreline change rates for all transects at once.
+
+The shoreline positions are a wide table with a datetime index and a column per
+transect, as in ``data/03_shorelines_ocean_beach.parquet``. Missing positions are
+NaN. Rates are in the units of the positions per year:
+
+    >>> positions = pd.read_parquet("data/03_shorelines_ocean_beach.parquet")
+    >>> rates = change_rates(positions, method="theil_sen")
+    >>> outliers = flag_outliers(positions, rates)
+
+The positions are fitted as a (n_dates, n_transects) array, so that the cost per
+transect is a few array operations instead of a pandas fit per transect. Large
+tables can also be split into chunks of transects that are fitted in a process
+pool.
+"""
+
+import functools
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+METHODS = ("linear", "weighted", "theil_sen")
+
+# Scale factor from the median absolute deviation to the standard deviation
+MAD_SCALE = 1.4826
+
+# Maximum number of pairwise slopes that are held in memory at once by Theil-Sen
+MAX_PAIR_ELEMENTS = 2**23
+
+DAYS_PER_YEAR = 365.25
+
+
+def decimal_years(dates: pd.DatetimeIndex) -> np.ndarray:
+    """Time in years since the first date."""
+    dates = pd.DatetimeIndex(dates)
+    return ((dates - dates[0]) / pd.Timedelta(days=DAYS_PER_YEAR)).to_numpy(float)
+
+
+def change_rates(
+    positions: pd.DataFrame,
+    method: str = "linear",
+    weights: Optional[pd.DataFrame | pd.Series] = None,
+    confidence: Optional[float] = 0.95,
+    outlier_threshold: float = 3.0,
+    n_workers: Optional[int] = None,
+    chunk_size: int = 1000,
+) -> pd.DataFrame:
+    """Shoreline change rate per transect.
+
+    Args:
+        positions (pd.DataFrame): Shoreline positions with a datetime index and a
+            column per transect.
+        method (str, optional): "linear" for ordinary least squares, "weighted"
+            for weighted least squares or "theil_sen" for the median of the
+            pairwise slopes, which is robust to outliers. Defaults to "linear".
+        weights (Optional[pd.DataFrame | pd.Series], optional): Weights of the
+            positions for "weighted", e.g. the inverse variance of the positions.
+            Either a table like ``positions`` or a series with a weight per date.
+            Defaults to None.
+        confidence (Optional[float], optional): Confidence level of the interval
+            of the rate. The least squares intervals use Student's t distribution
+            and require SciPy. Defaults to 0.95, None skips the interval.
+        outlier_threshold (float, optional): Positions whose residual from the fit
+            deviates more than this many robust standard deviations from the
+            median residual are counted as outliers. Defaults to 3.0.
+        n_workers (Optional[int], optional): Number of worker processes that fit
+            chunks of transects. Defaults to None, which fits all transects in the
+            current process.
+        chunk_size (int, optional): Number of transects per chunk in the process
+            pool. Defaults to 1000.
+
+    Returns:
+        pd.DataFrame: Per transect the number of positions "n", the "rate" per
+        year, the "intercept" at the first date, "rate_lower" and "rate_upper" of
+        the confidence interval and the number of outliers "n_outliers".
+    """
+    if method not in METHODS:
+        msg = f"Unknown method: {method}, expected one of {METHODS}"
+        raise ValueError(msg)
+    if method == "weighted" and weights is None:
+        msg = "The weighted method requires weights"
+        raise ValueError(msg)
+
+    t = decimal_years(positions.index)
+    y = positions.to_numpy(float)
+    w = None if weights is None else _align_weights(weights, positions)
+
+    fit = functools.partial(
+        _fit,
+        t,
+        method=method,
+        confidence=confidence,
+        outlier_threshold=outlier_threshold,
+    )
+    if n_workers and n_workers > 1:
+        starts = range(0, y.shape[1], chunk_size)
+        chunks = [y[:, i : i + chunk_size] for i in starts]
+        weight_chunks = [
+            None if w is None else w[:, i : i + chunk_size] for i in starts
+        ]
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            results = list(executor.map(fit, chunks, weight_chunks))
+        result = {k: np.concatenate([r[k] for r in results]) for k in results[0]}
+    else:
+        result = fit(y, w)
+    return pd.DataFrame(result, index=positions.columns)
+
+
+def flag_outliers(
+    positions: pd.DataFrame, rates: pd.DataFrame, threshold: float = 3.0
+) -> pd.DataFrame:
+    """Positions that are far from the fitted change rate of their transect.
+
+    Args:
+        positions (pd.DataFrame): Shoreline positions with a datetime index and a
+            column per transect.
+        rates (pd.DataFrame): The result of ``change_rates`` for the positions.
+        threshold (float, optional): Number of robust standard deviations, from the
+            median absolute deviation of the residuals, beyond which a position is
+            an outlier. Defaults to 3.0.
+
+    Returns:
+        pd.DataFrame: True for the outliers, in the shape of ``positions``.
+    """
+    t = decimal_years(positions.index)
+    rates = rates.reindex(positions.columns)
+    residuals = positions.to_numpy(float) - (
+        rates["intercept"].to_numpy() + np.outer(t, rates["rate"].to_numpy())
+    )
+    return pd.DataFrame(
+        _outliers(residuals, threshold),
+        index=positions.index,
+        columns=positions.columns,
+    )
+
+
+def _align_weights(
+    weights: pd.DataFrame | pd.Series, positions: pd.DataFrame
+) -> np.ndarray:
+    if isinstance(weights, pd.Series):
+        w = weights.reindex(positions.index).to_numpy(float)[:, None]
+        return np.broadcast_to(w, positions.shape)
+    return weights.reindex(index=positions.index, columns=positions.columns).to_numpy(
+        float
+    )
+
+
+def _fit(
+    t: np.ndarray,
+    y: np.ndarray,
+    w: Optional[np.ndarray] = None,
+    method: str = "linear",
+    confidence: Optional[float] = 0.95,
+    outlier_threshold: float = 3.0,
+) -> Dict[str, np.ndarray]:
+    """Fit the positions y (n_dates, n_transects) against the times t (n_dates,)."""
+    valid = np.isfinite(y)
+    if method == "weighted":
+        valid &= np.isfinite(w) & (w > 0)
+    n = valid.sum(axis=0)
+
+    if method == "theil_sen":
+        rate, lower, upper = _theil_sen_slopes(t, y, valid, confidence)
+        with np.errstate(invalid="ignore"):
+            intercept = _nanmedian(np.where(valid, y - np.outer(t, rate), np.nan))
+    else:
+        if method == "linear":
+            w = np.ones_like(y)
+        rate, intercept, lower, upper = _least_squares(t, y, w, valid, confidence)
+
+    residuals = np.where(valid, y - (intercept + np.outer(t, rate)), np.nan)
+    return {
+        "n": n,
+        "rate": rate,
+        "intercept": intercept,
+        "rate_lower": lower,
+        "rate_upper": upper,
+        "n_outliers": _outliers(residuals, outlier_threshold).sum(axis=0),
+    }
+
+
+def _least_squares(t, y, w, valid, confidence):
+    """Weighted least squares fits of all columns with masked sums."""
+    w = np.where(valid, w, 0.0)
+    y = np.where(valid, y, 0.0)
+    t = t[:, None]
+    n = valid.sum(axis=0)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        sum_w = w.sum(axis=0)
+        t_mean = (w * t).sum(axis=0) / sum_w
+        y_mean = (w * y).sum(axis=0) / sum_w
+        dt = t - t_mean
+        s_tt = (w * dt**2).sum(axis=0)
+        rate = (w * dt * (y - y_mean)).sum(axis=0) / s_tt
+        intercept = y_mean - rate * t_mean
+
+        lower = upper = np.full(len(rate), np.nan)
+        if confidence is not None:
+            from scipy import stats
+
+            dof = n - 2
+            residuals = y - (intercept + rate * t)
+            variance = (w * residuals**2).sum(axis=0) / dof
+            stderr = np.sqrt(variance / s_tt)
+            margin = stats.t.ppf((1 + confidence) / 2, np.where(dof > 0, dof, np.nan))
+            lower, upper = rate - margin * stderr, rate + margin * stderr
+    return rate, intercept, lower, upper
+
+
+def _theil_sen_slopes(t, y, valid, confidence):
+    """Median of the pairwise slopes and Sen's confidence interval per column.
+
+    The slopes between all pairs of dates are computed for a chunk of columns at
+    once and sorted, which puts the slopes of missing positions (NaN) last. The
+    order statistics of each column are then taken at its own number of slopes.
+    """
+    n_dates, n_columns = y.shape
+    rate, lower, upper = (np.full(n_columns, np.nan) for _ in range(3))
+    z = None if confidence is None else NormalDist().inv_cdf((1 + confidence) / 2)
+    n_pairs = n_dates * (n_dates - 1) // 2
+    if n_pairs == 0:
+        return rate, lower, upper
+
+    y = np.where(valid, y, np.nan).T
+    repeated_dates = len(np.unique(t)) < n_dates
+    step = max(MAX_PAIR_ELEMENTS // n_pairs, 1)
+    slopes = np.empty((min(step, n_columns), n_pairs))
+    for start in range(0, n_columns, step):
+        block = y[start : start + step]
+        out = slopes[: len(block)]
+        offset = 0
+        with np.errstate(invalid="ignore", divide="ignore"):
+            # Slopes from each date to all later dates, as contiguous slices
+            for i in range(n_dates - 1):
+                end = offset + n_dates - 1 - i
+                np.subtract(
+                    block[:, i + 1 :], block[:, i : i + 1], out=out[:, offset:end]
+                )
+                out[:, offset:end] /= t[i + 1 :] - t[i]
+                offset = end
+        if repeated_dates:
+            # Pairs of positions at the same time have no slope
+            out[~np.isfinite(out)] = np.nan
+            count = n_pairs - np.isnan(out).sum(axis=1)
+        else:
+            n = valid[:, start : start + len(block)].sum(axis=0)
+            count = n * (n - 1) // 2
+        out.sort(axis=1)
+
+        has_slopes = count > 0
+        columns = np.arange(start, start + len(block))[has_slopes]
+        out, count = out[has_slopes], count[has_slopes]
+        ranks = np.stack([(count - 1) // 2, count // 2], axis=1)
+        rate[columns] = np.take_along_axis(out, ranks, axis=1).mean(axis=1)
+        if z is not None:
+            # Ranks of Sen (1968), as in scipy.stats.theilslopes without ties
+            n = valid[:, columns].sum(axis=0)
+            sigma = np.sqrt(n * (n - 1) * (2 * n + 5) / 18)
+            ranks = np.stack(
+                [
+                    np.maximum(np.round((count - z * sigma) / 2) - 1, 0),
+                    np.minimum(np.round((count + z * sigma) / 2), count - 1),
+                ],
+                axis=1,
+            ).astype(int)
+            lower[columns], upper[columns] = np.take_along_axis(out, ranks, axis=1).T
+    return rate, lower, upper
+
+
+def _outliers(residuals: np.ndarray, threshold: float) -> np.ndarray:
+    """Residuals beyond threshold robust standard deviations from their median."""
+    center = _nanmedian(residuals)
+    deviation = np.abs(residuals - center)
+    scale = MAD_SCALE * _nanmedian(deviation)
+    with np.errstate(invalid="ignore"):
+        return deviation > threshold * scale
+
+
+def _nanmedian(a: np.ndarray) -> np.ndarray:
+    """Median per column that ignores NaN.
+
+    Sorting puts NaN last, so the median is at the middle of the values of each
+    column. This is much faster than ``np.nanmedian``, which handles the columns
+    one by one when they contain NaN.
+    """
+    a = np.sort(a, axis=0)
+    count = a.shape[0] - np.isnan(a).sum(axis=0)
+    ranks = np.stack([np.maximum(count - 1, 0) // 2, count // 2])
+    median = np.take_along_axis(a, np.minimum(ranks, a.shape[0] - 1), axis=0)
+    return np.where(count > 0, median.mean(axis=0), np.nan)
@@ -0,0 +1,276 @@
+"""Simplified versions of a vector layer per zoom level of a web map.
+
+The isobaths and coastal systems have far more vertices than a map can show when
+it is zoomed out. A simplified layer stores the geometries simplified to a fraction
+of the pixel size of every zoom level, once, and a map view gets the level that
+matches its extent and width:
+
+    >>> layer = SimplifiedLayer.from_file(data.fetch("isobaths200.gpkg"))
+    >>> gdf = layer.get(x_range, y_range, width=1000)
+    >>> gdf.hvplot(geo=True)
+    >>> layer.dynamic_map(line_color="white") * hv.element.tiles.EsriImagery()
+
+Like the map tiles, the extent is in Web Mercator (EPSG:3857) meters, and the
+geometries are simplified in Web Mercator so that a tolerance is a fixed number
+of screen pixels at every latitude. They are returned in the CRS of the source.
+"""
+
+import functools
+import hashlib
+import json
+import pathlib
+from typing import Any, Dict, Optional, Tuple
+
+import fsspec
+import geopandas as gpd
+import numpy as np
+import shapely
+
+from coastal_dynamics.cache import atomic_path, default_cache, is_remote, write_atomic
+from coastal_dynamics.pyramid import MERCATOR_HALF_WIDTH, TILE_SIZE, zoom_for_extent
+
+METADATA_NAME = "metadata.json"
+
+MERCATOR = "EPSG:3857"
+
+# Identifier of the simplification, so that layers are rebuilt when it changes
+METHOD = "coverage"
+
+POLYGONAL_TYPES = [shapely.GeometryType.POLYGON, shapely.GeometryType.MULTIPOLYGON]
+
+
+def pixel_size(zoom: int) -> float:
+    """Size of a screen pixel in Web Mercator meters at a zoom level."""
+    return 2 * MERCATOR_HALF_WIDTH / (TILE_SIZE * 2**zoom)
+
+
+class SimplifiedLayer:
+    """Geometries simplified per zoom level, stored as a GeoParquet file per level.
+
+    Attributes:
+        path (pathlib.Path): Directory of the simplified layer.
+        max_zoom (int): Zoom level from which the original geometries are used.
+        tolerance (float): Simplification tolerance in screen pixels.
+        source_key (str): Identifier of the version of the source file.
+        parameters (Dict[str, Any]): Arguments of ``build`` that the layer was
+            built with, and the simplification method.
+    """
+
+    def __init__(self, path: str | pathlib.Path):
+        self.path = pathlib.Path(path)
+        with (self.path / METADATA_NAME).open() as f:
+            metadata = json.load(f)
+        self.max_zoom = metadata["max_zoom"]
+        self.tolerance = metadata["tolerance"]
+        self.source_key = metadata.get("source_key", "")
+        self.parameters = metadata.get("parameters", {})
+        self.level = functools.lru_cache(maxsize=None)(self._read_level)
+
+    @classmethod
+    def build(
+        cls,
+        gdf: gpd.GeoDataFrame,
+        path: str | pathlib.Path,
+        max_zoom: int = 10,
+        tolerance: float = 0.5,
+        source_key: str = "",
+    ) -> "SimplifiedLayer":
+        """Simplify a layer for every zoom level up to ``max_zoom`` and store it.
+
+        Polygons are simplified together as a coverage, so that the edges they
+        share stay shared, without gaps or overlaps, and polygons stay valid and do
+        not collapse. Other geometries, such as the isobaths, are simplified one by
+        one with their topology preserved. The simplification stops at the zoom
+        level where nothing is removed anymore.
+
+        Args:
+            gdf (gpd.GeoDataFrame): The layer.
+            path (str | pathlib.Path): Directory of the simplified layer.
+            max_zoom (int, optional): Largest zoom level, from which the original
+                geometries are used. Defaults to 10.
+            tolerance (float, optional): Simplification tolerance in screen pixels.
+                Defaults to 0.5, which is not visible on the map.
+            source_key (str, optional): Identifier of the version of the source
+                file. Defaults to "".
+
+        Returns:
+            SimplifiedLayer: The simplified layer.
+        """
+        if gdf.crs is None:
+            msg = "The layer has no CRS"
+            raise ValueError(msg)
+        path = pathlib.Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+
+        geometries = np.asarray(gdf.to_crs(MERCATOR).geometry.array)
+        n_vertices = shapely.get_num_coordinates(geometries).sum()
+        levels = []
+        for zoom in range(max_zoom):
+            simplified = _simplify(geometries, tolerance * pixel_size(zoom))
+            if shapely.get_num_coordinates(simplified).sum() == n_vertices:
+                break
+            level = gdf.set_geometry(gpd.GeoSeries(simplified, crs=MERCATOR).values)
+            with atomic_path(path / f"{zoom}.parquet") as tmp_path:
+                level.to_crs(gdf.crs).to_parquet(tmp_path)
+            levels.append(zoom)
+        # From here on the simplification removes no vertices
+        with atomic_path(path / f"{len(levels)}.parquet") as tmp_path:
+            gdf.to_parquet(tmp_path)
+
+        metadata = {
+            "max_zoom": len(levels),
+            "tolerance": tolerance,
+            "source_key": source_key,
+            "parameters": _build_parameters(max_zoom, tolerance),
+        }
+        write_atomic(path / METADATA_NAME, json.dumps(metadata, indent=4).encode())
+        return cls(path)
+
+    @classmethod
+    def from_file(
+        cls,
+        urlpath: str,
+        path: Optional[str | pathlib.Path] = None,
+        storage_options: Optional[dict[str, str]] = None,
+        max_zoom: int = 10,
+        tolerance: float = 0.5,
+    ) -> "SimplifiedLayer":
+        """Load the simplified layer of a vector file, building it when needed.
+
+        The simplified layer is rebuilt when the file has changed or when it was
+        built with other arguments.
+
+        Args:
+            urlpath (str): Url or local file path of a GeoParquet file or any file
+                that geopandas can read, such as a GeoPackage.
+            path (Optional[str | pathlib.Path], optional): Directory of the
+                simplified layer. Defaults to None, which is next to a local file
+                or in the cache directory for a remote one.
+            storage_options (Optional[Dict[str, str]]): If given, contains options
+                such as account name and SAS token for Azure Blob storage.
+            max_zoom (int, optional): Largest zoom level, see ``build``. Defaults
+                to 10.
+            tolerance (float, optional): Simplification tolerance in screen pixels,
+                see ``build``. Defaults to 0.5.
+
+        Returns:
+            SimplifiedLayer: The simplified layer.
+        """
+        fs, fs_path = fsspec.core.url_to_fs(urlpath, **(storage_options or {}))
+        source_key = fs.ukey(fs_path)
+        path = pathlib.Path(path or _default_layer_path(urlpath))
+
+        try:
+            layer = cls(path)
+            if layer.source_key == source_key and layer.parameters == (
+                _build_parameters(max_zoom, tolerance)
+            ):
+                return layer
+        except (OSError, KeyError, ValueError):
+            pass
+
+        with fs.open(fs_path, "rb") as f:
+            if fs_path.endswith(".parquet"):
+                gdf = gpd.read_parquet(f)
+            else:
+                gdf = gpd.read_file(f)
+        return cls.build(gdf, path, max_zoom, tolerance, source_key)
+
+    def _read_level(self, zoom: int) -> gpd.GeoDataFrame:
+        return gpd.read_parquet(self.path / f"{zoom}.parquet")
+
+    def zoom_for(self, x_range: Tuple[float, float], width: int) -> int:
+        """Level of the layer that matches a view of ``width`` pixels."""
+        return zoom_for_extent(x_range, width, self.max_zoom)
+
+    def get(
+        self,
+        x_range: Optional[Tuple[float, float]] = None,
+        y_range: Optional[Tuple[float, float]] = None,
+        width: int = 1000,
+    ) -> gpd.GeoDataFrame:
+        """Geometries of the level that matches a view, that intersect its extent.
+
+        Args:
+            x_range (Optional[Tuple[float, float]], optional): Horizontal extent of
+                the view in Web Mercator meters. Defaults to None, the whole world.
+            y_range (Optional[Tuple[float, float]], optional): Vertical extent of
+                the view in Web Mercator meters. Defaults to None, the whole world.
+            width (int, optional): Width of the view in screen pixels. Defaults to
+                1000.
+
+        Returns:
+            gpd.GeoDataFrame: The simplified geometries, in the CRS of the source.
+        """
+        world = (-MERCATOR_HALF_WIDTH, MERCATOR_HALF_WIDTH)
+        x_range = world if x_range is None or None in x_range else x_range
+        y_range = world if y_range is None or None in y_range else y_range
+        gdf = self.level(self.zoom_for(x_range, width))
+        if x_range == world and y_range == world:
+            return gdf
+
+        view = gpd.GeoSeries(
+            [shapely.box(min(x_range), min(y_range), max(x_range), max(y_range))],
+            crs=MERCATOR,
+        ).to_crs(gdf.crs)
+        positions = gdf.sindex.query(view.iloc[0], predicate="intersects")
+        return gdf.iloc[np.sort(positions)]
+
+    def dynamic_map(self, width: int = 1000, **opts: Any):
+        """HoloViews paths of the level that matches the view, in Web Mercator.
+
+        Polygons are drawn by their outlines. The paths have no CRS, so they can be
+        overlaid on ``hv.element.tiles`` and on geographic hvplot plots with tiles.
+
+        Args:
+            width (int, optional): Width of the plot in pixels. Defaults to 1000.
+            **opts: Options of the paths, e.g. ``line_color="white"``.
+
+        Returns:
+            hv.DynamicMap: The paths of the geometries within the view.
+        """
+        import holoviews as hv
+        import holoviews.plotting.bokeh  # noqa: F401
+
+        def callback(x_range, y_range):
+            geometries = self.get(x_range, y_range, width).to_crs(MERCATOR).geometry
+            geometries = np.asarray(geometries.array)
+            polygonal = np.isin(shapely.get_type_id(geometries), POLYGONAL_TYPES)
+            geometries[polygonal] = shapely.boundary(geometries[polygonal])
+            lines = shapely.get_parts(geometries)
+            paths = [shapely.get_coordinates(line) for line in lines]
+            return hv.Path(paths, kdims=["x", "y"]).opts(backend="bokeh", **opts)
+
+        return hv.DynamicMap(callback, streams=[hv.streams.RangeXY()])
+
+
+def _build_parameters(max_zoom: int, tolerance: float) -> Dict[str, Any]:
+    """Arguments of ``build`` that change the levels, stored in the metadata."""
+    return {"max_zoom": max_zoom, "tolerance": tolerance, "method": METHOD}
+
+
+def _simplify(geometries: np.ndarray, tolerance: float) -> np.ndarray:
+    """Simplify polygons as a coverage and other geometries one by one."""
+    simplified = geometries.copy()
+    polygonal = np.isin(shapely.get_type_id(geometries), POLYGONAL_TYPES)
+    polygonal &= ~shapely.is_empty(geometries)
+    # Overlapping polygons are no coverage and would become invalid
+    if polygonal.any() and shapely.coverage_is_valid(geometries[polygonal]):
+        simplified[polygonal] = shapely.coverage_simplify(
+            geometries[polygonal], tolerance
+        )
+        others = ~polygonal
+    else:
+        others = np.ones(len(geometries), dtype=bool)
+    simplified[others] = shapely.simplify(
+        geometries[others], tolerance, preserve_topology=True
+    )
+    return simplified
+
+
+def _default_layer_path(urlpath: str) -> pathlib.Path:
+    if not is_remote(urlpath):
+        local_path = fsspec.core.url_to_fs(urlpath)[1]
+        return pathlib.Path(f"{local_path}.simplified")
+    key = hashlib.sha256(urlpath.encode()).hexdigest()
+    return default_cache().cache_dir / f"{key}.simplified"
@@ -0,0 +1,544 @@
+"""A local server of Mapbox Vector Tiles for the coastal layers of ipyleaflet maps.
+
+Adding a GeoDataFrame to an ipyleaflet map sends all of its geometries through the
+widget comm channel. Vector tiles are instead requested by the browser for the
+part of the map in view, at the resolution of the zoom level. The server runs in a
+thread of the kernel, generates the tiles of GeoParquet layers on request and keeps
+them in a cache on disk:
+
+    >>> m = plot_esri_basemap(4.3, 52.1, 8, "Scheveningen")
+    >>> add_vector_layer(m, data.fetch("coastal_systems.parquet"), "coastal_systems")
+    >>> add_vector_layer(
+    ...     m, "data/03_coastsat_transects.parquet", "transects", min_zoom=10
+    ... )
+
+The browser requests the tiles, so it has to reach the server. The server binds to
+127.0.0.1 of the machine of the kernel, which the browser reaches directly when
+Jupyter runs locally. On a JupyterHub or Binder, where the kernel runs on another
+machine, the tiles are served through jupyter-server-proxy, which forwards
+``{JUPYTERHUB_SERVICE_PREFIX}proxy/{port}/`` to the server. Elsewhere on a remote
+kernel, e.g. through an SSH tunnel, pass the url at which the browser reaches the
+port as ``base_url``.
+
+The tiles follow version 2.1 of the Mapbox Vector Tile specification. They are
+encoded here, which for the points, lines and polygons of our layers takes a page
+of code instead of another dependency.
+"""
+
+import hashlib
+import http.server
+import logging
+import math
+import os
+import pathlib
+import re
+import struct
+import threading
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+import fsspec
+import geopandas as gpd
+import numpy as np
+import shapely
+
+from coastal_dynamics.cache import default_cache, write_atomic
+from coastal_dynamics.pyramid import MERCATOR_HALF_WIDTH
+
+if TYPE_CHECKING:
+    import ipyleaflet
+
+logger = logging.getLogger(__name__)
+
+# Size of the integer grid of a tile
+EXTENT = 4096
+
+# Margin around a tile in grid units, so that lines and polygons join seamlessly
+BUFFER = 64
+
+MERCATOR = "EPSG:3857"
+
+TILE_PATH = re.compile(
+    r"^/(?P<name>[\w-]+)-(?P<version>[0-9a-f]{16})"
+    r"/(?P<z>\d+)/(?P<x>\d+)/(?P<y>\d+)\.pbf$"
+)
+
+# A tile url changes with the version of its layer, so a browser may keep it
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Geometry types and commands of the specification
+POINT, LINESTRING, POLYGON = 1, 2, 3
+MOVE_TO, LINE_TO, CLOSE_PATH = 1, 2, 7
+
+
+def _varint(value: int) -> bytes:
+    out = bytearray()
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def _zigzag(value: int) -> int:
+    return (value << 1) ^ (value >> 63)
+
+
+def _key(field: int, wire_type: int) -> bytes:
+    return _varint((field << 3) | wire_type)
+
+
+def _bytes_field(field: int, payload: bytes) -> bytes:
+    return _key(field, 2) + _varint(len(payload)) + payload
+
+
+def _uint_field(field: int, value: int) -> bytes:
+    return _key(field, 0) + _varint(value)
+
+
+def _packed_field(field: int, values: List[int]) -> bytes:
+    return _bytes_field(field, b"".join(_varint(v) for v in values))
+
+
+def _encode_value(value: Any) -> Optional[bytes]:
+    """Encode a property as a Value message, or None for a missing value."""
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return None
+    if isinstance(value, bool | np.bool_):
+        return _uint_field(7, int(value))
+    if isinstance(value, int | np.integer):
+        value = int(value)
+        if value >= 0:
+            return _uint_field(5, value)
+        return _uint_field(6, _zigzag(value))
+    if isinstance(value, float | np.floating):
+        return _key(3, 1) + struct.pack("<d", float(value))
+    return _bytes_field(1, str(value).encode())
+
+
+def _command(command: int, count: int) -> int:
+    return (command & 0x7) | (count << 3)
+
+
+def _encode_path(coords: np.ndarray, cursor: List[int], close: bool) -> List[int]:
+    """Commands of a line or ring, relative to the cursor, which is updated."""
+    deltas = np.diff(coords, axis=0, prepend=[cursor]).astype(np.int64)
+    cursor[:] = coords[-1].tolist()
+    params = (deltas << 1) ^ (deltas >> 63)
+    commands = [_command(MOVE_TO, 1), *params[0].tolist()]
+    if len(coords) > 1:
+        commands += [_command(LINE_TO, len(coords) - 1), *params[1:].ravel().tolist()]
+    if close:
+        commands.append(_command(CLOSE_PATH, 1))
+    return commands
+
+
+def _dedupe(coords: np.ndarray) -> np.ndarray:
+    """Drop points that repeat the previous point after rounding to the grid."""
+    keep = np.ones(len(coords), dtype=bool)
+    keep[1:] = (coords[1:] != coords[:-1]).any(axis=1)
+    return coords[keep]
+
+
+def _signed_area(ring: np.ndarray) -> float:
+    x, y = ring[:, 0], ring[:, 1]
+    return 0.5 * float(np.dot(x, np.roll(y, -1)) - np.dot(np.roll(x, -1), y))
+
+
+def encode_geometry(geometry: shapely.Geometry) -> tuple[int, List[int]]:
+    """Geometry type and commands of a geometry in tile grid coordinates.
+
+    Returns:
+        Tuple[int, List[int]]: The geometry type, and no commands when nothing of
+        the geometry is left on the grid.
+    """
+    parts = shapely.get_parts(geometry)
+    dimensions = shapely.get_dimensions(parts)
+    dimension = max(dimensions, default=-1)
+    parts = parts[dimensions == dimension]
+    cursor = [0, 0]
+
+    if dimension == 0:
+        coords = shapely.get_coordinates(parts).astype(np.int64)
+        deltas = np.diff(coords, axis=0, prepend=[cursor])
+        params = ((deltas << 1) ^ (deltas >> 63)).ravel().tolist()
+        return POINT, [_command(MOVE_TO, len(coords)), *params]
+
+    commands = []
+    if dimension == 1:
+        for line in parts:
+            coords = _dedupe(shapely.get_coordinates(line).astype(np.int64))
+            if len(coords) >= 2:
+                commands += _encode_path(coords, cursor, close=False)
+        return LINESTRING, commands
+
+    for polygon in parts:
+        rings = [polygon.exterior, *polygon.interiors]
+        for i, ring in enumerate(rings):
+            coords = _dedupe(shapely.get_coordinates(ring)[:-1].astype(np.int64))
+            if len(coords) < 3 or _signed_area(coords) == 0:
+                if i == 0:
+                    break
+                continue
+            # Exterior rings have a positive area on the grid, whose y points down
+            if (_signed_area(coords) > 0) != (i == 0):
+                coords = coords[::-1]
+            commands += _encode_path(coords, cursor, close=True)
+    return POLYGON, commands
+
+
+def encode_layer(
+    name: str, gdf: gpd.GeoDataFrame, columns: List[str], extent: int = EXTENT
+) -> bytes:
+    """Layer message of features whose geometries are in tile grid coordinates."""
+    keys: Dict[str, int] = {}
+    values: Dict[bytes, int] = {}
+    features = []
+    # A frame without columns has no rows to iterate over
+    properties = (
+        gdf[columns].itertuples(index=False, name=None) if columns else [()] * len(gdf)
+    )
+    for geometry, row in zip(gdf.geometry.array, properties, strict=True):
+        geom_type, commands = encode_geometry(geometry)
+        if not commands:
+            continue
+        tags = []
+        for column, value in zip(columns, row, strict=True):
+            encoded = _encode_value(value)
+            if encoded is None:
+                continue
+            tags.append(keys.setdefault(column, len(keys)))
+            tags.append(values.setdefault(encoded, len(values)))
+        feature = _packed_field(2, tags) if tags else b""
+        feature += _uint_field(3, geom_type) + _packed_field(4, commands)
+        features.append(_bytes_field(2, feature))
+
+    if not features:
+        return b""
+    layer = _uint_field(15, 2) + _bytes_field(1, name.encode())
+    layer += b"".join(features)
+    layer += b"".join(_bytes_field(3, key.encode()) for key in keys)
+    layer += b"".join(_bytes_field(4, value) for value in values)
+    layer += _uint_field(5, extent)
+    return _bytes_field(3, layer)
+
+
+def tile_bounds(z: int, x: int, y: int) -> tuple[float, float, float, float]:
+    """Bounds of a web map tile in Web Mercator meters."""
+    width = 2 * MERCATOR_HALF_WIDTH / 2**z
+    west = -MERCATOR_HALF_WIDTH + x * width
+    north = MERCATOR_HALF_WIDTH - y * width
+    return west, north - width, west + width, north
+
+
+class VectorTileSource:
+    """A layer that generates its vector tiles.
+
+    Attributes:
+        name (str): Name of the layer in the tiles.
+        gdf (gpd.GeoDataFrame): The features in Web Mercator.
+        columns (List[str]): Columns that become properties of the features.
+        min_zoom (int): Zoom level below which the tiles are empty.
+        source_key (str): Identifier of the version of the source. Defaults to a
+            hash of the features.
+        version (str): Short hash of the source key, part of the urls and the
+            location of the cached tiles.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        gdf: gpd.GeoDataFrame,
+        columns: Optional[List[str]] = None,
+        min_zoom: int = 0,
+        source_key: str = "",
+    ):
+        if not re.fullmatch(r"[\w-]+", name):
+            msg = f"Invalid layer name: {name}, use letters, digits, _ and -"
+            raise ValueError(msg)
+        self.name = name
+        self.gdf = gdf.to_crs(MERCATOR) if gdf.crs is not None else gdf
+        self.columns = (
+            [c for c in gdf.columns if c != gdf.geometry.name]
+            if columns is None
+            else list(columns)
+        )
+        self.min_zoom = min_zoom
+        self.source_key = source_key or _fingerprint(self.gdf, self.columns)
+        self.version = hashlib.sha256(self.source_key.encode()).hexdigest()[:16]
+        # Build the spatial index now rather than on the first tile request
+        self.gdf.sindex  # noqa: B018
+
+    @classmethod
+    def from_file(
+        cls,
+        urlpath: str,
+        name: str,
+        columns: Optional[List[str]] = None,
+        min_zoom: int = 0,
+        storage_options: Optional[dict[str, str]] = None,
+    ) -> "VectorTileSource":
+        """A layer from a GeoParquet file or any file that geopandas can read."""
+        from coastal_dynamics.io import read_geoparquet
+
+        fs, fs_path = fsspec.core.url_to_fs(urlpath, **(storage_options or {}))
+        if fs_path.endswith(".parquet"):
+            gdf = read_geoparquet(
+                urlpath, columns=columns, storage_options=storage_options
+            )
+        else:
+            with fs.open(fs_path, "rb") as f:
+                gdf = gpd.read_file(f, columns=columns)
+        return cls(name, gdf, columns, min_zoom, source_key=fs.ukey(fs_path))
+
+    def tile(self, z: int, x: int, y: int, extent: int = EXTENT) -> bytes:
+        """The vector tile z/x/y of the layer, empty when it has no features."""
+        if z < self.min_zoom:
+            return b""
+        west, south, east, north = tile_bounds(z, x, y)
+        scale = extent / (east - west)
+        margin = BUFFER / scale
+        positions = self.gdf.sindex.query(
+            shapely.box(west - margin, south - margin, east + margin, north + margin)
+        )
+        if len(positions) == 0:
+            return b""
+
+        features = self.gdf.iloc[np.sort(positions)]
+        geometries = shapely.clip_by_rect(
+            np.asarray(features.geometry.array),
+            west - margin,
+            south - margin,
+            east + margin,
+            north + margin,
+        )
+        # Vertices closer than a grid cell cannot be told apart
+        geometries = shapely.simplify(geometries, 1 / scale, preserve_topology=True)
+        geometries = shapely.transform(
+            geometries, lambda c: np.round((c - [west, north]) * [scale, -scale])
+        )
+        features = features.set_geometry(geometries, crs=None)
+        features = features[~features.geometry.is_empty]
+        return encode_layer(self.name, features, self.columns, extent)
+
+
+def _fingerprint(gdf: gpd.GeoDataFrame, columns: List[str]) -> str:
+    """Hash of the geometries and properties of features."""
+    import pandas as pd
+
+    digest = hashlib.sha256()
+    if columns:
+        hashes = pd.util.hash_pandas_object(gdf[columns], index=False).to_numpy()
+        digest.update(hashes.tobytes())
+    for wkb in shapely.to_wkb(np.asarray(gdf.geometry.array)):
+        digest.update(wkb)
+    return digest.hexdigest()
+
+
+class TileServer:
+    """An HTTP server of vector tiles in a background thread, with a disk cache.
+
+    Tiles are served at ``/{name}-{version}/{z}/{x}/{y}.pbf`` and cached in
+    ``{cache_dir}/{name}-{version}/{z}/{x}/{y}.pbf``, where the version changes
+    with the source of the layer. Tiles of an older version are never served, so
+    browsers may cache the tiles for good.
+
+    Attributes:
+        sources (Dict[str, VectorTileSource]): The layers by name.
+        cache_dir (pathlib.Path): Directory of the cached tiles.
+        url (str): Base url of the server in the browser.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str | pathlib.Path] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        base_url: Optional[str] = None,
+    ):
+        """Bind the server to a port.
+
+        Args:
+            cache_dir (Optional[str | pathlib.Path], optional): Directory of the
+                cached tiles. Defaults to None, which is in the cache directory.
+            host (str, optional): Address to bind to. Defaults to "127.0.0.1".
+            port (int, optional): Port to bind to. Defaults to 0, a free port.
+            base_url (Optional[str], optional): Url at which the browser reaches
+                the port. Defaults to None, which is through jupyter-server-proxy
+                on a JupyterHub and the address of the server otherwise.
+
+        Raises:
+            ImportError: On a JupyterHub without jupyter-server-proxy, where the
+                browser cannot reach the server.
+        """
+        self.sources: Dict[str, VectorTileSource] = {}
+        self.cache_dir = pathlib.Path(
+            cache_dir or default_cache().cache_dir / "vector_tiles"
+        )
+        self._httpd = http.server.ThreadingHTTPServer((host, port), _make_handler(self))
+        self._httpd.daemon_threads = True
+        try:
+            base_url = base_url or _base_url(host, self._httpd.server_port)
+        except ImportError:
+            self._httpd.server_close()
+            raise
+        self.url = base_url.rstrip("/")
+        self._thread: Optional[threading.Thread] = None
+
+    def add_source(self, source: VectorTileSource) -> str:
+        """Serve a layer, replacing a layer with the same name.
+
+        Returns:
+            str: The url template of the tiles of the layer.
+        """
+        self.sources[source.name] = source
+        return f"{self.url}/{source.name}-{source.version}/{{z}}/{{x}}/{{y}}.pbf"
+
+    def start(self) -> None:
+        """Serve tiles in a daemon thread, unless the server is already running."""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._httpd.serve_forever, daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop serving tiles and close the socket."""
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpd.server_close()
+
+    def get_tile(self, name: str, z: int, x: int, y: int) -> bytes:
+        """A tile from the cache, generated and stored in the cache when missing.
+
+        Raises:
+            KeyError: If no layer has this name.
+        """
+        source = self.sources[name]
+        path = self.cache_dir / f"{name}-{source.version}" / str(z) / str(x)
+        path /= f"{y}.pbf"
+        try:
+            return path.read_bytes()
+        except FileNotFoundError:
+            pass
+
+        tile = source.tile(z, x, y)
+        write_atomic(path, tile)
+        return tile
+
+
+def _base_url(host: str, port: int) -> str:
+    """Url at which the browser reaches a server on the machine of the kernel."""
+    prefix = os.environ.get("JUPYTERHUB_SERVICE_PREFIX")
+    if prefix is None:
+        return f"http://{host}:{port}"
+    try:
+        import jupyter_server_proxy  # noqa: F401
+    except ImportError:
+        msg = "The kernel runs on a JupyterHub, whose browsers cannot reach the tile "
+        msg += "server of the kernel without the jupyter-server-proxy package."
+        raise ImportError(msg) from None
+    return f"{prefix.rstrip('/')}/proxy/{port}"
+
+
+def _make_handler(server: TileServer):
+    """Request handler that serves the tiles of a tile server."""
+
+    class TileHandler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            match = TILE_PATH.match(self.path.split("?")[0])
+            source = None if match is None else server.sources.get(match["name"])
+            # Tiles of a replaced version of the layer are gone
+            if source is None or match["version"] != source.version:
+                self.send_error(404)
+                return
+            z, x, y = (int(match[k]) for k in ("z", "x", "y"))
+            if not (x < 2**z and y < 2**z):
+                self.send_error(404)
+                return
+            try:
+                tile = server.get_tile(match["name"], z, x, y)
+            except Exception:
+                logger.exception(f"Cannot generate tile {self.path}")
+                self.send_error(500)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "application/vnd.mapbox-vector-tile")
+            self.send_header("Content-Length", str(len(tile)))
+            # The notebook runs on another origin than the tile server
+            self.send_header("Access-Control-Allow-Origin", "*")
+            self.send_header("Cache-Control", CACHE_CONTROL)
+            self.end_headers()
+            self.wfile.write(tile)
+
+        def log_message(self, format, *args):  # noqa: A002
+            logger.debug(format % args)
+
+    return TileHandler
+
+
+_default_server: Optional[TileServer] = None
+_default_server_lock = threading.Lock()
+
+
+def default_server() -> TileServer:
+    """The tile server of the kernel, started on first use."""
+    global _default_server  # noqa: PLW0603
+    with _default_server_lock:
+        if _default_server is None:
+            _default_server = TileServer()
+            _default_server.start()
+        return _default_server
+
+
+def add_vector_layer(
+    m: "ipyleaflet.Map",
+    layer: str | gpd.GeoDataFrame,
+    name: str,
+    columns: Optional[List[str]] = None,
+    min_zoom: int = 0,
+    style: Optional[Dict[str, Any]] = None,
+    server: Optional[TileServer] = None,
+    storage_options: Optional[dict[str, str]] = None,
+) -> "ipyleaflet.VectorTileLayer":
+    """Add a layer to an ipyleaflet map as vector tiles from a local tile server.
+
+    Args:
+        m (ipyleaflet.Map): The map, e.g. from ``plot_esri_basemap``.
+        layer (str | gpd.GeoDataFrame): Url or file path of a GeoParquet file, or
+            any file that geopandas can read, or a GeoDataFrame.
+        name (str): Name of the layer, with letters, digits, _ and -.
+        columns (Optional[List[str]], optional): Columns that become properties of
+            the features. Defaults to None, which is all columns.
+        min_zoom (int, optional): Zoom level below which the layer is not shown,
+            for large layers such as the transects. Defaults to 0.
+        style (Optional[Dict[str, Any]], optional): Leaflet path options of the
+            features, e.g. {"color": "white", "weight": 1}. Defaults to None.
+        server (Optional[TileServer], optional): Tile server. Defaults to None,
+            which is the tile server of the kernel.
+        storage_options (Optional[Dict[str, str]]): If given, contains options
+            such as account name and SAS token for Azure Blob storage.
+
+    Returns:
+        ipyleaflet.VectorTileLayer: The layer that was added to the map.
+    """
+    from ipyleaflet import VectorTileLayer
+
+    if isinstance(layer, gpd.GeoDataFrame):
+        source = VectorTileSource(name, layer, columns, min_zoom)
+    else:
+        source = VectorTileSource.from_file(
+            layer, name, columns, min_zoom, storage_options
+        )
+    server = server or default_server()
+    url = server.add_source(source)
+
+    tile_layer = VectorTileLayer(
+        url=url,
+        name=name,
+        min_zoom=min_zoom,
+        layer_styles={name: style or {"color": "white", "weight": 1}},
+    )
+    m.add(tile_layer)
+    return tile_layer
@@ -1,6 +1,175 @@
+import functools
 import hashlib
+from collections.abc import Hashable, Mapping
+from types import MappingProxyType
+
 import numpy as np
 
+# A single scaling by an exact power of ten leaves enough headroom in a double to
+# decide the rounding of the last significant digit of nearly all values up to
+# this precision; beyond it most values would go through the scalar formatter
+MAX_VECTORIZED_SIG_FIGS = 14
+MAX_EXACT_POWER_OF_TEN = 22
+POWERS_OF_TEN = 10.0 ** np.arange(MAX_EXACT_POWER_OF_TEN + 1)
+
+# Largest decimal exponent whose whole part still fits in an int64
+MAX_VECTORIZED_EXPONENT = 17
+
+
+def _format_sig_figs_scalar(value: float, sig_figs: int) -> str:
+    return np.format_float_positional(
+        value, precision=sig_figs, unique=False, fractional=False, trim="k"
+    )
+
+
+def _round_sig_figs(absolute: np.ndarray, sig_figs: int):
+    """Round positive values to integer mantissas with ``sig_figs`` digits.
+
+    Returns the decimal exponent of the first digit, the mantissa, the scaled value
+    before rounding, whether the scaling by a power of ten was exact and whether the
+    rounding carried into the next decade.
+    """
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        exponent = np.floor(np.log10(absolute)).astype(np.int64)
+
+        def scale(exponent):
+            # Scale by one exact power of ten so that only a single rounding occurs
+            shift = sig_figs - 1 - exponent
+            power = POWERS_OF_TEN[np.minimum(np.abs(shift), MAX_EXACT_POWER_OF_TEN)]
+            scaled = np.where(shift >= 0, absolute * power, absolute / power)
+            return scaled, np.abs(shift) <= MAX_EXACT_POWER_OF_TEN
+
+        # The estimate from log10 can be off by one close to powers of ten
+        scaled, _ = scale(exponent)
+        exponent += scaled >= 10.0**sig_figs
+        exponent -= scaled < 10.0 ** (sig_figs - 1)
+
+        scaled, exact = scale(exponent)
+        mantissa = np.round(scaled)
+
+    # Rounding up can carry into the next decade, e.g. 9.96 -> 10.
+    carry = mantissa >= 10.0**sig_figs
+    exponent += carry
+    mantissa[carry] = 10.0 ** (sig_figs - 1)
+    return exponent, mantissa, scaled, exact, carry
+
+
+def _format_mantissas(
+    exponent: np.ndarray,
+    mantissa: np.ndarray,
+    rounded_down: np.ndarray,
+    negative: np.ndarray,
+    sig_figs: int,
+) -> np.ndarray:
+    """Lay out rounded mantissas as format_float_positional does.
+
+    Every number is a row of a byte matrix, with "0" characters up to its length and
+    null bytes after it, which numpy strips from the end of strings. The sign, the
+    point and the digits of the mantissa are then scattered to their columns.
+    """
+    n = len(mantissa)
+    chars = np.empty((n, sig_figs), dtype=np.uint8)
+    remainder = mantissa.copy()
+    for j in range(sig_figs - 1, -1, -1):
+        remainder, digit = np.divmod(remainder, 10)
+        chars[:, j] = digit + ord("0")
+
+    # Trailing zeros are dropped after the point unless the value was rounded down
+    # and padded to sig_figs - 1 places, which only shows for values below one
+    trailing_zeros = np.argmax(chars[:, ::-1] != ord("0"), axis=1)
+    n_digits = np.where(rounded_down, sig_figs, sig_figs - trailing_zeros)
+
+    # Values from one upwards print all digits, with the point after the digit of
+    # the ones, or zeros up to the ones and then the point. Values below one print
+    # "0.", the leading zeros and the digits.
+    large = exponent >= 0
+    sign = negative.astype(np.int64)
+    point = sign + np.where(large, exponent + 1, 1)
+    first_digit = np.where(large, sign, point - exponent)
+    length = np.where(
+        large,
+        np.maximum(point, sign + sig_figs) + 1,
+        point + 1 + np.maximum(sig_figs - 1, -exponent - 1 + n_digits),
+    )
+
+    width = int(length.max(initial=1))
+    matrix = (np.arange(width) < length[:, None]).astype(np.uint8) * ord("0")
+    flat = matrix.ravel()
+    row_start = np.arange(n) * width
+    column = first_digit[:, None] + np.arange(sig_figs)
+    # The point of values from one upwards comes before the digits of the fraction
+    column += large[:, None] & (column >= point[:, None])
+    # Dropped trailing zeros are written as null bytes, within the row
+    chars[column >= length[:, None]] = 0
+    column = np.minimum(column, width - 1)
+    flat[(row_start[:, None] + column).ravel()] = chars.ravel()
+    flat[row_start + point] = ord(".")
+    flat[row_start[negative]] = ord("-")
+
+    # The characters are ASCII, so widening the bytes gives the unicode strings
+    return matrix.astype(np.uint32).view(f"U{width}").ravel()
+
+
+def format_sig_figs(values, sig_figs: int) -> np.ndarray:
+    """Format numbers in positional notation with a number of significant figures.
+
+    The result is identical to calling ``np.format_float_positional(value,
+    precision=sig_figs, unique=False, fractional=False, trim="k")`` on every value,
+    but the rounding and formatting are done on whole arrays. Values whose rounding
+    cannot be decided safely in floating point, such as exact ties, zeros and
+    non-finite values, are formatted with the scalar function.
+
+    Args:
+        values (array_like): The numbers to format.
+        sig_figs (int): The number of significant figures, at least one.
+
+    Returns:
+        np.ndarray: Array of strings with the same shape as ``values``.
+    """
+    values = np.asarray(values, dtype=float)
+    flat = values.ravel()
+    absolute = np.abs(flat)
+
+    fast = np.isfinite(flat) & (absolute > 0)
+    if sig_figs > MAX_VECTORIZED_SIG_FIGS:
+        fast[:] = False
+    fast_idx = np.flatnonzero(fast)
+
+    exponent, mantissa, scaled, exact, carry = _round_sig_figs(
+        absolute[fast_idx], sig_figs
+    )
+    tolerance = scaled * 2.0**-50
+    is_multiple_of_ten = mantissa % 10 == 0
+    # format_float_positional stops printing digits when the value is exhausted and
+    # drops the zeros that a carry leaves behind, so trailing zeros of the mantissa
+    # are only printed when the value was rounded down.
+    rounded_down = ~carry & (scaled - mantissa > tolerance)
+    decidable = (
+        exact
+        & (mantissa >= 10.0 ** (sig_figs - 1))
+        & (mantissa < 10.0**sig_figs)
+        & (exponent <= MAX_VECTORIZED_EXPONENT)
+        & (np.abs(scaled - np.floor(scaled) - 0.5) > tolerance)
+        & ~(is_multiple_of_ten & (np.abs(scaled - mantissa) <= tolerance))
+    )
+    fast[fast_idx[~decidable]] = False
+    fast_idx = fast_idx[decidable]
+    exponent = exponent[decidable]
+    mantissa = mantissa[decidable].astype(np.int64)
+    rounded_down = rounded_down[decidable]
+
+    formatted = _format_mantissas(
+        exponent, mantissa, rounded_down, np.signbit(flat[fast_idx]), sig_figs
+    )
+    if len(fast_idx) == len(flat):
+        return formatted.reshape(values.shape)
+    fallback = [_format_sig_figs_scalar(value, sig_figs) for value in flat[~fast]]
+    max_length = max([formatted.dtype.itemsize // 4, *map(len, fallback)])
+    result = np.empty(flat.shape, dtype=f"U{max(max_length, 1)}")
+    result[fast_idx] = formatted
+    result[~fast] = fallback
+    return result.reshape(values.shape)
+
 
 def hash_answer(answer, question_type, sig_figs=None):
     """Hash a single answer or a list of answers based on the question type."""
@@ -14,15 +183,59 @@ def hash_answer(answer, question_type, sig_figs=None):
         # For multiple_choice and numeric, directly hash the answer
         return hashlib.sha256(str(answer).encode()).hexdigest()
     elif question_type == "numeric":
+        if isinstance(answer, list | tuple | np.ndarray):
+            # For arrays of numeric answers, format all values at once
+            if sig_figs:
+                answer = format_sig_figs(answer, sig_figs)
+            return [hashlib.sha256(str(ans).encode()).hexdigest() for ans in answer]
         if sig_figs:
-            answer = np.format_float_positional(
-                float(answer),
-                precision=sig_figs,
-                unique=False,
-                fractional=False,
-                trim="k",
-            )
+            answer = _format_sig_figs_scalar(float(answer), sig_figs)
         return hashlib.sha256(str(answer).encode()).hexdigest()
     else:
         msg = f"Unsupported question type: {question_type}"
         raise ValueError(msg)
+
+
+@functools.lru_cache(maxsize=1024)
+def compile_answer_index(
+    question_type: str,
+    correct_answer: str | tuple[str, ...],
+    option_keys: tuple[str, ...],
+) -> Mapping[Hashable, bool]:
+    """Precompute which answers to a question with a fixed set of options are correct.
+
+    The hashed answer is compared against every option once, so checking a submitted
+    answer becomes a dictionary lookup. The index is cached per question, which means
+    that all sessions that show the same question share it.
+
+    Args:
+        question_type (str): Either "multiple_choice" or "multiple_selection".
+        correct_answer (str | Tuple[str, ...]): The hashed correct answer, or a tuple of
+            hashed correct answers for multiple selection questions.
+        option_keys (Tuple[str, ...]): The keys of the options of the question.
+
+    Returns:
+        Mapping[Hashable, bool]: Read-only mapping from an option key, or a frozenset
+        of option keys for multiple selection questions, to whether it is correct.
+        Answers that are not in the mapping are incorrect.
+    """
+    if question_type == "multiple_choice":
+        index = {
+            key: hash_answer(key, question_type) == correct_answer
+            for key in option_keys
+        }
+    elif question_type == "multiple_selection":
+        hashed_options = dict(
+            zip(option_keys, hash_answer(option_keys, question_type), strict=True)
+        )
+        correct_keys = frozenset(
+            key for key, hashed in hashed_options.items() if hashed in correct_answer
+        )
+        # Only a selection whose hashes match all correct answers is correct
+        index = {}
+        if {hashed_options[key] for key in correct_keys} == set(correct_answer):
+            index[correct_keys] = True
+    else:
+        msg = f"Unsupported question type: {question_type}"
+        raise ValueError(msg)
+    return MappingProxyType(index)
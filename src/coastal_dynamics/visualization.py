@@ -1,16 +1,38 @@
+import threading
 import warnings
+from typing import TYPE_CHECKING
 
-import ipyleaflet
 import numpy as np
 import pandas as pd
 import panel as pn
-from ipyleaflet import Map, Marker, ScaleControl, basemaps
-from ipywidgets import HTML
 
-pn.extension()
+if TYPE_CHECKING:
+    import ipyleaflet
 
 warnings.filterwarnings("ignore", category=FutureWarning, module="holoviews.core.data")
 
+_loaded_extensions: set[str] = set()
+_extension_lock = threading.Lock()
+
+
+def ensure_extension(*extensions: str) -> None:
+    """Load the Panel extension, and optional named extensions, once per kernel.
+
+    Loading the extension bootstraps the Bokeh and Panel JavaScript, which is only
+    needed when something is rendered. Extensions that were already loaded are
+    skipped, so this can be called every time a viewable is rendered.
+
+    Args:
+        *extensions (str): Names of additional Panel extensions, e.g. "ipywidgets".
+    """
+    requested = {"panel", *extensions}
+    with _extension_lock:
+        missing = requested - _loaded_extensions
+        if not missing:
+            return
+        pn.extension(*sorted(missing - {"panel"}))
+        _loaded_extensions.update(missing)
+
 
 class DynamicWavePlot(pn.viewable.Viewer):
     """
@@ -51,6 +73,8 @@ class DynamicWavePlot(pn.viewable.Viewer):
 
     def generate_wave_plot(self, a: float, L: float):
         """Generates a sine wave plot based on the given amplitude and wavelength."""
+        import hvplot.pandas  # noqa: F401
+
         x = np.linspace(0, 12, 100)
         eta = a * np.sin(2 * np.pi / L * x)
         df = pd.DataFrame({"x": x, "eta": eta})
@@ -58,12 +82,13 @@ class DynamicWavePlot(pn.viewable.Viewer):
 
     def __panel__(self) -> pn.Column:
         """Creates a Panel layout with the sliders and the plot."""
+        ensure_extension()
         return pn.Column(self.amplitude_slider, self.wavelength_slider, self.plot)
 
 
 def plot_esri_basemap(
     lon: float, lat: float, zoom: int, name: str
-) -> ipyleaflet.leaflet.Map:
+) -> "ipyleaflet.leaflet.Map":
     """Plot IPyleaflet map with ESRI basemap tiles.
 
     Args:
@@ -75,6 +100,9 @@ def plot_esri_basemap(
     Returns:
         ipyleaflet.leaflet.Map: Basemap with ESRI World Imagery.
     """
+    from ipyleaflet import Map, Marker, ScaleControl, basemaps
+    from ipywidgets import HTML
+
     m = Map(basemap=basemaps.Esri.WorldImagery, scroll_wheel_zoom=True)
     center = (lat, lon)
     marker = Marker(location=center)
@@ -0,0 +1,169 @@
+import asyncio
+import http.server
+import json
+import threading
+import urllib.error
+
+import fsspec
+import pytest
+
+from coastal_dynamics.cache import RemoteFileCache, atomic_path, write_atomic
+from coastal_dynamics.io import aread_questions, close_async_filesystems, read_questions
+
+QUESTIONS = {"Q1": {"name": "Q1", "type": "text", "answer": "M2"}}
+
+
+class QuestionsHandler(http.server.BaseHTTPRequestHandler):
+    etag = '"v1"'
+    body = json.dumps(QUESTIONS).encode()
+    requests: list[tuple[str, int]] = []
+    missing = False
+
+    def do_GET(self):
+        if self.missing:
+            self.requests.append((self.path, 404))
+            self.send_error(404)
+            return
+        if self.headers.get("If-None-Match") == self.etag:
+            self.requests.append((self.path, 304))
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.requests.append((self.path, 200))
+        self.send_response(200)
+        self.send_header("ETag", self.etag)
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture()
+def server():
+    QuestionsHandler.requests = []
+    QuestionsHandler.missing = False
+    httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), QuestionsHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_cache_serves_within_ttl_without_requests(server, tmp_path):
+    url = f"http://127.0.0.1:{server.server_port}/questions.json"
+    cache = RemoteFileCache(tmp_path, ttl=3600)
+
+    assert read_questions(url, cache=cache) == QUESTIONS
+    assert read_questions(url, cache=cache) == QUESTIONS
+    assert QuestionsHandler.requests == [("/questions.json", 200)]
+
+
+def test_cache_revalidates_and_works_offline(server, tmp_path):
+    url = f"http://127.0.0.1:{server.server_port}/questions.json"
+    cache = RemoteFileCache(tmp_path, ttl=0)
+
+    assert read_questions(url, cache=cache) == QUESTIONS
+    assert read_questions(url, cache=cache) == QUESTIONS
+    assert QuestionsHandler.requests == [
+        ("/questions.json", 200),
+        ("/questions.json", 304),
+    ]
+
+    server.shutdown()
+    server.server_close()
+    assert read_questions(url, cache=cache) == QUESTIONS
+
+
+def test_cache_raises_missing_files_instead_of_serving_cached_copy(server, tmp_path):
+    url = f"http://127.0.0.1:{server.server_port}/questions.json"
+    cache = RemoteFileCache(tmp_path, ttl=0)
+    assert read_questions(url, cache=cache) == QUESTIONS
+
+    QuestionsHandler.missing = True
+    with pytest.raises(urllib.error.HTTPError) as excinfo:
+        read_questions(url, cache=cache)
+    assert excinfo.value.code == 404
+
+
+def test_cache_evicts_least_recently_used(server, tmp_path):
+    port = server.server_port
+    cache = RemoteFileCache(tmp_path, max_size=len(QuestionsHandler.body) * 2)
+
+    for name in ("a", "b", "c"):
+        cache.get(f"http://127.0.0.1:{port}/{name}.json")
+
+    cached = {path.name for path in tmp_path.iterdir()}
+    assert cached == {
+        name
+        for url in (
+            f"http://127.0.0.1:{port}/b.json",
+            f"http://127.0.0.1:{port}/c.json",
+        )
+        for key in [cache._key(url)]
+        for name in (key, f"{key}.meta.json")
+    }
+    metadata = [json.loads(p.read_text()) for p in tmp_path.glob("*.meta.json")]
+    assert all("url" not in entry for entry in metadata)
+
+
+def test_aread_questions_reads_concurrently(server):
+    pytest.importorskip("aiohttp")
+    port = server.server_port
+
+    async def read_all():
+        try:
+            return await asyncio.gather(
+                *(
+                    aread_questions(f"http://127.0.0.1:{port}/{i}.json")
+                    for i in range(8)
+                )
+            )
+        finally:
+            await close_async_filesystems()
+
+    assert asyncio.run(read_all()) == [QUESTIONS] * 8
+    assert sorted(QuestionsHandler.requests) == sorted(
+        (f"/{i}.json", 200) for i in range(8)
+    )
+
+
+def test_cache_compares_etag_before_modification_time(tmp_path, monkeypatch):
+    fs = fsspec.filesystem("memory")
+    fs.pipe("/etag/questions.json", json.dumps(QUESTIONS).encode())
+    info = {"etag": '"v1"', "last_modified": "2024-01-01"}
+    monkeypatch.setattr(type(fs), "info", lambda self, path, **kwargs: dict(info))
+    cache = RemoteFileCache(tmp_path, ttl=0)
+
+    assert read_questions("memory://etag/questions.json", cache=cache) == QUESTIONS
+    # Rewritten within the resolution of the modification time
+    updated = {"Q2": {"name": "Q2", "type": "text", "answer": "S2"}}
+    fs.pipe("/etag/questions.json", json.dumps(updated).encode())
+    info["etag"] = '"v2"'
+    assert read_questions("memory://etag/questions.json", cache=cache) == updated
+
+
+def test_cache_serves_cached_copy_on_azure_errors(tmp_path, monkeypatch):
+    exceptions = pytest.importorskip("azure.core.exceptions")
+    fs = fsspec.filesystem("memory")
+    fs.pipe("/offline/questions.json", json.dumps(QUESTIONS).encode())
+    cache = RemoteFileCache(tmp_path, ttl=0)
+    assert read_questions("memory://offline/questions.json", cache=cache) == QUESTIONS
+
+    def unreachable(self, path, **kwargs):
+        raise exceptions.ServiceRequestError("Name or service not known")
+
+    monkeypatch.setattr(type(fs), "info", unreachable)
+    assert read_questions("memory://offline/questions.json", cache=cache) == QUESTIONS
+
+
+def test_atomic_path_keeps_previous_file_on_failure(tmp_path):
+    path = tmp_path / "layer" / "0.parquet"
+    write_atomic(path, b"previous")
+    with pytest.raises(RuntimeError), atomic_path(path) as tmp:
+        tmp.write_bytes(b"partial")
+        raise RuntimeError
+    assert path.read_bytes() == b"previous"
+    assert list(path.parent.iterdir()) == [path]
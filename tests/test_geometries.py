@@ -0,0 +1,156 @@
+import numpy as np
+from pyproj import CRS
+
+from coastal_dynamics.geometries import (
+    Tile,
+    build_bbox,
+    build_bboxes,
+    geo_bbox,
+    geo_bboxes,
+    geometries_to_bounds,
+    geometry_to_bbox,
+    get_transformer,
+    grid_tiles,
+    map_tiles,
+    quadtree_tiles,
+)
+
+
+def test_get_transformer_is_shared():
+    transformer = get_transformer("EPSG:3857", "EPSG:4326")
+    assert get_transformer("EPSG:3857", "EPSG:4326", always_xy=True) is transformer
+    assert get_transformer("EPSG:3857", "EPSG:4326", always_xy=False) is not (
+        transformer
+    )
+
+
+def test_get_transformer_accepts_unhashable_crs():
+    projjson = CRS.from_user_input("EPSG:4326").to_json_dict()
+    transformer = get_transformer("EPSG:3857", projjson)
+    assert get_transformer(CRS.from_epsg(3857), projjson) is transformer
+    x, y = transformer.transform(20037508.342789244, 0.0)
+    np.testing.assert_allclose([x, y], [180.0, 0.0])
+
+
+def test_build_bboxes_matches_build_bbox():
+    bounds = np.array(
+        [
+            [-5802250.0, -622000.0, -5519250.0, -39000.0],
+            [400000.0, 6700000.0, 500000.0, 6800000.0],
+        ]
+    )
+    expected = [build_bbox(*bbox, "EPSG:3857", "EPSG:4326") for bbox in bounds]
+    np.testing.assert_allclose(build_bboxes(bounds, "EPSG:3857", "EPSG:4326"), expected)
+
+
+def test_geometry_to_bbox():
+    multipolygon = {
+        "type": "MultiPolygon",
+        "coordinates": [
+            [[[0.0, 0.0], [3.0, 1.0], [2.0, 5.0], [0.0, 0.0]]],
+            [[[-1.0, -2.0], [0.0, 0.0], [-1.0, -2.0]]],
+        ],
+    }
+    assert geometry_to_bbox(multipolygon) == [-1.0, -2.0, 3.0, 5.0]
+    assert geometry_to_bbox({"type": "Point", "coordinates": [1.0, 2.0]}) == [
+        1.0,
+        2.0,
+        1.0,
+        2.0,
+    ]
+
+
+def test_geometries_to_bounds():
+    collection = {
+        "type": "FeatureCollection",
+        "features": [
+            {
+                "type": "Feature",
+                "properties": {},
+                "geometry": {"type": "LineString", "coordinates": [[0, 0], [1, 2]]},
+            },
+            {"type": "Feature", "properties": {}, "geometry": None},
+            {
+                "type": "Feature",
+                "properties": {},
+                "geometry": {"type": "Point", "coordinates": [5.0, 6.0, 1.0]},
+            },
+        ],
+    }
+    np.testing.assert_array_equal(
+        geometries_to_bounds(collection),
+        [[0, 0, 1, 2], [np.nan] * 4, [5, 6, 5, 6]],
+    )
+
+
+def test_geo_bboxes_reprojects_all_boxes():
+    bounds = [[-10.0, 40.0, 10.0, 60.0], [0.0, 50.0, 40.0, 70.0]]
+    gdf = geo_bboxes(bounds, "EPSG:4326", "EPSG:3857")
+    assert len(gdf) == 2
+    assert gdf.crs == "EPSG:3857"
+    assert gdf.geometry[0].equals_exact(
+        geo_bbox(*bounds[0], "EPSG:4326", "EPSG:3857").geometry[0], 1e-6
+    )
+    np.testing.assert_allclose(
+        geo_bboxes(bounds).bounds.to_numpy(), np.asarray(bounds), atol=1e-12
+    )
+
+
+def test_geo_bboxes_densify_keeps_curved_edges():
+    bbox = [[0.0, 50.0, 40.0, 70.0]]
+    plain = geo_bboxes(bbox, "EPSG:4326", "EPSG:3035").total_bounds
+    dense = geo_bboxes(bbox, "EPSG:4326", "EPSG:3035", densify=21).total_bounds
+    # The southern edge bulges south of its corners in a Lambert projection
+    assert dense[1] < plain[1]
+    assert len(geo_bboxes(bbox, densify=1).geometry[0].exterior.coords) == 9
+
+
+def test_grid_tiles_cross_antimeridian_with_halo():
+    tiles = grid_tiles([170.0, -20.0, -170.0, 0.0], tile_size=5.0, halo=1.0)
+    assert len(tiles) == 16
+    assert tiles[0] == Tile(
+        "0/0-0", (170.0, -20.0, 175.0, -15.0), (169.0, -21.0, 176.0, -14.0)
+    )
+    assert tiles[-1].bounds == (-175.0, -5.0, -170.0, 0.0)
+
+
+def test_grid_tiles_wrap_and_clamp_halos():
+    tiles = grid_tiles([170.0, -90.0, -170.0, -80.0], tile_size=5.0, halo=1.0)
+    halos = {tile.bounds: tile.halo for tile in tiles}
+    # Wrapped across the antimeridian on both sides, clamped at the south pole
+    assert halos[(175.0, -90.0, 180.0, -85.0)] == (174.0, -90.0, -179.0, -84.0)
+    assert halos[(-180.0, -90.0, -175.0, -85.0)] == (179.0, -90.0, -174.0, -84.0)
+    world = grid_tiles([-180.0, -90.0, 180.0, 90.0], tile_size=360.0, halo=1.0)
+    assert world[0].halo == (-180.0, -90.0, 180.0, 90.0)
+
+
+def test_tiles_assign_antimeridian_features_to_their_larger_part():
+    features = np.array(
+        [
+            [179.0, -12.0, -178.0, -11.0],  # mostly west of the antimeridian
+            [177.0, -12.0, -179.0, -11.0],  # mostly east of the antimeridian
+        ]
+    )
+    tiles = grid_tiles([170.0, -20.0, -170.0, 0.0], 5.0, features=features)
+    assert {tile.key: tile.feature_indices.tolist() for tile in tiles} == {
+        "0/1-1": [1],
+        "1/1-0": [0],
+    }
+    tiles = quadtree_tiles([170.0, -20.0, -170.0, 0.0], features, max_features=1)
+    assert [tile.key for tile in tiles] == ["0", "1"]
+
+
+def count_features(tile):
+    return len(tile.feature_indices)
+
+
+def test_quadtree_tiles_limit_features_per_tile():
+    rng = np.random.default_rng(0)
+    points = np.column_stack([rng.uniform(-180, 180, 5000), rng.uniform(-90, 90, 5000)])
+    tiles = quadtree_tiles([-180.0, -90.0, 180.0, 90.0], points, max_features=200)
+    assert max(len(tile.feature_indices) for tile in tiles) <= 200
+    indices = np.concatenate([tile.feature_indices for tile in tiles])
+    np.testing.assert_array_equal(np.sort(indices), np.arange(len(points)))
+    assert map_tiles(count_features, tiles, n_workers=2) == [
+        len(tile.feature_indices) for tile in tiles
+    ]
@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import coastal_dynamics as cd
+from coastal_dynamics.grading import grade_submissions
+
+
+@pytest.fixture()
+def questions():
+    feedback = {"correct": "Correct!", "incorrect": "Incorrect."}
+    return {
+        "Q1": {
+            "name": "Q1",
+            "type": "multiple_choice",
+            "question": "Which coastal system is typical for tide-dominated coasts?",
+            "options": {"a": "Mudflats", "b": "Open coasts"},
+            "answer": cd.hash_answer("a", "multiple_choice"),
+            "feedback": feedback,
+        },
+        "Q2": {
+            "name": "Q2",
+            "type": "multiple_selection",
+            "question": "Select all features commonly found along a coastline",
+            "options": {"a": "Beaches", "b": "Glaciers", "c": "Estuaries"},
+            "answer": cd.hash_answer(["a", "c"], "multiple_selection"),
+            "feedback": feedback,
+        },
+        "Q3": {
+            "name": "Q3",
+            "type": "numeric",
+            "question": "What is the relative importance of S2 vs M2?",
+            "answer": cd.hash_answer(0.33, "numeric", sig_figs=2),
+            "sig_figs": 2,
+            "feedback": feedback,
+        },
+        "Q4": {
+            "name": "Q4",
+            "type": "text",
+            "question": "Which constituent is dominant?",
+            "answer": cd.hash_answer("M2", "text"),
+            "feedback": feedback,
+        },
+    }
+
+
+def test_grade_submissions(questions):
+    submissions = pd.DataFrame(
+        {
+            "question": ["Q1", "Q1", "Q1", "Q2", "Q2", "Q2", "Q3", "Q3", "Q3", "Q4"],
+            "answer": [
+                "a",
+                "Mudflats",
+                "b",
+                "c, a",
+                "a",
+                ["a", "c"],
+                0.3312,
+                "0.4",
+                "not a number",
+                "m2",
+            ],
+        }
+    )
+    expected = [True, True, False, True, False, True, True, False, False, True]
+
+    graded = grade_submissions(questions, submissions)
+    assert graded["correct"].tolist() == expected
+    assert graded["type"].tolist()[:4] == ["multiple_choice"] * 3 + [
+        "multiple_selection"
+    ]
+
+    graded = grade_submissions(questions, submissions, n_workers=2)
+    assert graded["correct"].tolist() == expected
+
+
+def test_grade_submissions_unknown_question(questions):
+    submissions = pd.DataFrame({"question": ["Q9"], "answer": ["a"]})
+    with pytest.raises(ValueError, match="Q9"):
+        grade_submissions(questions, submissions)
+
+
+def test_grade_submissions_numeric_matches_hash_answer(questions):
+    rng = np.random.default_rng(0)
+    answers = [
+        round(value, decimals)
+        for value, decimals in zip(
+            0.33 + rng.normal(0, 0.01, 1000), rng.integers(2, 6, 1000), strict=True
+        )
+    ]
+    submissions = pd.DataFrame({"question": "Q3", "answer": answers})
+    expected = [
+        cd.hash_answer(answer, "numeric", sig_figs=2) == questions["Q3"]["answer"]
+        for answer in answers
+    ]
+    graded = grade_submissions(questions, submissions)
+    assert graded["correct"].tolist() == expected
+    assert 0 < sum(expected) < len(expected)
@@ -0,0 +1,126 @@
+import json
+
+import fsspec
+import numpy as np
+import pytest
+
+from coastal_dynamics.io import (
+    get_encoding,
+    get_filesystem,
+    read_geoparquet,
+    read_questions,
+    write_geoparquet,
+    write_questions,
+)
+
+QUESTIONS = {"q1": {"type": "text", "answer": "dune"}}
+
+
+def test_write_questions_roundtrip_memory():
+    write_questions(QUESTIONS, "memory://bank/questions.json")
+    assert read_questions("memory://bank/questions.json", cache=False) == QUESTIONS
+    assert fsspec.filesystem("memory").ls("/bank", detail=False) == [
+        "/bank/questions.json"
+    ]
+
+
+def test_write_questions_failure_keeps_existing_file():
+    write_questions(QUESTIONS, "memory://failed/existing.json")
+    with pytest.raises(TypeError):
+        write_questions({"q1": object()}, "memory://failed/existing.json")
+    assert read_questions("memory://failed/existing.json", cache=False) == QUESTIONS
+    assert fsspec.filesystem("memory").ls("/failed", detail=False) == [
+        "/failed/existing.json"
+    ]
+
+
+def test_get_filesystem_is_shared_per_target():
+    fs1, path = get_filesystem("memory://bank/a.json")
+    fs2, _ = get_filesystem("memory://bank/b.json")
+    assert fs1 is fs2
+    assert path == "/bank/a.json"
+
+
+@pytest.mark.parametrize(
+    "suffix", [".json", ".json.gz", ".json.zst", ".msgpack", ".msgpack.gz"]
+)
+def test_write_questions_encodings(tmp_path, suffix):
+    if ".msgpack" in suffix:
+        pytest.importorskip("msgpack")
+    if suffix.endswith(".zst"):
+        pytest.importorskip("zstandard")
+    fname = str(tmp_path / f"questions{suffix}")
+    write_questions(QUESTIONS, fname)
+    assert read_questions(fname) == QUESTIONS
+    url = f"memory://encodings/questions{suffix}"
+    write_questions(QUESTIONS, url)
+    assert read_questions(url, cache=False) == QUESTIONS
+
+
+def test_write_questions_gzip_is_deterministic(tmp_path, monkeypatch):
+    write_questions(QUESTIONS, str(tmp_path / "a.json.gz"))
+    monkeypatch.setattr("time.time", lambda: 2e9)
+    write_questions(QUESTIONS, str(tmp_path / "b.json.gz"))
+    assert (tmp_path / "a.json.gz").read_bytes() == (
+        tmp_path / "b.json.gz"
+    ).read_bytes()
+
+
+def test_read_geoparquet_crs_metadata(tmp_path):
+    gpd = pytest.importorskip("geopandas")
+    pq = pytest.importorskip("pyarrow.parquet")
+    gdf = gpd.GeoDataFrame(geometry=gpd.points_from_xy([1.0], [2.0]))
+    gdf.to_parquet(tmp_path / "points.parquet")
+    table = pq.read_table(tmp_path / "points.parquet")
+    geo = json.loads(table.schema.metadata[b"geo"])
+
+    def write_with_crs(fname, **crs):
+        geo["columns"]["geometry"].pop("crs", None)
+        geo["columns"]["geometry"].update(crs)
+        metadata = {b"geo": json.dumps(geo).encode()}
+        pq.write_table(table.replace_schema_metadata(metadata), tmp_path / fname)
+        return str(tmp_path / fname)
+
+    fname = write_with_crs("null.parquet", crs=None)
+    assert read_geoparquet(fname).crs is None
+    with pytest.raises(ValueError, match="unknown CRS"):
+        read_geoparquet(fname, bbox=gdf.set_crs(4326))
+
+    fname = write_with_crs("missing.parquet")
+    assert read_geoparquet(fname).crs == "OGC:CRS84"
+
+
+def test_get_encoding():
+    assert get_encoding("az://container/bank.json") == ("json", None)
+    assert get_encoding("bank.json.gz") == ("json", "gzip")
+    assert get_encoding("https://host/bank.msgpack.zst?sv=1") == ("msgpack", "zstd")
+
+
+def test_geoparquet_bbox_and_predicate_pushdown(tmp_path):
+    gpd = pytest.importorskip("geopandas")
+    pytest.importorskip("pyarrow")
+    rng = np.random.default_rng(0)
+    gdf = gpd.GeoDataFrame(
+        {"site": np.repeat(["a", "b"], 500), "value": np.arange(1000)},
+        geometry=gpd.points_from_xy(rng.uniform(0, 10, 1000), rng.uniform(0, 10, 1000)),
+        crs="EPSG:4326",
+    )
+    fname = "memory://geoparquet/points.parquet"
+    write_geoparquet(gdf, fname, row_group_size=100)
+
+    result = read_geoparquet(
+        fname,
+        bbox=[2.0, 2.0, 4.0, 4.0],
+        columns=["value"],
+        filters=[("site", "==", "b")],
+    )
+    expected = gdf.cx[2.0:4.0, 2.0:4.0]
+    expected = expected[expected.site == "b"]
+    assert sorted(result["value"]) == sorted(expected["value"])
+    assert list(result.columns) == ["value", "geometry"]
+    assert result.crs == gdf.crs
+
+    gdf.to_parquet(tmp_path / "plain.parquet")
+    assert len(read_geoparquet(str(tmp_path / "plain.parquet"), bbox=[2, 2, 4, 4])) == (
+        len(gdf.cx[2.0:4.0, 2.0:4.0])
+    )
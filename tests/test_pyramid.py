@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+
+from coastal_dynamics.pyramid import (
+    MERCATOR_HALF_WIDTH,
+    PointPyramid,
+    lonlat_to_mercator,
+    zoom_for_extent,
+)
+
+
+def make_points(n=5000):
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(
+        {
+            "longitude": rng.uniform(-180, 180, n),
+            "latitude": rng.uniform(-89, 89, n),
+            "mag": rng.uniform(1, 9, n),
+        }
+    )
+
+
+def test_pyramid_levels_keep_counts_and_maxima(tmp_path):
+    points = make_points()
+    pyramid = PointPyramid.build(
+        points, tmp_path / "pyramid", {"mag": "max"}, max_zoom=4, bin_size=32
+    )
+    pyramid = PointPyramid(tmp_path / "pyramid")
+    inside = points[points.latitude.abs() < 85.05]
+    assert pyramid.n_points == len(inside)
+
+    for zoom in range(5):
+        bins = pyramid.level(zoom)
+        assert bins["count"].sum() == len(inside)
+        assert bins["mag_max"].max() == inside.mag.max()
+        # A tile of 256 pixels holds at most (256 / 32) ** 2 bins
+        assert len(bins) <= 4**zoom * 64
+    assert len(pyramid.level(0)) == 64
+
+
+def test_pyramid_view_selects_zoom_and_extent(tmp_path):
+    pyramid = PointPyramid.build(make_points(), tmp_path, {"mag": "max"}, max_zoom=6)
+    assert pyramid.zoom_for((-MERCATOR_HALF_WIDTH, MERCATOR_HALF_WIDTH), 256) == 0
+    assert zoom_for_extent((0, MERCATOR_HALF_WIDTH / 4), 1024) == 5
+    assert pyramid.zoom_for((0, 1000.0), 1000) == 6
+
+    x_range = (0, MERCATOR_HALF_WIDTH / 2)
+    y_range = (0, MERCATOR_HALF_WIDTH / 2)
+    bins = pyramid.view(x_range, y_range, width=1000)
+    assert bins["x"].between(*x_range).all()
+    assert bins["y"].between(*y_range).all()
+
+    points = make_points()
+    x, y = lonlat_to_mercator(points.longitude, points.latitude)
+    in_view = (x >= 0) & (x <= x_range[1]) & (y >= 0) & (y <= y_range[1])
+    # Bins are assigned by their centers, so the counts agree up to the edges
+    assert abs(bins["count"].sum() - in_view.sum()) < 0.1 * in_view.sum()
@@ -0,0 +1,89 @@
+import pathlib
+
+import pytest
+
+import coastal_dynamics as cd
+from coastal_dynamics.bank import QuestionBank
+
+
+def make_questions():
+    return {
+        "Q1-1": {
+            "name": "Q1-1",
+            "type": "multiple_choice",
+            "question": "Which coastal system is typical for tide-dominated coasts?",
+            "options": {"a": "Mudflats", "b": "Open coasts"},
+            "answer": cd.hash_answer("a", "multiple_choice"),
+            "feedback": {"correct": "Correct!", "incorrect": "Incorrect."},
+        },
+        "Q1-2": {
+            "name": "Q1-2",
+            "type": "numeric",
+            "question": "What is the relative importance of S2 vs M2?",
+            "answer": cd.hash_answer(0.33, "numeric", sig_figs=2),
+            "sig_figs": 2,
+            "feedback": {"correct": "Correct!", "incorrect": "Incorrect."},
+        },
+    }
+
+
+def test_question_bank_builds_widgets_on_display():
+    bank = QuestionBank(make_questions())
+    assert len(bank) == 2
+    assert bank.n_built == 0
+
+    bank["Q1-1"].__panel__()
+    assert bank["Q1-1"].is_built
+    assert not bank["Q1-2"].is_built
+    assert bank.n_built == 1
+    assert bank["Q1-1"].serve() is bank["Q1-1"].serve()
+
+
+def test_question_bank_validates_all_questions():
+    questions = make_questions()
+    del questions["Q1-2"]["feedback"]
+    with pytest.raises(ValueError, match="Q1-2"):
+        QuestionBank(questions)
+
+
+def test_question_bank_reports_all_errors():
+    questions = make_questions()
+    questions["Q1-1"]["answer"] = "e"
+    questions["Q1-2"]["sig_figs"] = "two"
+    questions["Q1-3"] = {"type": "essay"}
+    with pytest.raises(cd.QuestionValidationError) as excinfo:
+        QuestionBank(questions)
+    assert excinfo.value.errors == [
+        "Q1-1: answer e is not one of the options",
+        "Q1-2: field sig_figs must be an integer",
+        "Q1-3: Unknown question type: essay",
+    ]
+
+
+def test_indexed_question_bank_fetches_requested_questions():
+    questions = make_questions()
+    questions["Q3a-1"] = {**questions["Q1-1"], "name": "Q3a-1"}
+    questions["Q3a-2"] = {**questions["Q1-2"], "name": "Q3a-2"}
+    cd.write_questions(questions, "memory://indexed/course.qbank")
+    assert cd.read_questions("memory://indexed/course.qbank", cache=False) == (
+        questions
+    )
+
+    bank = cd.IndexedQuestionBank("memory://indexed/course.qbank")
+    assert list(bank) == list(questions)
+    assert bank.sections == ["1", "3a"]
+    assert bank.n_fetched == 0
+
+    assert bank["Q1-2"].question_data == questions["Q1-2"]
+    assert bank.n_fetched == 1
+
+    section = bank.section("3a")
+    assert isinstance(section, QuestionBank)
+    assert section.questions == {k: questions[k] for k in ("Q3a-1", "Q3a-2")}
+    assert bank.n_fetched == 3
+
+
+def test_question_bank_fixture_is_valid():
+    path = pathlib.Path(__file__).parent / "data" / "questions_hashed.json"
+    bank = QuestionBank(cd.read_questions(str(path)))
+    assert len(bank) == 4
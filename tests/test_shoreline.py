@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from coastal_dynamics.shoreline import change_rates, decimal_years, flag_outliers
+
+
+def make_positions():
+    rng = np.random.default_rng(0)
+    dates = pd.date_range("2000-01-01", periods=60, freq="90D")
+    t = decimal_years(dates)
+    positions = pd.DataFrame(
+        {
+            "a": 100 + 2.0 * t + rng.normal(0, 1, len(t)),
+            "b": 50 - 1.0 * t + rng.normal(0, 1, len(t)),
+            "c": 80 + 0.5 * t + rng.normal(0, 1, len(t)),
+        },
+        index=dates,
+    )
+    positions.iloc[::7, 1] = np.nan
+    positions.iloc[10, 2] = 500.0
+    return positions
+
+
+def reference_slopes(positions):
+    t = decimal_years(positions.index)
+    linear, theil_sen = {}, {}
+    for column, series in positions.items():
+        valid = series.notna().to_numpy()
+        x, y = t[valid], series.to_numpy()[valid]
+        linear[column] = np.polyfit(x, y, 1)[0]
+        i, j = np.triu_indices(len(x), k=1)
+        theil_sen[column] = np.median((y[j] - y[i]) / (x[j] - x[i]))
+    return pd.Series(linear), pd.Series(theil_sen)
+
+
+def test_change_rates_match_per_transect_fits():
+    positions = make_positions()
+    linear, theil_sen = reference_slopes(positions)
+
+    rates = change_rates(positions, confidence=None)
+    np.testing.assert_allclose(rates["rate"], linear)
+    assert rates["n"].tolist() == positions.notna().sum().tolist()
+
+    rates = change_rates(positions, method="theil_sen")
+    np.testing.assert_allclose(rates["rate"], theil_sen)
+    assert (rates["rate_lower"] < rates["rate"]).all()
+    assert (rates["rate"] < rates["rate_upper"]).all()
+    # The outlier barely moves the robust rate
+    assert rates.loc["c", "rate"] == pytest.approx(0.5, abs=0.1)
+    assert rates.loc["c", "n_outliers"] >= 1
+
+    weights = pd.Series(1.0, index=positions.index)
+    weighted = change_rates(
+        positions, method="weighted", weights=weights, confidence=None
+    )
+    np.testing.assert_allclose(weighted["rate"], linear)
+
+
+def test_change_rates_in_process_pool():
+    positions = make_positions()
+    expected = change_rates(positions, method="theil_sen")
+    rates = change_rates(positions, method="theil_sen", n_workers=2, chunk_size=1)
+    pd.testing.assert_frame_equal(rates, expected)
+
+
+def test_flag_outliers():
+    positions = make_positions()
+    rates = change_rates(positions, method="theil_sen")
+    outliers = flag_outliers(positions, rates)
+    assert outliers.shape == positions.shape
+    assert outliers.iloc[10, 2]
+    assert not outliers.iloc[::7, 1].any()
+
+
+def test_least_squares_confidence_interval():
+    pytest.importorskip("scipy")
+    rates = change_rates(make_positions())
+    assert (rates["rate_lower"] < rates["rate"]).all()
+    assert (rates["rate"] < rates["rate_upper"]).all()
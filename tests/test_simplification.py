@@ -0,0 +1,96 @@
+import geopandas as gpd
+import numpy as np
+import pytest
+import shapely
+
+from coastal_dynamics.simplification import SimplifiedLayer
+
+
+def make_layer():
+    rng = np.random.default_rng(0)
+    angles = np.linspace(0, 2 * np.pi, 5000, endpoint=False)
+    polygons = []
+    for lon in (-60.0, 0.0, 60.0):
+        radius = 5 + 0.01 * rng.standard_normal(len(angles))
+        ring = np.column_stack([lon + radius * np.cos(angles), radius * np.sin(angles)])
+        polygons.append(shapely.Polygon(ring))
+    return gpd.GeoDataFrame(
+        {"name": ["a", "b", "c"]}, geometry=polygons, crs="EPSG:4326"
+    )
+
+
+def test_simplified_levels_get_finer_with_zoom(tmp_path):
+    gdf = make_layer()
+    layer = SimplifiedLayer.build(gdf, tmp_path / "layer", max_zoom=12)
+    assert layer.max_zoom <= 12
+
+    n_vertices = [
+        shapely.get_num_coordinates(layer.level(zoom).geometry).sum()
+        for zoom in range(layer.max_zoom + 1)
+    ]
+    assert n_vertices == sorted(n_vertices)
+    assert n_vertices[0] < 0.05 * n_vertices[-1]
+    assert n_vertices[-1] == shapely.get_num_coordinates(gdf.geometry).sum()
+    assert layer.level(0).is_valid.all()
+    assert layer.level(0).crs == gdf.crs
+
+    # The world at 1000 pixels, and a view of 2 million meters around polygon "b"
+    assert len(layer.get()) == 3
+    assert layer.zoom_for((-1e6, 1e6), 1000) > layer.zoom_for((-2e7, 2e7), 1000)
+    view = layer.get((-1e6, 1e6), (-1e6, 1e6), width=1000)
+    assert view["name"].tolist() == ["b"]
+
+
+def test_simplified_layer_is_rebuilt_when_source_changes(tmp_path):
+    fname = tmp_path / "layer.parquet"
+    make_layer().to_parquet(fname)
+    layer = SimplifiedLayer.from_file(str(fname))
+    assert (tmp_path / "layer.parquet.simplified" / "metadata.json").exists()
+    assert SimplifiedLayer.from_file(str(fname)).source_key == layer.source_key
+
+    make_layer().iloc[:2].to_parquet(fname)
+    assert len(SimplifiedLayer.from_file(str(fname)).get()) == 2
+
+
+def test_simplified_polygons_keep_shared_edges(tmp_path):
+    # Two squares that share a noisy edge, whose rings start at other vertices
+    y = np.linspace(0, 10, 2001)
+    noise = 0.02 * np.random.default_rng(1).standard_normal(len(y))
+    edge = np.column_stack([noise, y])
+    west = shapely.Polygon([*edge, (-10, 10), (-10, 0)])
+    east = shapely.Polygon([(10, 0), *edge, (10, 10)])
+    gdf = gpd.GeoDataFrame(geometry=[west, east], crs="EPSG:4326")
+    assert shapely.coverage_is_valid(gdf.geometry.array)
+
+    layer = SimplifiedLayer.build(gdf, tmp_path / "layer")
+    level = layer.level(0).to_crs("EPSG:3857")
+    assert shapely.get_num_coordinates(level.geometry.array).sum() < 100
+    assert shapely.coverage_is_valid(level.geometry.array)
+
+
+def test_simplified_layer_is_rebuilt_when_arguments_change(tmp_path):
+    fname = tmp_path / "layer.parquet"
+    make_layer().to_parquet(fname)
+    layer = SimplifiedLayer.from_file(str(fname), max_zoom=12)
+    assert layer.parameters["max_zoom"] == 12
+
+    layer = SimplifiedLayer.from_file(str(fname), max_zoom=2, tolerance=2.0)
+    assert layer.max_zoom <= 2
+    assert layer.tolerance == 2.0
+    assert SimplifiedLayer.from_file(str(fname)).parameters == {
+        "max_zoom": 10,
+        "tolerance": 0.5,
+        "method": "coverage",
+    }
+
+
+def test_simplified_layer_dynamic_map_follows_the_view(tmp_path):
+    pytest.importorskip("holoviews")
+    layer = SimplifiedLayer.build(make_layer(), tmp_path / "layer")
+    dmap = layer.dynamic_map(line_color="white")
+    world = dmap.callback.callable(None, None)
+    assert len(world.split()) == 3
+    view = dmap.callback.callable((-1e6, 1e6), (-1e6, 1e6))
+    assert len(view.split()) == 1
+    # Paths in Web Mercator meters, within the polygon "b" of radius 5 degrees
+    assert abs(view.range("x")[0]) < 6e5
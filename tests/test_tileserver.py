@@ -0,0 +1,174 @@
+import sys
+import urllib.error
+import urllib.request
+
+import geopandas as gpd
+import numpy as np
+import pytest
+import shapely
+
+from coastal_dynamics.tileserver import (
+    EXTENT,
+    TileServer,
+    VectorTileSource,
+    encode_geometry,
+    tile_bounds,
+)
+
+
+def read_varint(data, i):
+    value = shift = 0
+    while True:
+        byte = data[i]
+        value |= (byte & 0x7F) << shift
+        i += 1
+        shift += 7
+        if byte < 0x80:
+            return value, i
+
+
+def read_message(data):
+    """Fields of a protobuf message as (number, value) pairs."""
+    fields, i = [], 0
+    while i < len(data):
+        key, i = read_varint(data, i)
+        number, wire_type = key >> 3, key & 7
+        if wire_type == 0:
+            value, i = read_varint(data, i)
+        elif wire_type == 1:
+            value, i = data[i : i + 8], i + 8
+        else:
+            length, i = read_varint(data, i)
+            value, i = data[i : i + length], i + length
+        fields.append((number, value))
+    return fields
+
+
+def read_packed(data):
+    values, i = [], 0
+    while i < len(data):
+        value, i = read_varint(data, i)
+        values.append(value)
+    return values
+
+
+def decode_commands(commands):
+    """Paths of absolute grid coordinates of the geometry commands."""
+    paths, x, y, i = [], 0, 0, 0
+    while i < len(commands):
+        command, count = commands[i] & 7, commands[i] >> 3
+        i += 1
+        if command == 7:
+            paths[-1].append(paths[-1][0])
+            continue
+        for _ in range(count):
+            dx, dy = commands[i], commands[i + 1]
+            x += (dx >> 1) ^ -(dx & 1)
+            y += (dy >> 1) ^ -(dy & 1)
+            i += 2
+            if command == 1:
+                paths.append([])
+            paths[-1].append((x, y))
+    return paths
+
+
+def signed_area(path):
+    x, y = np.asarray(path[:-1], dtype=float).T
+    return 0.5 * (np.dot(x, np.roll(y, -1)) - np.dot(np.roll(x, -1), y))
+
+
+def test_encode_polygon_winding():
+    square = shapely.Polygon(
+        [(0, 0), (0, 100), (100, 100), (100, 0)], holes=[[(10, 10), (20, 10), (20, 20)]]
+    )
+    geom_type, commands = encode_geometry(square)
+    assert geom_type == 3
+    exterior, interior = decode_commands(commands)
+    assert signed_area(exterior) > 0
+    assert signed_area(interior) < 0
+    assert set(exterior) == {(0, 0), (0, 100), (100, 100), (100, 0)}
+
+
+def test_tile_server_serves_and_caches_tiles(tmp_path):
+    # A line along the equator and a polygon in the north-east, in degrees
+    gdf = gpd.GeoDataFrame(
+        {"name": ["equator", "box"], "depth": [-200, 12.5]},
+        geometry=[
+            shapely.LineString([(-170, 0), (170, 0)]),
+            shapely.box(10, 10, 20, 20),
+        ],
+        crs="EPSG:4326",
+    )
+    server = TileServer(cache_dir=tmp_path)
+    url = server.add_source(VectorTileSource("isobaths", gdf))
+    server.start()
+    try:
+        with urllib.request.urlopen(url.format(z=1, x=1, y=0)) as response:
+            tile = response.read()
+            assert response.headers["Access-Control-Allow-Origin"] == "*"
+            assert "immutable" in response.headers["Cache-Control"]
+    finally:
+        server.stop()
+
+    ((number, layer),) = read_message(tile)
+    assert number == 3
+    layer = read_message(layer)
+    assert dict(layer)[1] == b"isobaths"
+    assert dict(layer)[5] == EXTENT
+    assert [v for k, v in layer if k == 3] == [b"name", b"depth"]
+    features = [dict(read_message(v)) for k, v in layer if k == 2]
+    # The north-east tile holds the box and the edge of the line in its buffer
+    assert sorted(f[3] for f in features) == [2, 3]
+
+    box = next(f for f in features if f[3] == 3)
+    (ring,) = decode_commands(read_packed(box[4]))
+    west, _, east, north = tile_bounds(1, 1, 0)
+    corner = shapely.get_coordinates(
+        gpd.GeoSeries([shapely.Point(20, 20)], crs="EPSG:4326").to_crs("EPSG:3857")
+    )[0]
+    scale = EXTENT / (east - west)
+    x, y = (corner - [west, north]) * [scale, -scale]
+    assert (round(x), round(y)) in ring
+
+    cached = list(tmp_path.glob("isobaths-*/1/1/0.pbf"))
+    assert len(cached) == 1
+    assert cached[0].read_bytes() == tile
+    assert server.get_tile("isobaths", 1, 1, 0) == tile
+    assert server.get_tile("isobaths", 2, 0, 3) == b""
+
+
+def test_tile_server_versions_the_urls(tmp_path):
+    gdf = gpd.GeoDataFrame(geometry=[shapely.box(10, 10, 20, 20)], crs="EPSG:4326")
+    server = TileServer(cache_dir=tmp_path)
+    old_url = server.add_source(VectorTileSource("boxes", gdf))
+    new_url = server.add_source(
+        VectorTileSource("boxes", gdf.set_geometry(gdf.translate(1, 1)))
+    )
+    assert old_url != new_url
+    server.start()
+    try:
+        with urllib.request.urlopen(new_url.format(z=1, x=1, y=0)) as response:
+            assert response.status == 200
+        # The tiles of the replaced layer are not served anymore
+        with pytest.raises(urllib.error.HTTPError, match="404"):
+            urllib.request.urlopen(old_url.format(z=1, x=1, y=0))
+    finally:
+        server.stop()
+
+
+def test_tile_server_url_on_jupyterhub(tmp_path, monkeypatch):
+    monkeypatch.setenv("JUPYTERHUB_SERVICE_PREFIX", "/user/student/")
+    monkeypatch.setitem(sys.modules, "jupyter_server_proxy", object())
+    server = TileServer(cache_dir=tmp_path)
+    try:
+        assert server.url == f"/user/student/proxy/{server._httpd.server_port}"
+    finally:
+        server.stop()
+
+    # Without the proxy the browser cannot reach the server
+    monkeypatch.setitem(sys.modules, "jupyter_server_proxy", None)
+    with pytest.raises(ImportError, match="jupyter-server-proxy"):
+        TileServer(cache_dir=tmp_path)
+    server = TileServer(cache_dir=tmp_path, base_url="http://localhost:8888/tiles/")
+    server.stop()
+    assert server.url == "http://localhost:8888/tiles"
@@ -0,0 +1,65 @@
+import geopandas as gpd
+import numpy as np
+import shapely
+
+from coastal_dynamics.cache import RemoteFileCache
+from coastal_dynamics.transects import TransectIndex
+
+
+def make_transects():
+    x = np.arange(10, dtype=float)
+    return gpd.GeoDataFrame(
+        {"TransectId": [f"t{i}" for i in range(10)]},
+        geometry=shapely.linestrings(
+            np.stack([np.column_stack([x, x * 0]), np.column_stack([x, x * 0 + 1])], 1)
+        ),
+        crs="EPSG:4326",
+    )
+
+
+def test_transect_index_queries():
+    index = TransectIndex.from_geodataframe(make_transects())
+    assert index.query([2.5, 0.0, 5.0, 2.0]).tolist() == ["t3", "t4", "t5"]
+    assert index.query([2.5, 0.5, 5.0, 2.0], predicate="within").tolist() == []
+    assert index.query([2.5, -1.0, 5.5, 2.0], predicate="within").tolist() == [
+        "t3",
+        "t4",
+        "t5",
+    ]
+    ids, distances = index.nearest((6.2, 0.5), k=3, return_distance=True)
+    assert ids.tolist() == ["t6", "t7", "t5"]
+    np.testing.assert_allclose(distances, [0.2, 0.8, 1.2])
+
+
+def test_transect_index_is_stored_in_the_cache(tmp_path, monkeypatch):
+    cache = RemoteFileCache(tmp_path / "cache")
+    monkeypatch.setattr("coastal_dynamics.cache._default_cache", cache)
+    fname = tmp_path / "transects.parquet"
+    make_transects().to_parquet(fname)
+
+    index = TransectIndex.from_parquet(str(fname))
+    assert [path.suffixes for path in cache.cache_dir.iterdir()] == [[".index", ".npz"]]
+    assert sorted(tmp_path.iterdir()) == [cache.cache_dir, fname]
+    loaded = TransectIndex.from_parquet(str(fname))
+    assert loaded.ids.tolist() == index.ids.tolist()
+    assert shapely.equals(loaded.geometries, index.geometries).all()
+
+
+def test_transect_index_keeps_geometry_types(tmp_path):
+    geometries = [
+        shapely.LineString([(0, 0), (1, 1)]),
+        shapely.MultiLineString([[(2, 0), (2, 1)], [(3, 0), (3, 1)]]),
+        shapely.Point(4, 0),
+    ]
+    TransectIndex(["a", "b", "c"], geometries).save(tmp_path / "index.npz")
+    loaded = TransectIndex.load(tmp_path / "index.npz")
+    assert shapely.get_type_id(loaded.geometries).tolist() == [1, 5, 0]
+    assert shapely.equals(loaded.geometries, geometries).all()
+
+
+def test_transect_index_nearest_on_empty_index():
+    index = TransectIndex([], [])
+    assert index.nearest((0.0, 0.0), k=3).tolist() == []
+    ids, distances = index.nearest((0.0, 0.0), return_distance=True)
+    assert ids.tolist() == []
+    assert distances.tolist() == []
@@ -0,0 +1,57 @@
+import numpy as np
+
+import coastal_dynamics as cd
+
+
+def test_compile_answer_index_multiple_choice():
+    answer = cd.hash_answer("b", "multiple_choice")
+    answer_index = cd.compile_answer_index("multiple_choice", answer, ("a", "b", "c"))
+    assert dict(answer_index) == {"a": False, "b": True, "c": False}
+
+
+def test_compile_answer_index_multiple_selection():
+    answers = tuple(cd.hash_answer(["a", "c"], "multiple_selection"))
+    answer_index = cd.compile_answer_index(
+        "multiple_selection", answers, ("a", "b", "c", "d")
+    )
+    assert answer_index.get(frozenset({"c", "a"}), False)
+    assert not answer_index.get(frozenset({"a"}), False)
+    assert not answer_index.get(frozenset({"a", "b", "c"}), False)
+
+
+def test_format_sig_figs_matches_format_float_positional():
+    rng = np.random.default_rng(42)
+    values = np.concatenate(
+        [
+            rng.standard_normal(2000) * 10.0 ** rng.integers(-25, 25, 2000),
+            np.round(rng.uniform(-10, 10, 1000), 3),
+            [0.0, -0.0, np.nan, np.inf, -np.inf, 0.5, 2.5, 9.96, 0.0095, 1e300],
+            [1.5, 0.25, 125.0, -1e-9, 123456789.0, 9.999999e16, 2.0**60],
+            rng.integers(-(10**9), 10**9, 500).astype(float),
+        ]
+    )
+    for sig_figs in range(1, 18):
+        expected = [
+            np.format_float_positional(
+                value, precision=sig_figs, unique=False, fractional=False, trim="k"
+            )
+            for value in values
+        ]
+        assert cd.format_sig_figs(values, sig_figs).tolist() == expected
+
+
+def test_format_sig_figs_formats_most_values_with_arrays(monkeypatch):
+    scalar_values = []
+    format_float_positional = np.format_float_positional
+
+    def record(value, *args, **kwargs):
+        scalar_values.append(value)
+        return format_float_positional(value, *args, **kwargs)
+
+    monkeypatch.setattr(np, "format_float_positional", record)
+    rng = np.random.default_rng(7)
+    values = rng.standard_normal(10000) * 10.0 ** rng.integers(-8, 8, 10000)
+    for sig_figs in (1, 3, 6, 12):
+        cd.format_sig_figs(values, sig_figs)
+    # Only the values whose rounding cannot be decided go through the scalar path
+    assert len(scalar_values) < 0.01 * len(values)